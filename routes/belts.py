@@ -2,12 +2,14 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from src.belts import (
     load_belts, add_belt, get_belt_by_id, update_belt, delete_belt,
     load_history_for_belt, add_reign_to_history, get_reign_by_id,
-    update_reign_in_history, delete_reign_from_history
+    update_reign_in_history, delete_reign_from_history, load_belt_history
 )
 from src.wrestlers import load_wrestlers
 from src.tagteams import load_tagteams
 from src.segments import _slugify
 from src.prefs import load_preferences # Import load_preferences
+from src.query import query, parse_page_args
+from src.date_utils import parse_date
 import uuid
 from datetime import datetime, date # Import date
 
@@ -34,11 +36,12 @@ def _get_form_data(form, is_create=False):
 
 @belts_bp.route('/')
 def list_belts():
-    all_belts = load_belts()
-    for belt in all_belts:
-        belt['is_deletable'] = not bool(load_history_for_belt(belt['ID']))
-    all_belts.sort(key=lambda b: b.get('Display_Position', 0)) # Sort by Display_Position
-    return render_template('booker/belts/list.html', belts=all_belts)
+    page_number, page_size = parse_page_args(request.args)
+    page = query('belts').order_by('Display_Position').page(page_number, page_size) # Sort by Display_Position
+    belt_ids_with_history = {reign.get('Belt_ID') for reign in load_belt_history()}
+    for belt in page.items:
+        belt['is_deletable'] = belt['ID'] not in belt_ids_with_history
+    return render_template('booker/belts/list.html', belts=page.items, page=page)
 
 @belts_bp.route('/create', methods=['GET', 'POST'])
 def create_belt():
@@ -102,11 +105,11 @@ def history(belt_id):
 
     for reign in history:
         try:
-            date_won = datetime.strptime(reign['Date_Won'], "%Y-%m-%d").date()
+            date_won = parse_date(reign['Date_Won'])
             # Use game_date for current reigns (where Date_Lost is not set)
-            date_lost = datetime.strptime(reign['Date_Lost'], "%Y-%m-%d").date() if reign.get('Date_Lost') else game_date
+            date_lost = parse_date(reign['Date_Lost']) if reign.get('Date_Lost') else game_date
             reign['Days'] = (date_lost - date_won).days
-        except (ValueError, TypeError): reign['Days'] = 'Error'
+        except (KeyError, TypeError): reign['Days'] = 'Error'
     return render_template('booker/belts/history.html', belt=belt, history=history)
 
 def _get_reign_form_data(form):
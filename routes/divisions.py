@@ -2,7 +2,8 @@ import uuid
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from src.divisions import (
     load_divisions, add_division, get_division_by_id, 
-    update_division, delete_division, is_division_in_use, get_all_division_ids_and_names
+    update_division, delete_division, is_division_in_use, get_all_division_ids_and_names,
+    get_division_ids_in_use
 )
 from src.segments import _slugify
 
@@ -25,8 +26,9 @@ def list_divisions():
     """Lists all divisions and checks if they are deletable."""
     all_divisions = load_divisions()
     all_divisions.sort(key=lambda d: d.get('Display_Position', 0)) # Sort by Display_Position
+    ids_in_use = get_division_ids_in_use()
     for division in all_divisions:
-        division['is_deletable'] = not is_division_in_use(division) # Pass the full division dictionary
+        division['is_deletable'] = not is_division_in_use(division, ids_in_use)
     return render_template('booker/divisions/list.html', divisions=all_divisions)
 
 @divisions_bp.route('/create', methods=['GET', 'POST'])
@@ -1,16 +1,20 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
-from src.events import load_events, get_event_by_name, add_event, update_event, delete_event, save_event_summary
-from src.segments import load_segments, get_match_by_id, _get_all_wrestlers_involved, _get_all_tag_teams_involved, _slugify, delete_all_segments_for_event, load_summary_content, load_matches
-from src.wrestlers import update_wrestler_record
-from src.tagteams import load_tagteams, update_tagteam_record, get_tagteam_by_name
-from src.belts import get_belt_by_name, process_championship_change, update_reign_in_history, load_history_for_belt
+from src.events import get_event_by_name, add_event, update_event, delete_event
+from src.segments import load_segments, _slugify, delete_all_segments_for_event, load_summary_content_cached, render_markdown
+from src.finalize import finalize_event as finalize_event_results, finalize_events, unfinalize_event as unfinalize_event_results, select_events_to_finalize, select_undated_events, load_event_card, get_event_warnings, build_finalize_preview
 from src.prefs import load_preferences, save_preferences # Import save_preferences
 from src.date_utils import get_current_working_date # Import the new utility
-from datetime import datetime
+from src.query import parse_page_args
+from src.event_calendar import get_events_page, get_month_calendar
+from src.jobs import submit_job, get_job, JobConflict
+from src.card_templates import load_card_templates, create_card_template_from_event, delete_card_template, build_schedule, create_events_from_template
+from datetime import date, datetime
 
 events_bp = Blueprint('events', __name__, url_prefix='/events')
 
 STATUS_OPTIONS = ['Future', 'Past', 'Cancelled']
+MAX_STAMPED_EVENTS = 520 # Ten years of weekly shows per request
+CALENDAR_MONTHS = ((1, 1), (9999, 11)) # The grid of December 9999 would run into the year 10000
 
 def _get_form_data(form):
     return {
@@ -24,18 +28,36 @@ def _get_form_data(form):
 @events_bp.route('/')
 def list_events():
     selected_status = request.args.get('status', 'All')
-    all_events = sorted(load_events(), key=lambda e: e.get('Date', '0000-00-00'), reverse=True)
-
-    if selected_status != 'All':
-        events_list = [e for e in all_events if e.get('Status') == selected_status]
-    else:
-        events_list = all_events
+    page_number, page_size = parse_page_args(request.args)
+    page = get_events_page(page_number, page_size, status=None if selected_status == 'All' else selected_status)
+    events_list = page.items
 
     status_options_for_filter = ['All'] + STATUS_OPTIONS
     return render_template('booker/events/list.html',
                            events=events_list,
                            status_options=status_options_for_filter,
-                           selected_status=selected_status)
+                           selected_status=selected_status,
+                           page=page)
+
+@events_bp.route('/calendar')
+def calendar_view():
+    """Month calendar of every event, defaulting to the current working date's month."""
+    working_date = get_current_working_date()
+    try:
+        year = int(request.args.get('year', working_date.year))
+        month = int(request.args.get('month', working_date.month))
+        if not 1 <= month <= 12 or not CALENDAR_MONTHS[0] <= (year, month) <= CALENDAR_MONTHS[1]:
+            raise ValueError
+    except ValueError:
+        flash('Invalid month.', 'danger')
+        return redirect(url_for('events.calendar_view'))
+    previous_month = (year, month - 1) if month > 1 else (year - 1, 12)
+    next_month = (year, month + 1) if month < 12 else (year + 1, 1)
+    previous_month = previous_month if previous_month >= CALENDAR_MONTHS[0] else None
+    next_month = next_month if next_month <= CALENDAR_MONTHS[1] else None
+    return render_template('booker/events/calendar.html', year=year, month=month,
+                           month_name=date(year, month, 1).strftime('%B'), weeks=get_month_calendar(year, month),
+                           previous_month=previous_month, next_month=next_month, today=working_date)
 
 @events_bp.route('/create', methods=['GET', 'POST'])
 def create_event():
@@ -63,7 +85,7 @@ def create_event():
             flash(f"Event '{event_data['Event_Name']}' created successfully! You can now add segments.", 'success')
             return redirect(url_for('events.edit_event', event_name=event_data['Event_Name']))
         else:
-            flash(f"Event with name '{event_data['Event_Name']}' already exists.", 'danger')
+            flash(f"Event with name '{event_data['Event_Name']}' (or one with the same URL slug) already exists.", 'danger')
             return render_template('booker/events/form.html', event=event_data, status_options=STATUS_OPTIONS, segments=[], prefs=prefs)
     
     # For GET request, pre-fill date with current working date
@@ -78,19 +100,8 @@ def edit_event(event_name):
     if not event:
         flash('Event not found.', 'danger')
         return redirect(url_for('events.list_events'))
-    sluggified_name = _slugify(event_name)
-    segments = sorted(load_segments(sluggified_name), key=lambda s: s.get('position', 0))
-
-    event_warnings = []
-    if event.get('Status') == 'Past':
-        all_matches_data = load_matches(sluggified_name)
-        for segment in segments:
-            if segment.get('type') == 'Match' and segment.get('match_id'):
-                match_id = segment['match_id']
-                match = next((m for m in all_matches_data if m.get('match_id') == match_id), None)
-                if match and match.get('warnings'):
-                    for warning in match['warnings']:
-                        event_warnings.append(f"Segment {segment['position']}: {warning}")
+    segments, matches_by_id = load_event_card(event_name)
+    event_warnings = get_event_warnings(event) if not event.get('Finalized') else []
 
     if request.method == 'POST':
         updated_data = _get_form_data(request.form)
@@ -114,14 +125,19 @@ def edit_event(event_name):
             flash(f"Event '{updated_data['Event_Name']}' updated successfully!", 'success')
             return redirect(url_for('events.edit_event', event_name=updated_data['Event_Name']))
         else:
-            flash(f"Failed to update event. New name might conflict.", 'danger')
+            flash(f"Failed to update event. New name might conflict with an existing event or its URL slug.", 'danger')
             return render_template('booker/events/form.html', event=updated_data, segments=segments, status_options=STATUS_OPTIONS, original_name=event_name, event_warnings=event_warnings, prefs=prefs)
     
     # For GET request, ensure event date is set, or use current working date if new event
     if not event.get('Date'):
         event['Date'] = current_working_date
 
-    return render_template('booker/events/form.html', event=event, segments=segments, status_options=STATUS_OPTIONS, original_name=event_name, event_warnings=event_warnings, prefs=prefs)
+    # Show what finalizing would change; computed in memory, nothing is written
+    finalize_preview = None
+    if event.get('Status') == 'Past' and not event.get('Finalized'):
+        finalize_preview = build_finalize_preview(event, segments, matches_by_id, prefs)
+
+    return render_template('booker/events/form.html', event=event, segments=segments, status_options=STATUS_OPTIONS, original_name=event_name, event_warnings=event_warnings, prefs=prefs, finalize_preview=finalize_preview)
 
 @events_bp.route('/view/<string:event_name>')
 def view_event(event_name):
@@ -132,7 +148,7 @@ def view_event(event_name):
     segments = load_segments(_slugify(event_name))
     for segment in segments:
         if segment.get('summary_file'):
-            segment['summary_content'] = load_summary_content(segment['summary_file'])
+            segment['summary_content'] = render_markdown(load_summary_content_cached(segment['summary_file']))
     segments.sort(key=lambda s: s.get('position', 0))
     return render_template('booker/events/view.html', event=event, segments=segments)
 
@@ -156,103 +172,132 @@ def finalize_event(event_name):
         flash('Event not found or already finalized.', 'warning')
         return redirect(url_for('events.list_events'))
 
-    sluggified_name = _slugify(event_name)
-    segments = sorted(load_segments(sluggified_name), key=lambda s: s.get('position', 0))
-
     # Re-evaluate warnings on POST to ensure current state
-    event_warnings = []
-    if event.get('Status') == 'Past':
-        all_matches_data = load_matches(sluggified_name)
-        for segment in segments:
-            if segment.get('type') == 'Match' and segment.get('match_id'):
-                match_id = segment['match_id']
-                match = next((m for m in all_matches_data if m.get('match_id') == match_id), None)
-                if match and match.get('warnings'):
-                    for warning in match['warnings']:
-                        event_warnings.append(f"Segment {segment['position']}: {warning}")
+    event_warnings = get_event_warnings(event)
 
     if event_warnings and not request.form.get('acknowledge_warnings'):
         flash('Please acknowledge the warnings before finalizing the event.', 'danger')
+        segments, _matches_by_id = load_event_card(event_name)
         # Redirect back to the edit page, passing the warnings again
         prefs = load_preferences() # Load prefs for template
         return render_template('booker/events/form.html', event=event, segments=segments, status_options=STATUS_OPTIONS, original_name=event_name, event_warnings=event_warnings, prefs=prefs)
 
-    all_tagteams = load_tagteams()
-    for segment in segments:
-        if segment.get('type') == 'Match' and segment.get('match_id'):
-            match = get_match_by_id(_slugify(event_name), segment['match_id'])
-            if not match: continue
-            all_teams_in_match = _get_all_tag_teams_involved(match.get('sides', []), all_tagteams)
-            for team_name in all_teams_in_match:
-                team_result = match['team_results'].get(team_name)
-                if team_result:
-                    update_tagteam_record(team_name, team_result)
-                    team_data = get_tagteam_by_name(team_name)
-                    if team_data and team_data.get('Members'):
-                        for member_name in team_data['Members']: # team_data['Members'] is already a list
-                            update_wrestler_record(member_name, 'tag', team_result)
-            all_wrestlers_in_match = _get_all_wrestlers_involved(match.get('sides', []))
-            match_class = match.get('match_class') # Get match_class once
-            for wrestler_name in all_wrestlers_in_match:
-                result = match['individual_results'].get(wrestler_name)
-                if result:
-                    record_match_class = None
-                    if match_class == 'singles':
-                        record_match_class = 'singles'
-                    # For 'tag' matches, individual wrestler records are updated via the tag team processing block.
-                    # For 'battle_royal' or 'other' match classes, individual records are not updated here.
-                    
-                    if record_match_class:
-                        update_wrestler_record(wrestler_name, record_match_class, result)
-            belt_name = match.get('match_championship')
-            if belt_name:
-                belt = get_belt_by_name(belt_name)
-                winning_side_idx = match.get('winning_side_index', -1)
-                if belt and belt['Status'] == 'Active' and winning_side_idx != -1:
-                    winning_side = match['sides'][winning_side_idx]
-                    winner_name = None
-                    if belt['Holder_Type'] == 'Singles' and len(winning_side) == 1:
-                        winner_name = winning_side[0]
-                    elif belt['Holder_Type'] == 'Tag-Team':
-                        winning_teams = _get_all_tag_teams_involved([winning_side], all_tagteams)
-                        if winning_teams: winner_name = winning_teams[0]
-                    if winner_name and belt.get('Current_Holder') != winner_name:
-                        process_championship_change(belt, winner_name, event['Date'])
-                    elif winner_name and belt.get('Current_Holder') == winner_name:
-                        history = load_history_for_belt(belt['ID'])
-                        for reign in history:
-                            if reign.get('Champion_Name') == belt['Current_Holder'] and not reign.get('Date_Lost'):
-                                reign['Defenses'] = reign.get('Defenses', 0) + 1
-                                update_reign_in_history(reign['Reign_ID'], reign)
-                                break
-    
-    # Generate consolidated event summary
-    prefs = load_preferences()
-    summary_parts = []
-    
-    for segment in segments:
-        # Load match data if it's a match to check visibility settings
-        match = None
-        if segment.get('type') == 'Match' and segment.get('match_id'):
-            match = get_match_by_id(_slugify(event_name), segment['match_id'])
-            # Skip if match summary is hidden
-            if match and match.get('match_visibility', {}).get('hide_summary'):
-                continue # Skip this segment entirely from the summary
-
-        summary_content = load_summary_content(segment.get('summary_file'))
-        if segment.get('type') == 'Match':
-            summary_parts.append(f"### {segment['header']}\n#### {segment['participants_display']}\n\n{summary_content}")
-        elif prefs.get('fan_mode_show_non_match_headers'):
-            summary_parts.append(f"### {segment['header']}\n\n{summary_content}")
-        else:
-            summary_parts.append(summary_content)
-            
-    final_summary = "\n\n---\n\n".join(summary_parts)
-    summary_file_path = save_event_summary(_slugify(event_name), final_summary)
-    event['event_summary_file'] = summary_file_path
-
-    event['Finalized'] = True
-    update_event(event_name, event)
-    flash(f"Event '{event_name}' has been finalized and records updated!", 'success')
+    # Records, title changes and defenses are applied in a background job, like batch finalization
+    try:
+        job_id = submit_job('finalize_event', f'Finalize {event_name}', _finalize_event_job, event_name)
+    except JobConflict as e:
+        flash(str(e), 'warning')
+        return redirect(url_for('tools.view_job', job_id=e.job['id']))
+    return redirect(url_for('tools.view_job', job_id=job_id))
+
+def _finalize_event_job(job, event_name):
+    job.progress(0, 1, f"Applying results of {event_name}")
+    success, message, changes = finalize_event_results(event_name)
+    if not success:
+        raise ValueError(message)
+    return {'event_name': event_name, 'changes': len(changes), 'messages': [(message, 'success')]}
+
+
+@events_bp.route('/unfinalize/<string:event_name>', methods=['POST'])
+def unfinalize_event(event_name):
+    """Reverses the records and title changes a finalized event applied."""
+    if request.form.get('confirmation') != 'UNFINALIZE':
+        flash('Confirmation text was incorrect. The event was not unfinalized.', 'danger')
+        return redirect(url_for('events.edit_event', event_name=event_name))
+    success, message = unfinalize_event_results(event_name)
+    flash(message, 'success' if success else 'danger')
     return redirect(url_for('events.edit_event', event_name=event_name))
 
+@events_bp.route('/finalize-batch', methods=['GET', 'POST'])
+def finalize_batch():
+    """Finalizes every unfinalized past event up to a date, oldest first."""
+    through_date = request.values.get('through_date') or get_current_working_date().isoformat()
+    try:
+        datetime.strptime(through_date, '%Y-%m-%d')
+    except ValueError:
+        flash('Invalid date format. Please use YYYY-MM-DD.', 'danger')
+        return redirect(url_for('events.finalize_batch'))
+
+    if request.method == 'POST':
+        # Large backlogs can take a while, so the batch runs as a background job
+        try:
+            job_id = submit_job('finalize_batch', f'Finalize events through {through_date}', _finalize_batch_job,
+                                through_date, bool(request.form.get('acknowledge_warnings')))
+        except JobConflict as e:
+            flash(str(e), 'warning')
+            return redirect(url_for('tools.view_job', job_id=e.job['id']))
+        return redirect(url_for('tools.view_job', job_id=job_id))
+
+    # Preview: list the backlog and its warnings without finalizing anything
+    report = {'events': [], 'undated': [e['Event_Name'] for e in select_undated_events()], 'finalized': 0, 'blocked': False}
+    for event in select_events_to_finalize(through_date):
+        report['events'].append({'Event_Name': event['Event_Name'], 'Date': event.get('Date'),
+                                 'warnings': get_event_warnings(event),
+                                 'changes': [], 'finalized': False})
+    return render_template('booker/events/finalize_batch.html', through_date=through_date, report=report, completed=False)
+
+def _finalize_batch_job(job, through_date, acknowledge_warnings):
+    report = finalize_events(through_date, acknowledge_warnings=acknowledge_warnings, progress=job.progress)
+    report['through_date'] = through_date
+    return report
+
+@events_bp.route('/finalize-batch/result/<job_id>')
+def finalize_batch_result(job_id):
+    """Shows the report of a finished batch finalization job."""
+    job = get_job(job_id)
+    if not job or job['kind'] != 'finalize_batch' or job['status'] != 'succeeded':
+        flash('That batch finalization result is not available.', 'warning')
+        return redirect(url_for('events.finalize_batch'))
+    report = job['result']
+    flash(report['message'], 'danger' if report['blocked'] else ('success' if report['finalized'] else 'info'))
+    return render_template('booker/events/finalize_batch.html', through_date=report['through_date'], report=report,
+                           completed=not report['blocked'])
+
+@events_bp.route('/save-template/<string:event_name>', methods=['POST'])
+def save_card_template(event_name):
+    """Saves an event's card as a reusable card template."""
+    success, message = create_card_template_from_event(event_name, request.form.get('template_name', '').strip())
+    flash(message, 'success' if success else 'danger')
+    return redirect(url_for('events.card_templates') if success else url_for('events.edit_event', event_name=event_name))
+
+@events_bp.route('/templates')
+def card_templates():
+    """Lists card templates and the form for stamping events out of them."""
+    return render_template('booker/events/templates.html', templates=load_card_templates(),
+                           status_options=STATUS_OPTIONS, first_date=get_current_working_date().isoformat())
+
+@events_bp.route('/templates/delete/<string:template_name>', methods=['POST'])
+def delete_card_template_route(template_name):
+    success, message = delete_card_template(template_name)
+    flash(message, 'success' if success else 'danger')
+    return redirect(url_for('events.card_templates'))
+
+@events_bp.route('/templates/stamp', methods=['POST'])
+def stamp_card_template():
+    """Creates a run of events from a card template, e.g. a year of weekly shows."""
+    try:
+        count = int(request.form.get('count', 1))
+        interval_days = int(request.form.get('interval_days', 7))
+    except ValueError:
+        count = interval_days = 0
+    # Checked before building the schedule, so an oversized count is never expanded
+    if not 1 <= count <= MAX_STAMPED_EVENTS or interval_days < 1:
+        flash(f'Create between 1 and {MAX_STAMPED_EVENTS} events, at least one day apart.', 'danger')
+        return redirect(url_for('events.card_templates'))
+    try:
+        schedule = build_schedule(request.form.get('name_pattern', '').strip(), request.form.get('first_date', ''),
+                                  count, interval_days)
+    except OverflowError:
+        flash('The schedule runs past the year 9999. Choose an earlier date, fewer events or a shorter interval.', 'danger')
+        return redirect(url_for('events.card_templates'))
+    except (ValueError, KeyError, IndexError):
+        flash('Invalid schedule. Check the date, the count and the name pattern ({n} and {date} are supported).', 'danger')
+        return redirect(url_for('events.card_templates'))
+
+    success, message = create_events_from_template(
+        request.form.get('template_name'), schedule, status=request.form.get('status') or 'Future',
+        include_participants=bool(request.form.get('include_participants')),
+        include_headers=bool(request.form.get('include_headers')),
+        include_championships=bool(request.form.get('include_championships')))
+    flash(message, 'success' if success else 'danger')
+    return redirect(url_for('events.list_events') if success else url_for('events.card_templates'))
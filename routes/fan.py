@@ -1,15 +1,18 @@
-import datetime
-from flask import Blueprint, render_template, flash, redirect, url_for
+from flask import Blueprint, render_template, flash, redirect, url_for, request, g
 from src.prefs import load_preferences, load_fan_home_custom_text
 from src.wrestlers import load_wrestlers, get_wrestler_by_name, _get_list_from_data_field # Import new helper
 from src.tagteams import load_tagteams, get_tagteam_by_name, _get_members_list_from_team_data
 from src.divisions import load_divisions
-from src.events import load_events, get_event_by_name, load_event_summary_content, get_event_by_slug
+from src.events import get_event_by_name, load_event_summary_content, get_event_by_slug
 import markdown
-from src.segments import load_segments, get_match_by_id, _slugify # Import _slugify for event_slug
-from src.belts import load_belts, get_belt_by_id, load_history_for_belt, get_belt_by_name
-from src.news import load_news_posts, get_news_post_by_id
-from src.date_utils import get_current_working_date # Import the new utility
+from src.segments import load_segments, get_event_matches_by_id, _slugify # Import _slugify for event_slug
+from src.belts import load_belts, get_belt_by_id, load_history_for_belt, get_belt_by_name, get_belt_holders_on
+from src.news import get_news_post_by_id
+from src.records import get_record_store
+from src.query import query, parse_page_args
+from src.event_calendar import get_upcoming_events, get_recent_events, get_event_years, get_events_page
+from src.slugs import get_slug
+from src.date_utils import get_current_working_date, parse_date, date_ordinal # Import the new utility
 
 fan_bp = Blueprint('fan', __name__, url_prefix='/fan')
 
@@ -43,19 +46,19 @@ def belt_history(belt_id):
         return redirect(static_url_for('fan.champions_list'))
 
     history = load_history_for_belt(belt_id)
-    history.sort(key=lambda r: datetime.datetime.strptime(r['Date_Won'], '%Y-%m-%d'), reverse=True)
+    history.sort(key=lambda r: date_ordinal(r['Date_Won']), reverse=True)
 
     current_working_date = get_current_working_date() # Use the new utility function
     
     for reign in history:
-        date_won = datetime.datetime.strptime(reign['Date_Won'], '%Y-%m-%d')
+        date_won = parse_date(reign['Date_Won'])
         date_lost_str = reign.get('Date_Lost')
         
         if date_lost_str:
-            date_lost = datetime.datetime.strptime(date_lost_str, '%Y-%m-%d')
+            date_lost = parse_date(date_lost_str)
         else:
             # Use current_working_date for active reigns
-            date_lost = datetime.datetime.combine(current_working_date, datetime.time.min)
+            date_lost = current_working_date
         
         reign['Days'] = (date_lost - date_won).days
 
@@ -67,11 +70,11 @@ def belt_history(belt_id):
 
     return render_template('fan/belt_history.html', belt=belt, history=history, prefs=prefs, game_date_note=game_date_note)
 
-def _sort_key_ignore_the(name):
-    """Returns a sort key that ignores a leading 'The '."""
-    if name.lower().startswith('the '):
-        return name[4:]
-    return name
+def _fan_page_args():
+    """Returns (page, size) for fan list pages. Static exports render every item on one page."""
+    if getattr(g, 'static_export_mode', False):
+        return 1, None
+    return parse_page_args(request.args)
 
 @fan_bp.route('/home')
 def home():
@@ -82,12 +85,9 @@ def home():
     # 1. Handle News
     news_posts = []
     if prefs.get('fan_mode_home_show_news') != 'Off':
-        all_news = load_news_posts()
-        # Sort news posts by date descending (newest first)
-        all_news.sort(key=lambda p: datetime.datetime.strptime(p.get('Date', '1900-01-01'), '%Y-%m-%d'), reverse=True)
-        
+        # Newest news posts first
         num_news = int(prefs.get('fan_mode_home_number_news', 5))
-        news_posts = all_news[:num_news]
+        news_posts = query('news').order_by('Date', reverse=True).page(1, num_news).items
 
         if prefs.get('fan_mode_home_show_news') == 'Show Full Posts':
             for post in news_posts:
@@ -96,29 +96,19 @@ def home():
     # 2. Handle Upcoming Events
     upcoming_events = []
     if prefs.get('fan_mode_show_future_events'):
-        all_events = load_events()
-        for event in all_events:
-            if event.get('Status') == 'Future':
-                upcoming_events.append(event)
-        # Sort upcoming events by date ascending
-        upcoming_events.sort(key=lambda e: datetime.datetime.strptime(e.get('Date', '9999-12-31'), '%Y-%m-%d'))
+        # Upcoming events by date ascending
         num_events = int(prefs.get('fan_mode_home_number_events', 5))
-        upcoming_events = upcoming_events[:num_events]
+        upcoming_events = get_upcoming_events(num_events)
 
     # 3. Handle Recent Events
     recent_events = []
     if prefs.get('fan_mode_home_show_recent_events'):
-        all_events = load_events()
-        for event in all_events:
-            if event.get('Finalized') == True:
-                recent_events.append(event)
-        # Sort finalized events by date descending (newest first)
-        recent_events.sort(key=lambda e: datetime.datetime.strptime(e.get('Date', '1900-01-01'), '%Y-%m-%d'), reverse=True)
+        # Finalized events by date descending (newest first)
         num_events = int(prefs.get('fan_mode_home_number_events', 5))
-        recent_events = recent_events[:num_events]
+        recent_events = get_recent_events(num_events)
         # Ensure event_slug is present for linking in the template
         for event in recent_events:
-            event['event_slug'] = _slugify(event.get('Event_Name', ''))
+            event['event_slug'] = get_slug('events', event.get('Event_Name', ''))
 
     # 4. Handle Champions
     belts = []
@@ -171,18 +161,7 @@ def view_wrestler(wrestler_name):
     wrestler['salary_list'] = _get_list_from_data_field(wrestler.get('Salary'))
 
     # Calculate total record
-    singles_wins = int(wrestler.get('Singles_Wins', 0))
-    singles_losses = int(wrestler.get('Singles_Losses', 0))
-    singles_draws = int(wrestler.get('Singles_Draws', 0))
-    tag_wins = int(wrestler.get('Tag_Wins', 0))
-    tag_losses = int(wrestler.get('Tag_Losses', 0))
-    tag_draws = int(wrestler.get('Tag_Draws', 0))
-
-    total_record = {
-        'wins': singles_wins + tag_wins,
-        'losses': singles_losses + tag_losses,
-        'draws': singles_draws + tag_draws
-    }
+    total_record = get_record_store().wrestler_record(wrestler_name, 'Overall') or {'wins': 0, 'losses': 0, 'draws': 0}
 
     return render_template('fan/wrestler.html', wrestler=wrestler, prefs=prefs, total_record=total_record)
 
@@ -223,11 +202,12 @@ def view_event(event_slug):
 
     segments = load_segments(_slugify(event_slug))
     segments.sort(key=lambda s: s.get('position', 9999)) # Sort segments by position
+    matches_by_id = get_event_matches_by_id(_slugify(event_slug)) # One matches load for the whole card
 
     # Iterate through segments to merge match visibility data
     for segment in segments:
         if segment.get('type') == 'Match' and segment.get('match_id'):
-            match_data = get_match_by_id(_slugify(event_slug), segment['match_id'])
+            match_data = matches_by_id.get(segment['match_id'])
             if match_data and 'match_visibility' in match_data:
                 # Merge visibility flags into the segment dictionary
                 segment['on_card'] = not match_data['match_visibility'].get('hide_from_card', False)
@@ -244,12 +224,16 @@ def view_event(event_slug):
 
     event_summary_content = load_event_summary_content(event.get('event_summary_file'))
 
+    # For archived events, the champions heading into the show rather than today's
+    champions_at_the_time = get_belt_holders_on(event.get('Date'), going_in=True) if event.get('Status') == 'Past' else []
+
     return render_template(
         'fan/event.html',
         event=event,
         segments=segments,
         prefs=prefs,
-        event_summary_content=event_summary_content
+        event_summary_content=event_summary_content,
+        champions_at_the_time=champions_at_the_time
     )
 
 @fan_bp.route('/roster')
@@ -261,6 +245,8 @@ def roster():
     all_divisions = load_divisions()
 
     roster_record_type = prefs.get('fan_mode_roster_record_type', 'Singles')
+    record_store = get_record_store()
+    overall_records = record_store.wrestler_records('Overall')
 
     # Get display preferences for injured wrestlers and suspended roster members
     injured_wrestler_display = prefs.get('fan_mode_injured_wrestler_display', 'Show Normally')
@@ -294,16 +280,11 @@ def roster():
 
         # Calculate overall record if preference is set
         if roster_record_type == 'Overall':
-            singles_wins = int(wrestler.get('Singles_Wins', 0))
-            singles_losses = int(wrestler.get('Singles_Losses', 0))
-            singles_draws = int(wrestler.get('Singles_Draws', 0))
-            tag_wins = int(wrestler.get('Tag_Wins', 0))
-            tag_losses = int(wrestler.get('Tag_Losses', 0))
-            tag_draws = int(wrestler.get('Tag_Draws', 0))
-
-            wrestler['Total_Wins'] = singles_wins + tag_wins
-            wrestler['Total_Losses'] = singles_losses + tag_losses
-            wrestler['Total_Draws'] = singles_draws + tag_draws
+            row = record_store.wrestler_rows.get(wrestler.get('Name'))
+            if row is not None:
+                wrestler['Total_Wins'] = int(overall_records[row, 0])
+                wrestler['Total_Losses'] = int(overall_records[row, 1])
+                wrestler['Total_Draws'] = int(overall_records[row, 2])
     
     # Filter and modify tag teams based on preferences
     processed_tagteams = []
@@ -324,6 +305,19 @@ def roster():
             # 'Don't Show' means we skip adding it to processed_tagteams
         # For other statuses (Inactive, Retired), they are implicitly 'Don't Show' for the fan roster.
 
+    # Group the visible roster by division once instead of rescanning it per division
+    wrestlers_by_division = {}
+    for wrestler in processed_wrestlers:
+        wrestlers_by_division.setdefault(wrestler.get('Division'), []).append(wrestler)
+    tagteams_by_division = {}
+    for tagteam in processed_tagteams:
+        tagteams_by_division.setdefault(tagteam.get('Division'), []).append(tagteam)
+
+    # Belts keyed by normalized name (first match wins, like get_belt_by_name)
+    belts_by_name = {}
+    for belt in load_belts():
+        belts_by_name.setdefault(belt.get('Name', '').strip().lower(), belt)
+
     # Prepare a dictionary to hold roster data, grouped by division
     # Sort divisions by Display_Position for consistent display
     sorted_divisions = sorted(all_divisions, key=lambda d: d.get('Display_Position', 0))
@@ -335,27 +329,17 @@ def roster():
         # Store the division type as well for template logic
         roster_by_division[division_name] = {'wrestlers': [], 'tagteams': [], 'type': division.get('Holder_Type')}
 
-        # Add wrestlers to their division
-        for wrestler in processed_wrestlers:
-            if wrestler.get('Division') == division_id:
-                if wrestler.get('Belt'):
-                    belt_obj = get_belt_by_name(wrestler['Belt'])
-                    if belt_obj:
-                        wrestler['current_champion_title_display'] = belt_obj.get('Champion_Title', 'Champion')
-                    else:
-                        wrestler['current_champion_title_display'] = wrestler['Belt'] # Fallback to belt name
-                roster_by_division[division_name]['wrestlers'].append(wrestler)
-        
-        # Add tag teams to their division
-        for tagteam in processed_tagteams:
-            if tagteam.get('Division') == division_id:
-                if tagteam.get('Belt'):
-                    belt_obj = get_belt_by_name(tagteam['Belt'])
+        # Add wrestlers and tag teams to their division
+        for member_type, members in (('wrestlers', wrestlers_by_division.get(division_id, [])),
+                                     ('tagteams', tagteams_by_division.get(division_id, []))):
+            for member in members:
+                if member.get('Belt'):
+                    belt_obj = belts_by_name.get(member['Belt'].strip().lower())
                     if belt_obj:
-                        tagteam['current_champion_title_display'] = belt_obj.get('Champion_Title', 'Champion')
+                        member['current_champion_title_display'] = belt_obj.get('Champion_Title', 'Champion')
                     else:
-                        tagteam['current_champion_title_display'] = tagteam['Belt'] # Fallback to belt name
-                roster_by_division[division_name]['tagteams'].append(tagteam)
+                        member['current_champion_title_display'] = member['Belt'] # Fallback to belt name
+                roster_by_division[division_name][member_type].append(member)
 
     # Filter out divisions that have no active wrestlers or tagteams
     # This needs to be done after sorting and grouping
@@ -367,40 +351,21 @@ def roster():
     # Sorting logic
     sort_order = prefs.get('fan_mode_roster_sort_order', 'Alphabetical')
 
+    # Rank every wrestler and tag team once with the record store, then sort each
+    # division by those ranks instead of re-parsing records per comparison.
+    wrestler_ranks = record_store.ranks(record_store.rank_order(
+        record_store.singles, record_store.wrestler_sort_keys, sort_order))
+    team_ranks = record_store.ranks(record_store.rank_order(
+        record_store.team, record_store.team_sort_keys, sort_order))
+
     # Apply sorting to the filtered data
     for division_name, data in filtered_roster_by_division.items():
         # Sort wrestlers
         if data['type'] == 'Singles': # Only sort wrestlers if the division is Singles
-            if sort_order == 'Alphabetical':
-                data['wrestlers'].sort(key=lambda w: w.get('Name', ''))
-            elif sort_order == 'Total Wins':
-                data['wrestlers'].sort(key=lambda w: int(w.get('Singles_Wins', 0)), reverse=True)
-            elif sort_order == 'Win Percentage':
-                def get_wrestler_win_percentage_key(wrestler):
-                    wins = int(wrestler.get('Singles_Wins', 0))
-                    losses = int(wrestler.get('Singles_Losses', 0))
-                    total_matches = wins + losses
-                    # If less than 5 matches or 0-0 record, sort alphabetically at the bottom
-                    if total_matches < 5 or (wins == 0 and losses == 0):
-                        return (-1.0, wrestler.get('Name', '')) # -1.0 ensures it's at the bottom when sorting descending
-                    return (wins / total_matches, wrestler.get('Name', '')) # Win percentage, then name for tie-breaking
-                data['wrestlers'].sort(key=get_wrestler_win_percentage_key, reverse=True)
+            data['wrestlers'].sort(key=lambda w: wrestler_ranks[record_store.wrestler_rows.get(w.get('Name', ''), 0)])
 
         # Sort tag teams
-        if sort_order == 'Alphabetical':
-            data['tagteams'].sort(key=lambda tt: _sort_key_ignore_the(tt.get('Name', '')))
-        elif sort_order == 'Total Wins':
-            data['tagteams'].sort(key=lambda tt: int(tt.get('Wins', 0)), reverse=True)
-        elif sort_order == 'Win Percentage':
-            def get_tagteam_win_percentage_key(tagteam):
-                wins = int(tagteam.get('Wins', 0))
-                losses = int(tagteam.get('Losses', 0))
-                total_matches = wins + losses
-                # If less than 5 matches or 0-0 record, sort alphabetically at the bottom
-                if total_matches < 5 or (wins == 0 and losses == 0):
-                    return (-1.0, _sort_key_ignore_the(tagteam.get('Name', '')))
-                return (wins / total_matches, _sort_key_ignore_the(tagteam.get('Name', '')))
-            data['tagteams'].sort(key=get_tagteam_win_percentage_key, reverse=True)
+        data['tagteams'].sort(key=lambda tt: team_ranks[record_store.team_rows.get(tt.get('Name', ''), 0)])
 
     return render_template('fan/roster.html', roster_data=filtered_roster_by_division, prefs=prefs)
 
@@ -408,25 +373,18 @@ def roster():
 def events_list():
     """Renders the fan mode events index page."""
     prefs = load_preferences()
-    all_events = load_events()
 
     upcoming_events = []
     if prefs.get('fan_mode_show_future_events'):
-        for event in all_events:
-            if event.get('Status') == 'Future':
-                upcoming_events.append(event)
-        # Sort upcoming events by date ascending
-        upcoming_events.sort(key=lambda e: datetime.datetime.strptime(e.get('Date', '9999-12-31'), '%Y-%m-%d'))
-
-    finalized_events = []
-    for event in all_events:
-        if event.get('Finalized') == True:
-            finalized_events.append(event)
-    # Sort finalized events by date descending (newest first)
-    finalized_events.sort(key=lambda e: datetime.datetime.strptime(e.get('Date', '1900-01-01'), '%Y-%m-%d'), reverse=True)
-
-    # Get unique years from finalized events for archive links
-    years = sorted(list(set(datetime.datetime.strptime(e.get('Date'), '%Y-%m-%d').year for e in finalized_events if e.get('Date'))), reverse=True)
+        # Upcoming events by date ascending
+        upcoming_events = get_upcoming_events()
+
+    # Only the most recent finalized events are listed; older ones are in the yearly archives
+    num_events = int(prefs.get('fan_mode_home_number_events', 5))
+    finalized_events = get_recent_events(num_events)
+
+    # Years with finalized events, for archive links, straight from the calendar's year partitions
+    years = get_event_years(finalized=True)
 
     return render_template(
         'fan/events_list.html',
@@ -441,27 +399,16 @@ def events_list():
 def archive_by_year(year):
     """Renders the fan mode events archive page for a specific year."""
     prefs = load_preferences() # Load preferences here
-    all_events = load_events()
-    archive_events = []
-
-    for event in all_events:
-        event_date_str = event.get('Date')
-        if event.get('Finalized') == True and event_date_str:
-            try:
-                event_year = datetime.datetime.strptime(event_date_str, '%Y-%m-%d').year
-                if event_year == year:
-                    archive_events.append(event)
-            except ValueError:
-                # Handle cases where date might be malformed, skip such events
-                continue
-    
-    # Sort archive events by date descending (newest first)
-    archive_events.sort(key=lambda e: datetime.datetime.strptime(e.get('Date', '1900-01-01'), '%Y-%m-%d'), reverse=True)
+    page_number, page_size = _fan_page_args()
+
+    # Archive events by date descending (newest first)
+    page = get_events_page(page_number, page_size, finalized=True, year=year)
 
     return render_template(
         'fan/events_archive.html',
         year=year,
-        events=archive_events,
+        events=page.items,
+        page=page,
         prefs=prefs, # Pass prefs to the template
         _slugify=_slugify # Pass _slugify to the template
     )
@@ -470,15 +417,19 @@ def archive_by_year(year):
 def news_list():
     """Renders the fan mode news index page."""
     prefs = load_preferences()
-    all_news_posts = load_news_posts()
+    page_number, _ = parse_page_args(request.args)
+    num_news = int(prefs.get('fan_mode_home_number_news', 5))
+    news_query = query('news').order_by('Date', reverse=True)
+    page = news_query.page(page_number, num_news)
 
     # Get unique years from news posts for archive links
-    years = sorted(list(set(datetime.datetime.strptime(p.get('Date'), '%Y-%m-%d').year for p in all_news_posts if p.get('Date'))), reverse=True)
+    years = sorted((year for year in news_query.distinct('Year') if year is not None), reverse=True)
 
     return render_template(
         'fan/news_list.html',
         prefs=prefs,
-        news_posts=all_news_posts,
+        news_posts=page.items,
+        page=page,
         years=years
     )
 
@@ -486,25 +437,14 @@ def news_list():
 def news_archive_by_year(year):
     """Renders the fan mode news archive page for a specific year."""
     prefs = load_preferences()
-    all_news_posts = load_news_posts()
-    archive_news_posts = []
-
-    for post in all_news_posts:
-        post_date_str = post.get('Date')
-        if post_date_str:
-            try:
-                post_year = datetime.datetime.strptime(post_date_str, '%Y-%m-%d').year
-                if post_year == year:
-                    archive_news_posts.append(post)
-            except ValueError:
-                continue
-    
-    archive_news_posts.sort(key=lambda p: datetime.datetime.strptime(p.get('Date', '1900-01-01'), '%Y-%m-%d'), reverse=True)
+    page_number, page_size = _fan_page_args()
+    page = query('news').where(Year=year).order_by('Date', reverse=True).page(page_number, page_size)
 
     return render_template(
         'fan/news_archive.html',
         year=year,
-        news_posts=archive_news_posts,
+        news_posts=page.items,
+        page=page,
         prefs=prefs
     )
 
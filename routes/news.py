@@ -5,6 +5,7 @@ from src.news import (
 )
 from src.prefs import load_preferences, save_preferences # Import save_preferences
 from src.date_utils import get_current_working_date # Import the new utility
+from src.query import query, parse_page_args
 from datetime import datetime
 import markdown
 
@@ -35,8 +36,9 @@ def _get_form_data(form, is_create=False):
 @news_bp.route('/')
 def list_news():
     """Renders the list of all news posts."""
-    news_posts = load_news_posts()
-    return render_template('booker/news/list.html', news_posts=news_posts)
+    page_number, page_size = parse_page_args(request.args)
+    page = query('news').order_by('Date', reverse=True).page(page_number, page_size)
+    return render_template('booker/news/list.html', news_posts=page.items, page=page)
 
 @news_bp.route('/create', methods=['GET', 'POST'])
 def create_news():
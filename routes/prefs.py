@@ -5,6 +5,7 @@ from dotenv import load_dotenv, set_key # Import dotenv functions
 from src.prefs import load_preferences, save_preferences, load_fan_home_custom_text, save_fan_home_custom_text
 from src.wrestlers import reset_all_wrestler_records
 from src.tagteams import reset_all_tagteam_records, recalculate_all_tagteam_weights
+from src.rebuild import rebuild_records, describe_record_drift, rebuild_lineage, describe_lineage_diff
 from src.system import delete_all_temporary_files, get_league_logo_path, LEAGUE_LOGO_FILENAME, INCLUDES_DIR
 from src.date_utils import get_current_working_date
 
@@ -167,6 +168,29 @@ def reset_records():
         flash('Confirmation text was incorrect. Records were not reset.', 'danger')
     return redirect(url_for('prefs.general_prefs'))
 
+@prefs_bp.route('/rebuild-records', methods=['POST'])
+def rebuild_records_route():
+    """Verifies or rebuilds all records from the finalized match history."""
+    verify_only = request.form.get('action') != 'rebuild'
+    report = rebuild_records(verify_only=verify_only)
+    flash(f"Replayed {report['matches']} matches from {report['events']} finalized events. {describe_record_drift(report)}",
+          'success' if report['applied'] or not report['drift'] else 'warning')
+    for d in report['drift'][:10]: # Show a sample, the full list is available from the command line
+        flash(f"{d['name']}: {d['field']} {d['stored']} → {d['rebuilt']}", 'info')
+    return redirect(url_for('prefs.general_prefs'))
+
+@prefs_bp.route('/rebuild-lineage', methods=['POST'])
+def rebuild_lineage_route():
+    """Diffs or rebuilds every title history from the finalized title matches."""
+    report = rebuild_lineage(apply=request.form.get('action') == 'rebuild')
+    flash(f"Replayed {report['matches']} title matches for {report['belts']} belts. {describe_lineage_diff(report)}",
+          'success' if report['applied'] or not report['diffs'] else 'warning')
+    for diff in report['diffs']:
+        holder = f", holder {diff['holder']['stored'] or 'vacant'} → {diff['holder']['rebuilt'] or 'vacant'}" if diff['holder'] else ''
+        flash(f"{diff['belt_name']}: {len(diff['added'])} reign(s) added, {len(diff['removed'])} removed, "
+              f"{len(diff['changed'])} field(s) changed{holder}", 'info')
+    return redirect(url_for('prefs.general_prefs'))
+
 @prefs_bp.route('/clear-temp-files', methods=['POST'])
 def clear_temp_files():
     """Handles the deletion of all temporary files."""
@@ -1,17 +1,18 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from src.segments import (
-    load_segments, get_segment_by_position, add_segment, update_segment, delete_segment,
+    load_segments, get_segment_by_position, add_segment, update_segment, delete_segment, apply_card_changes,
     load_summary_content, _slugify, delete_all_segments_for_event,
-    load_active_wrestlers, load_active_tagteams, get_match_by_id,
+    get_match_by_id, get_event_matches_by_id,
     validate_match_data, _get_all_wrestlers_involved, _get_all_tag_teams_involved
 )
 from src.events import get_event_by_name, get_event_by_slug
-from src.belts import load_belts
+from src.belts import load_belts, get_belt_holders_on
 import os
 import litellm
 from src.wrestlers import load_wrestlers
 from src.tagteams import load_tagteams
 from src.prefs import load_preferences
+from src.autocomplete import search_participants, get_related_teams, AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT
 import json
 from dotenv import load_dotenv # Import load_dotenv
 
@@ -20,12 +21,6 @@ load_dotenv()
 
 segments_bp = Blueprint('segments', __name__, url_prefix='/events/<string:event_slug>/segments')
 
-def _sort_key_ignore_the(name):
-    """Returns a sort key that ignores a leading 'The '."""
-    if name.lower().startswith('the '):
-        return name[4:]
-    return name
-
 SEGMENT_TYPE_OPTIONS = ["Match", "Promo", "Interview", "In-ring", "Brawl", "Video Package"]
 # Used for per-individual and per-team result selection (unchanged)
 MATCH_RESULT_OPTIONS = ["Win", "Loss", "Draw", "No Contest"]
@@ -128,6 +123,20 @@ def _validate_segment_form_data(event_slug, segment_data, original_position=None
     
     return errors
 
+def _get_related_teams_for_sides(match_data):
+    """Tag teams the match builder needs to detect teams among the match's current participants."""
+    return get_related_teams(_get_all_wrestlers_involved((match_data or {}).get('sides', [])))
+
+@segments_bp.route('/participants')
+def participant_autocomplete(event_slug):
+    """Returns wrestlers and tag teams matching ?q= as JSON, for the match builder."""
+    try:
+        limit = max(1, min(int(request.args.get('limit', AUTOCOMPLETE_LIMIT)), MAX_AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    return jsonify(search_participants(request.args.get('q', ''), limit,
+                                       active_only=not request.args.get('include_inactive')))
+
 @segments_bp.route('/create', methods=['GET', 'POST'])
 def create_segment(event_slug):
     """Handles segment creation for a specific event."""
@@ -137,8 +146,6 @@ def create_segment(event_slug):
         return redirect(url_for('events.list_events'))
 
     sluggified_event_name = _slugify(event_slug)
-    all_wrestlers = sorted(load_active_wrestlers(), key=lambda w: w['Name'])
-    all_tagteams = sorted(load_active_tagteams(), key=lambda t: _sort_key_ignore_the(t['Name']))
     all_belts = load_belts()
 
     match_data_for_template = {
@@ -172,7 +179,7 @@ def create_segment(event_slug):
                 flash(error, 'danger')
             return render_template('booker/segments/form.html', event_slug=event_slug, segment=segment_data,
                                    segment_type_options=SEGMENT_TYPE_OPTIONS, summary_content=summary_content,
-                                   all_wrestlers=all_wrestlers, all_tagteams=all_tagteams, all_belts=all_belts,
+                                   all_belts=all_belts, related_tagteams=_get_related_teams_for_sides(match_data_for_template),
                                    match_data=match_data_for_template, match_result_options=MATCH_RESULT_OPTIONS,
                                    winner_method_options=WINNER_METHOD_OPTIONS,
                                    edit_mode=False) # Explicitly set edit_mode
@@ -189,14 +196,14 @@ def create_segment(event_slug):
 
         return render_template('booker/segments/form.html', event_slug=event_slug, segment=segment_data,
                                segment_type_options=SEGMENT_TYPE_OPTIONS, summary_content=summary_content,
-                               all_wrestlers=all_wrestlers, all_tagteams=all_tagteams, all_belts=all_belts,
+                               all_belts=all_belts, related_tagteams=_get_related_teams_for_sides(match_data_for_template),
                                match_data=match_data_for_template, match_result_options=MATCH_RESULT_OPTIONS,
                                winner_method_options=WINNER_METHOD_OPTIONS,
                                edit_mode=False) # Explicitly set edit_mode
 
     return render_template('booker/segments/form.html', event_slug=event_slug, segment={},
                            segment_type_options=SEGMENT_TYPE_OPTIONS, summary_content="",
-                           all_wrestlers=all_wrestlers, all_tagteams=all_tagteams, all_belts=all_belts,
+                           all_belts=all_belts, related_tagteams=_get_related_teams_for_sides(match_data_for_template),
                            match_data=match_data_for_template, match_result_options=MATCH_RESULT_OPTIONS,
                            winner_method_options=WINNER_METHOD_OPTIONS,
                            edit_mode=False) # Explicitly set edit_mode
@@ -215,8 +222,6 @@ def edit_segment(event_slug, position):
         flash(f"Segment at position {position} not found.", 'danger')
         return redirect(url_for('events.edit_event', event_name=event_slug))
 
-    all_wrestlers = sorted(load_active_wrestlers(), key=lambda w: w['Name'])
-    all_tagteams = sorted(load_active_tagteams(), key=lambda t: _sort_key_ignore_the(t['Name']))
     all_belts = load_belts()
     summary_content = load_summary_content(segment.get('summary_file', ''))
     
@@ -267,7 +272,7 @@ def edit_segment(event_slug, position):
                 flash(error, 'danger')
             return render_template('booker/segments/form.html', event_slug=event_slug, segment=updated_segment_data,
                                    segment_type_options=SEGMENT_TYPE_OPTIONS, summary_content=new_summary_content,
-                                   original_position=position, all_wrestlers=all_wrestlers, all_tagteams=all_tagteams,
+                                   original_position=position, related_tagteams=_get_related_teams_for_sides(updated_match_details),
                                    all_belts=all_belts, match_data=updated_match_details or {},
                                    match_result_options=MATCH_RESULT_OPTIONS,
                                    winner_method_options=WINNER_METHOD_OPTIONS,
@@ -284,7 +289,7 @@ def edit_segment(event_slug, position):
         
         return render_template('booker/segments/form.html', event_slug=event_slug, segment=updated_segment_data,
                                segment_type_options=SEGMENT_TYPE_OPTIONS, summary_content=new_summary_content,
-                               original_position=position, all_wrestlers=all_wrestlers, all_tagteams=all_tagteams,
+                               original_position=position, related_tagteams=_get_related_teams_for_sides(updated_match_details),
                                all_belts=all_belts, match_data=updated_match_details or {},
                                match_result_options=MATCH_RESULT_OPTIONS,
                                winner_method_options=WINNER_METHOD_OPTIONS,
@@ -292,7 +297,7 @@ def edit_segment(event_slug, position):
 
     return render_template('booker/segments/form.html', event_slug=event_slug, segment=segment,
                            segment_type_options=SEGMENT_TYPE_OPTIONS, summary_content=summary_content,
-                           original_position=position, all_wrestlers=all_wrestlers, all_tagteams=all_tagteams,
+                           original_position=position, related_tagteams=_get_related_teams_for_sides(match_data_for_template),
                            all_belts=all_belts, match_data=match_data_for_template,
                            match_result_options=MATCH_RESULT_OPTIONS,
                            winner_method_options=WINNER_METHOD_OPTIONS,
@@ -314,6 +319,39 @@ def delete_segment_route(event_slug, position):
     return redirect(url_for('events.edit_event', event_name=event_slug))
 
 
+@segments_bp.route('/batch', methods=['POST'])
+def batch_update_segments(event_slug):
+    """
+    Applies a whole-card edit from a JSON body in one write per file:
+    {"order": [3, 1, "new-1", 2], "inserts": [{"key": "new-1", "segment": {...}, "summary": "...", "match": {...}}], "deletes": [4]}
+    Integers in order are current positions; strings are insert keys.
+    """
+    event = get_event_by_name(event_slug)
+    if not event:
+        return jsonify({'error': 'Event not found'}), 404
+    if event.get('Finalized'):
+        return jsonify({'error': 'Cannot edit the card of a finalized event.'}), 400
+
+    payload = request.get_json(silent=True) or {}
+    order = payload.get('order')
+    if not isinstance(order, list):
+        return jsonify({'error': "'order' must list the final card."}), 400
+    inserts = payload.get('inserts') or []
+    for insert in inserts:
+        segment_type = (insert.get('segment') or {}).get('type')
+        if segment_type not in SEGMENT_TYPE_OPTIONS:
+            return jsonify({'error': f"Invalid segment type: {segment_type}."}), 400
+        if segment_type == 'Match' and insert.get('match') is None:
+            return jsonify({'error': "Match data is missing for a segment of type 'Match'."}), 400
+
+    try:
+        success, message = apply_card_changes(_slugify(event_slug), order, inserts, payload.get('deletes') or [])
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    if not success:
+        return jsonify({'error': message}), 400
+    return jsonify({'message': message})
+
 @segments_bp.route('/<int:position>/ai-generate', methods=['POST'])
 def ai_generate(event_slug, position):
     """
@@ -361,6 +399,11 @@ def ai_generate(event_slug, position):
         if not segment:
             print(f"AI Generate: Segment not found for event_slug={sluggified_event_name}, position={position}")
             return jsonify({'error': 'Segment not found'}), 404
+        if segment.get('type') == 'Match' and segment.get('match_id'):
+            # Sides, result and visibility live on the match record, not the segment
+            match = get_event_matches_by_id(sluggified_event_name).get(segment['match_id'])
+            if match:
+                segment = {**match, **segment}
     else:  # New segment (position == 0)
         # Construct a temporary segment dictionary from user input for AI context
         # Ensure 'position' from user_input is used, defaulting to 0 if not provided or invalid
@@ -402,6 +445,11 @@ def ai_generate(event_slug, position):
 
     all_wrestlers_data = load_wrestlers()
     all_tagteams_data = load_tagteams()
+    # Titles as they stood going into the event, not as they stand today
+    champions_at_the_time = get_belt_holders_on(event.get('Date'), going_in=True)
+    belts_held_at_the_time = {}
+    for holder in champions_at_the_time:
+        belts_held_at_the_time.setdefault(holder['champion'], []).append(holder['belt']['Name'])
 
     # Identify participants for dossier creation
     participants = set()
@@ -429,7 +477,7 @@ def ai_generate(event_slug, position):
                 "Nickname": wrestler.get('Nickname'),
                 "Alignment": wrestler.get('Alignment'),
                 "Wrestling_Styles": wrestler.get('Wrestling_Styles', '').split('|') if wrestler.get('Wrestling_Styles') else [],
-                "Belt": wrestler.get('Belt'),
+                "Belt": ', '.join(belts_held_at_the_time.get(wrestler.get('Name'), [])) or None,
                 "Manager": wrestler.get('Manager'),
                 "Faction": wrestler.get('Faction'),
                 "Height": wrestler.get('Height'),
@@ -457,7 +505,7 @@ def ai_generate(event_slug, position):
                     "Name": tagteam.get('Name'),
                     "Members": members_processed,
                     "Alignment": tagteam.get('Alignment'),
-                    "Belt": tagteam.get('Belt'),
+                    "Belt": ', '.join(belts_held_at_the_time.get(tagteam.get('Name'), [])) or None,
                     "Manager": tagteam.get('Manager'),
                     "Faction": tagteam.get('Faction'),
                     # Handle 'Moves' which might be a pipe-separated string or already a list.
@@ -488,6 +536,9 @@ def ai_generate(event_slug, position):
     ai_prompt_parts.append("\n--- Event Context ---")
     ai_prompt_parts.append(f"Event Name: {event.get('Event_Name', 'N/A')}")
     ai_prompt_parts.append(f"Event Date: {event.get('Date', 'N/A')}")
+    if champions_at_the_time:
+        ai_prompt_parts.append("Champions Going Into This Event: " + "; ".join(
+            f"{holder['belt']['Name']}: {holder['champion']}" for holder in champions_at_the_time))
     ai_prompt_parts.append(f"Segment Position: {segment.get('position', 'N/A')}")
     ai_prompt_parts.append(f"Segment Type: {segment.get('type', 'N/A')}")
     if segment.get('header'):
@@ -8,16 +8,11 @@ from src.tagteams import (
 from src.wrestlers import update_wrestler_team_affiliation
 from src import divisions
 from src.prefs import load_preferences # Import load_preferences
+from src.query import query, parse_page_args
 from werkzeug.utils import escape
 
 tagteams_bp = Blueprint('tagteams', __name__, url_prefix='/tagteams')
 
-def _sort_key_ignore_the(name):
-    """Returns a sort key that ignores a leading 'The '."""
-    if name.lower().startswith('the '):
-        return name[4:]
-    return name
-
 STATUS_OPTIONS = ['Active', 'Inactive', 'Suspended', 'Retired']
 ALIGNMENT_OPTIONS = ['Babyface', 'Tweener', 'Heel']
 
@@ -63,15 +58,16 @@ def list_tagteams():
     """Displays a list of all tag-teams, sorted alphabetically, with deletable check."""
     prefs = load_preferences() # Load preferences
     selected_status = request.args.get('status', 'All')
-    all_tagteams = sorted(load_tagteams(), key=lambda t: _sort_key_ignore_the(t.get('Name', '')))
+    page_number, page_size = parse_page_args(request.args)
+    tagteams_query = query('tagteams').order_by('Name') # 'Name' ignores a leading 'The '
 
     if selected_status != 'All':
-        tagteams_list = [t for t in all_tagteams if t.get('Status') == selected_status]
-    else:
-        tagteams_list = all_tagteams
+        tagteams_query.where(Status=selected_status)
+    page = tagteams_query.page(page_number, page_size)
+    tagteams_list = page.items
 
+    divisions.resolve_division_names(tagteams_list)
     for team in tagteams_list:
-        team['DivisionName'] = divisions.get_division_name_by_id(team.get('Division', ''))
         team['is_deletable'] = is_tagteam_deletable(team)
 
     status_options_for_filter = ['All'] + STATUS_OPTIONS
@@ -79,6 +75,7 @@ def list_tagteams():
                            tagteams=tagteams_list,
                            status_options=status_options_for_filter,
                            selected_status=selected_status,
+                           page=page,
                            prefs=prefs) # Pass preferences to the template
 
 @tagteams_bp.route('/create', methods=['GET', 'POST'])
@@ -96,8 +93,9 @@ def create_tagteam():
             flash('At least two members are required.', 'danger')
         elif get_tagteam_by_name(tagteam_data['Name']):
             flash(f"A tag-team with the name '{tagteam_data['Name']}' already exists.", 'danger')
+        elif not add_tagteam(tagteam_data):
+            flash(f"The name '{tagteam_data['Name']}' would share a page URL with an existing tag-team.", 'danger')
         else:
-            add_tagteam(tagteam_data)
             # Sync wrestler team fields
             for member_name in tagteam_data.get('Members', '').split('|'):
                 if member_name: update_wrestler_team_affiliation(member_name, tagteam_data['Name'])
@@ -148,9 +146,9 @@ def edit_tagteam(tagteam_name):
             flash('At least two members are required.', 'danger')
         elif updated_data['Name'] != tagteam_name and get_tagteam_by_name(updated_data['Name']):
             flash(f"A tag-team with the name '{updated_data['Name']}' already exists.", 'danger')
+        elif not update_tagteam(tagteam_name, updated_data):
+            flash(f"The name '{updated_data['Name']}' would share a page URL with an existing tag-team.", 'danger')
         else:
-            update_tagteam(tagteam_name, updated_data)
-            
             # Sync wrestler team fields
             new_members = set(updated_data.get('Members', '').split('|'))
             removed_members = old_members - new_members
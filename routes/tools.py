@@ -1,14 +1,14 @@
 import os
-import zipfile
-import shutil
 from datetime import datetime
 import litellm
 import json
 import html
 import base64
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file, current_app, jsonify
 from dotenv import load_dotenv # Import load_dotenv
-from src.system import get_project_root, DATA_DIR, delete_all_temporary_files
+from src.system import get_project_root, create_backup_archive, restore_backup_archive
+from src.jobs import submit_job, get_job, list_jobs, cancel_job, JobConflict
+from src.consistency import check_consistency
 from src.prefs import load_preferences
 from src.wrestlers import add_wrestler
 from src.static_site_generator import generate_static_site, STATIC_SITE_ZIP_DIR_NAME
@@ -26,7 +26,13 @@ def tools_main():
     static_site_zips = []
     if os.path.exists(zip_storage_path):
         static_site_zips = sorted([f for f in os.listdir(zip_storage_path) if f.endswith('.zip')], reverse=True)
-    return render_template('tools/main.html', static_site_zips=static_site_zips)
+    return render_template('tools/main.html', static_site_zips=static_site_zips, jobs=list_jobs(limit=10))
+
+@tools_bp.route('/consistency')
+def consistency_check():
+    """Checks belts, title history, team members and records for disagreements. ?full=1 re-checks everything."""
+    report = check_consistency(full=request.args.get('full') == '1')
+    return render_template('tools/consistency.html', report=report)
 
 @tools_bp.route('/backup')
 def backup_restore():
@@ -41,7 +47,7 @@ def ai_roster_generator_form():
 @tools_bp.route('/generate-roster', methods=['POST'])
 def generate_roster():
     """
-    Generates a roster of wrestlers using AI based on user input and displays them for review.
+    Starts AI roster generation as a background job; its page links to the review when done.
     """
     roster_prompt = request.form.get('roster_prompt')
     content_mode = request.form.get('content_mode')
@@ -51,6 +57,27 @@ def generate_roster():
         flash("Roster prompt cannot be empty.", "danger")
         return redirect(url_for('tools.ai_roster_generator_form'))
 
+    job_id = submit_job('ai_roster', 'AI roster generation', _generate_roster_job, roster_prompt, content_mode, max_wrestlers)
+    return redirect(url_for('tools.view_job', job_id=job_id))
+
+@tools_bp.route('/ai-roster-generator/review/<job_id>')
+def review_generated_roster(job_id):
+    """Displays a finished AI roster generation job's wrestlers for review."""
+    job = get_job(job_id)
+    if not job or job['kind'] != 'ai_roster' or job['status'] != 'succeeded':
+        flash("That generated roster is not available.", "warning")
+        return redirect(url_for('tools.ai_roster_generator_form'))
+    return render_template('tools/roster_generator.html',
+                           generated_roster=job['result']['generated_roster'],
+                           search_sources=job['result']['search_sources'])
+
+def _generate_roster_job(job, roster_prompt, content_mode, max_wrestlers):
+    """
+    Generates a roster of wrestlers using AI based on user input. Returns the
+    wrestlers prepared for the review page; problems are raised as ValueError
+    with the message to show.
+    """
+    ai_content = ''
     try:
         # Load AI preferences
         prefs = load_preferences()
@@ -70,8 +97,7 @@ def generate_roster():
             os.environ["SLAMSIM_OPENAI_KEY"] = api_key_to_use # Ensure litellm sees it
 
         if not all([model_provider, model_name, api_key_to_use]):
-            flash("AI model preferences are not fully configured. Please check your preferences.", "danger")
-            return redirect(url_for('tools.ai_roster_generator_form'))
+            raise ValueError("AI model preferences are not fully configured. Please check your preferences.")
 
         system_prompt = f"""
         You are an expert wrestling booker and creative writer. Your task is to generate a list of {max_wrestlers} professional wrestlers based on the user's prompt.
@@ -128,8 +154,9 @@ def generate_roster():
         # Add other providers if necessary
 
         if not litellm_model_string:
-            flash("Unsupported AI provider configured.", "danger")
-            return redirect(url_for('tools.ai_roster_generator_form'))
+            raise ValueError("Unsupported AI provider configured.")
+
+        job.progress(1, 3, "Waiting for the AI model")
 
         response = litellm.completion(
             model=litellm_model_string,
@@ -188,8 +215,7 @@ def generate_roster():
             })
 
         if not generated_roster_for_template:
-            flash("AI generated an empty roster or invalid structure. Please try again.", "warning")
-            return redirect(url_for('tools.ai_roster_generator_form'))
+            raise ValueError("AI generated an empty roster or invalid structure. Please try again.")
 
         # --- Fix 2: Extract Grounding Sources (Even if unused right now, it's necessary for inspection) ---
         search_sources = []
@@ -201,20 +227,13 @@ def generate_roster():
             # Handle cases where the response structure is unexpected
             pass 
 
-        # Render the review page
-        return render_template('tools/roster_generator.html', 
-                               generated_roster=generated_roster_for_template, 
-                               search_sources=search_sources)
+        # Kept as the job result for the review page
+        return {'generated_roster': generated_roster_for_template, 'search_sources': search_sources}
 
     except json.JSONDecodeError as e:
-        flash(f"AI response was not valid JSON. Error: {e}. Raw response: {ai_content[:500]}...", "danger")
-        return redirect(url_for('tools.ai_roster_generator_form'))
+        raise ValueError(f"AI response was not valid JSON. Error: {e}. Raw response: {ai_content[:500]}...")
     except litellm.exceptions.APIError as e:
-        flash(f"AI API Error: {e}. Please check your API key and model configuration.", "danger")
-        return redirect(url_for('tools.ai_roster_generator_form'))
-    except Exception as e:
-        flash(f"An unexpected error occurred: {e}", "danger")
-        return redirect(url_for('tools.ai_roster_generator_form'))
+        raise ValueError(f"AI API Error: {e}. Please check your API key and model configuration.")
 
 @tools_bp.route('/commit-roster', methods=['POST'])
 def commit_roster():
@@ -255,41 +274,27 @@ def commit_roster():
 
 @tools_bp.route('/backup_data', methods=['GET'])
 def backup_data():
-    """Handles the backup of all league data."""
-    try:
-        root_path = get_project_root()
-        data_path = os.path.join(root_path, DATA_DIR)
-        
-        if not os.path.exists(data_path):
-            flash("No data directory found to backup.", "danger")
-            return redirect(url_for('tools.backup_restore'))
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"slamsim_backup_{timestamp}" # No .zip extension here for make_archive
-        
-        # Create the zip archive
-        # shutil.make_archive(base_name, format, root_dir, base_dir)
-        # base_name: The name of the archive file to create, including the path, but without the .zip extension.
-        # format: The archive format, e.g., 'zip'.
-        # root_dir: The directory from which to start archiving.
-        # base_dir: The directory that will be archived.
-        archive_path = shutil.make_archive(
-            os.path.join(root_path, backup_filename), # Archive will be created in root_path
-            'zip',
-            root_path, # Start archiving from the project root
-            DATA_DIR    # Archive the 'data' directory relative to root_path
-        )
-
-        flash("League data backed up successfully!", "success")
-        return send_file(archive_path, as_attachment=True, download_name=os.path.basename(archive_path))
-
-    except Exception as e:
-        flash(f"Error creating backup: {e}", "danger")
-        return redirect(url_for('tools.backup_restore'))
+    """Starts a backup of all league data as a background job."""
+    job_id = submit_job('backup', 'League data backup', _backup_job)
+    return redirect(url_for('tools.view_job', job_id=job_id))
+
+def _backup_job(job):
+    job.progress(0, 1, "Archiving the data directory")
+    archive_path = create_backup_archive()
+    return {'file': os.path.basename(archive_path), 'messages': [("League data backed up successfully!", "success")]}
+
+@tools_bp.route('/download_backup/<filename>')
+def download_backup(filename):
+    """Downloads a backup archive created by a backup job."""
+    file_path = os.path.join(get_project_root(), os.path.basename(filename))
+    if filename.startswith('slamsim_backup_') and filename.endswith('.zip') and os.path.exists(file_path):
+        return send_file(file_path, as_attachment=True, download_name=os.path.basename(file_path))
+    flash("Backup file not found.", "danger")
+    return redirect(url_for('tools.backup_restore'))
 
 @tools_bp.route('/restore_data', methods=['POST'])
 def restore_data():
-    """Handles the restoration of league data from a backup file."""
+    """Saves an uploaded backup file and restores it as a background job."""
     if 'backup_file' not in request.files:
         flash('No file part', 'danger')
         return redirect(url_for('tools.backup_restore'))
@@ -300,83 +305,69 @@ def restore_data():
         return redirect(url_for('tools.backup_restore'))
 
     if file and file.filename.endswith('.zip'):
-        root_path = get_project_root()
-        data_path = os.path.join(root_path, DATA_DIR)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        old_data_path = f"{data_path}_old_{timestamp}"
-        temp_zip_path = os.path.join(root_path, f"temp_restore_{timestamp}.zip") # Unique temp name
-
+        temp_zip_path = os.path.join(get_project_root(), f"temp_restore_{timestamp}.zip") # Unique temp name
+        file.save(temp_zip_path) # The upload only lives for this request
         try:
-            # 1. Save the uploaded zip file temporarily
-            file.save(temp_zip_path)
-
-            # 2. Rename existing data directory as a safeguard
-            if os.path.exists(data_path):
-                shutil.move(data_path, old_data_path)
-                flash(f"Existing data moved to '{os.path.basename(old_data_path)}' as a safeguard.", "info")
-            
-            # 3. Create a new, empty data directory
-            os.makedirs(data_path, exist_ok=True)
-            
-            # 4. Unzip the contents of the uploaded file into the new data directory
-            with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
-                # Check if the zip contains a 'data/' directory at its root
-                # If so, extract to root_path so 'data/' is created correctly
-                namelist = zip_ref.namelist()
-                if any(name.startswith(f'{DATA_DIR}/') for name in namelist):
-                    zip_ref.extractall(root_path)
-                else:
-                    # Otherwise, extract directly into the new data_path
-                    zip_ref.extractall(data_path)
-
-            # 5. Clean up temporary files and old data directory
+            job_id = submit_job('restore', 'League data restore', _restore_job, temp_zip_path)
+        except JobConflict as e:
             os.remove(temp_zip_path)
-            if os.path.exists(old_data_path):
-                shutil.rmtree(old_data_path) # Remove the old data directory after successful restore
-            
-            # 6. Clear any temporary files generated by the application
-            delete_all_temporary_files()
-
-            flash('League data restored successfully!', 'success')
-            return redirect(url_for('booker.dashboard'))
-
-        except zipfile.BadZipFile:
-            flash('Invalid backup file. Please upload a valid .zip file.', 'danger')
-            # Attempt to revert if extraction failed due to bad zip
-            if os.path.exists(data_path):
-                shutil.rmtree(data_path) # Remove the incomplete new data dir
-            if os.path.exists(old_data_path):
-                shutil.move(old_data_path, data_path) # Restore old data
-                flash("Attempted to restore previous data due to invalid backup file.", "info")
-        except Exception as e:
-            flash(f'Error restoring data: {e}. Please check the "{os.path.basename(old_data_path)}" directory for manual recovery.', 'danger')
-            # If any other error, ensure old data is preserved and new (potentially corrupt) data is removed
-            if os.path.exists(data_path):
-                shutil.rmtree(data_path) # Remove the incomplete new data dir
-            if os.path.exists(old_data_path) and not os.path.exists(data_path): # Only move back if data_path is truly gone
-                shutil.move(old_data_path, data_path) # Restore old data
-                flash("Attempted to restore previous data due to restoration error.", "info")
-        finally:
-            if os.path.exists(temp_zip_path):
-                os.remove(temp_zip_path)
-    else:
-        flash('Invalid file type. Please upload a .zip file.', 'danger')
-    
+            flash(str(e), 'warning')
+            return redirect(url_for('tools.view_job', job_id=e.job['id']))
+        return redirect(url_for('tools.view_job', job_id=job_id))
+
+    flash('Invalid file type. Please upload a .zip file.', 'danger')
     return redirect(url_for('tools.backup_restore'))
 
+def _restore_job(job, temp_zip_path):
+    try:
+        job.progress(0, 1, "Restoring league data")
+        success, messages = restore_backup_archive(temp_zip_path)
+    finally:
+        if os.path.exists(temp_zip_path):
+            os.remove(temp_zip_path)
+    if not success:
+        raise ValueError(' '.join(text for text, _category in messages))
+    return {'messages': messages}
+
 @tools_bp.route('/generate_static_site', methods=['POST'])
 def generate_static_site_route():
-    """Triggers the generation of a static Fan Mode site."""
-    try:
-        # Pass the current Flask app instance to the generator function
-        zip_file_path = generate_static_site(current_app)
-        zip_filename = os.path.basename(zip_file_path)
-        download_url = url_for('tools.download_static_site', filename=zip_filename)
-        flash(f"Static Fan Mode site generated successfully! You can download it <a href='{download_url}' class='alert-link'>{zip_filename}</a>.", "success")
-        return redirect(url_for('tools.tools_main'))
-    except Exception as e:
-        flash(f"Error generating static site: {e}", "danger")
+    """Starts generation of a static Fan Mode site as a background job."""
+    # Pass the current Flask app instance to the generator function
+    job_id = submit_job('static_site', 'Static fan site generation', _static_site_job, current_app._get_current_object())
+    return redirect(url_for('tools.view_job', job_id=job_id))
+
+def _static_site_job(job, flask_app):
+    zip_file_path = generate_static_site(flask_app, progress=job.progress)
+    return {'file': os.path.basename(zip_file_path),
+            'messages': [("Static Fan Mode site generated successfully!", "success")]}
+
+# --- Background jobs ---
+
+@tools_bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """JSON progress of a background job."""
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found.'}), 404
+    job.pop('traceback', None)
+    return jsonify(job)
+
+@tools_bp.route('/jobs/<job_id>/view')
+def view_job(job_id):
+    """Progress page for a background job; polls job_status until the job finishes."""
+    job = get_job(job_id)
+    if not job:
+        flash("Job not found.", "danger")
         return redirect(url_for('tools.tools_main'))
+    return render_template('tools/job.html', job=job)
+
+@tools_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job_route(job_id):
+    """Requests cancellation of a queued or running job."""
+    success, message = cancel_job(job_id)
+    flash(message, 'info' if success else 'warning')
+    return redirect(url_for('tools.view_job', job_id=job_id))
 
 @tools_bp.route('/download_static_site/<filename>')
 def download_static_site(filename):
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from src.wrestlers import load_wrestlers, get_wrestler_by_name, add_wrestler, update_wrestler, delete_wrestler
 from src import divisions
 from src.prefs import load_preferences # Import load_preferences
+from src.query import query, parse_page_args
 import html
 
 wrestlers_bp = Blueprint('wrestlers', __name__, url_prefix='/wrestlers')
@@ -35,15 +36,16 @@ def _get_form_data(form):
 @wrestlers_bp.route('/')
 def list_wrestlers():
     selected_status = request.args.get('status', 'All')
-    all_wrestlers = sorted(load_wrestlers(), key=lambda w: w.get('Name', ''))
+    page_number, page_size = parse_page_args(request.args)
+    wrestlers_query = query('wrestlers').order_by('Name')
 
     if selected_status != 'All':
-        wrestlers_list = [w for w in all_wrestlers if w.get('Status') == selected_status]
-    else:
-        wrestlers_list = all_wrestlers
+        wrestlers_query.where(Status=selected_status)
+    page = wrestlers_query.page(page_number, page_size)
+    wrestlers_list = page.items
 
+    divisions.resolve_division_names(wrestlers_list)
     for wrestler in wrestlers_list:
-        wrestler['DivisionName'] = divisions.get_division_name_by_id(wrestler.get('Division', ''))
         wrestler['is_deletable'] = is_wrestler_deletable(wrestler)
 
     prefs = load_preferences() # Load preferences
@@ -52,6 +54,7 @@ def list_wrestlers():
                            wrestlers=wrestlers_list,
                            status_options=status_options_for_filter,
                            selected_status=selected_status,
+                           page=page,
                            prefs=prefs) # Pass preferences to the template
 
 @wrestlers_bp.route('/create', methods=['GET', 'POST'])
@@ -69,7 +72,7 @@ def create_wrestler():
         elif add_wrestler(wrestler_data):
             flash(f'Wrestler "{wrestler_data["Name"]}" created successfully!', 'success')
             return redirect(url_for('wrestlers.list_wrestlers'))
-        else: flash(f'Wrestler with the name "{wrestler_data["Name"]}" already exists.', 'error')
+        else: flash(f'Wrestler with the name "{wrestler_data["Name"]}" (or one with the same URL slug) already exists.', 'error')
         return render_template('booker/wrestlers/form.html', wrestler=wrestler_data, status_options=STATUS_OPTIONS, alignment_options=ALIGNMENT_OPTIONS, divisions=all_divisions, wrestling_styles_options=WRESTLING_STYLES_OPTIONS, edit_mode=False, prefs=prefs) # Pass preferences
     return render_template('booker/wrestlers/form.html', wrestler={}, status_options=STATUS_OPTIONS, alignment_options=ALIGNMENT_OPTIONS, divisions=all_divisions, wrestling_styles_options=WRESTLING_STYLES_OPTIONS, edit_mode=False, prefs=prefs) # Pass preferences
 
@@ -91,7 +94,7 @@ def edit_wrestler(wrestler_name):
         elif update_wrestler(wrestler_name, updated_data):
             flash(f'Wrestler "{updated_data["Name"]}" updated successfully!', 'success')
             return redirect(url_for('wrestlers.list_wrestlers'))
-        else: flash(f'Failed to update wrestler "{wrestler_name}". New name might already exist.', 'error')
+        else: flash(f'Failed to update wrestler "{wrestler_name}". New name might already exist or share a URL slug.', 'error')
         return render_template('booker/wrestlers/form.html', wrestler=updated_data, status_options=STATUS_OPTIONS, alignment_options=ALIGNMENT_OPTIONS, divisions=all_divisions, wrestling_styles_options=WRESTLING_STYLES_OPTIONS, edit_mode=True, prefs=prefs) # Pass preferences
 
     wrestler_display = wrestler.copy()
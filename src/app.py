@@ -1,6 +1,5 @@
 import os
-import markdown
-from flask import Flask, render_template, url_for, g, request # Import g and request
+from flask import Flask, render_template, url_for, g, request, flash, redirect, jsonify # Import g and request
 from routes.divisions import divisions_bp
 from routes.prefs import prefs_bp
 from routes.wrestlers import wrestlers_bp
@@ -12,6 +11,8 @@ from routes.news import news_bp
 from routes.booker import booker_bp # Import the new booker blueprint
 from routes.fan import fan_bp       # Import the new fan blueprint
 from routes.tools import tools_bp   # Import the new tools blueprint
+from src.segments import render_markdown
+from src.jobs import get_data_writing_job
 from src.system import INCLUDES_DIR, LEAGUE_LOGO_FILENAME # Import INCLUDES_DIR and LEAGUE_LOGO_FILENAME
 from src.static_site_generator import STATIC_SITE_OUTPUT_DIR_NAME # Import for static_url_map
 
@@ -33,16 +34,46 @@ app.register_blueprint(booker_bp) # Register the booker blueprint
 app.register_blueprint(fan_bp)     # Register the fan blueprint
 app.register_blueprint(tools_bp)   # Register the tools blueprint
 
-# Register a custom Jinja2 filter for markdown
+# Register a custom Jinja2 filter for markdown, cached by content hash
 @app.template_filter('markdown')
 def markdown_filter(text):
-    return markdown.markdown(text)
+    return render_markdown(text)
 
 # Before request handler to set static_export_mode based on a custom header
 @app.before_request
 def set_static_export_mode():
     g.static_export_mode = request.headers.get('X-Static-Export') == 'true'
 
+# Changes to roster, belt and event data are refused while a finalization job
+# runs, because the job writes back the data it loaded when it started. A restore
+# replaces the whole data directory, so while one runs every change is refused
+# except cancelling jobs.
+DATA_LOCKED_BLUEPRINTS = {'wrestlers', 'tagteams', 'belts', 'events', 'segments'}
+DATA_LOCKED_ENDPOINTS = {'prefs.reset_records', 'prefs.rebuild_records_route', 'prefs.rebuild_lineage_route',
+                         'prefs.recalculate_tagteam_weights_route', 'tools.commit_roster', 'tools.restore_data'}
+
+@app.before_request
+def refuse_edits_during_data_jobs():
+    if request.method == 'GET' or request.endpoint == 'tools.cancel_job_route':
+        return None
+    job = get_data_writing_job()
+    if job is None:
+        return None
+    if job['kind'] != 'restore' and request.blueprint not in DATA_LOCKED_BLUEPRINTS and request.endpoint not in DATA_LOCKED_ENDPOINTS:
+        return None
+    message = f"{job['label']} is running. Changes to the roster, belts and events are paused until it finishes."
+    if request.is_json:
+        return jsonify({'error': message}), 409
+    flash(message, 'warning')
+    return redirect(url_for('tools.view_job', job_id=job['id']))
+
+@app.context_processor
+def inject_data_writing_job():
+    # Booker pages show a notice while edits are paused; fan pages and exports do not
+    if getattr(g, 'static_export_mode', False) or request.blueprint == 'fan':
+        return {'data_writing_job': None}
+    return {'data_writing_job': get_data_writing_job()}
+
 # Context processor to make static_export_mode and a static_url_for available in templates
 @app.context_processor
 def inject_static_export_mode_and_urls():
@@ -0,0 +1,129 @@
+import bisect
+import unicodedata
+from src.wrestlers import load_wrestlers, _get_wrestlers_file_path
+from src.tagteams import load_tagteams, get_team_index, _get_tagteams_file_path
+from src.generations import get_cached
+from src.query import name_sort_key
+
+# Participant autocomplete for the match builder. The index over wrestler and tag
+# team names is built once per version of wrestlers.json and tagteams.json:
+#   - 'names': every name's normalized form, sorted, for full-name prefix lookups
+#   - 'words': the normalized name from each later word on ("the kid" -> "kid"),
+#     sorted, so a query also matches the start of any word
+#   - 'trigrams': {trigram: set of entry ids}, for matches inside a word
+# Entries are numbered in display order, so ids sort like names and every lookup
+# can stop as soon as it has enough results.
+
+AUTOCOMPLETE_LIMIT = 20
+MAX_AUTOCOMPLETE_LIMIT = 100
+
+def _normalize(text):
+    """Case- and accent-insensitive form of a name used for matching."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _build_participant_index():
+    team_index = get_team_index()
+    entries, seen = [], set()
+    for wrestler in load_wrestlers():
+        name = wrestler.get('Name')
+        if name and ('wrestler', name) not in seen:
+            seen.add(('wrestler', name))
+            entries.append({'type': 'wrestler', 'name': name, 'status': wrestler.get('Status', ''), 'members': [name]})
+    for team in load_tagteams():
+        name = team.get('Name')
+        if name and ('tagteam', name) not in seen:
+            seen.add(('tagteam', name))
+            entries.append({'type': 'tagteam', 'name': name, 'status': team.get('Status', ''),
+                            'members': list(team_index['members'].get(name, ()))})
+    entries.sort(key=lambda e: (name_sort_key(e['name']).casefold(), e['type']))
+
+    names, words, trigrams = [], [], {}
+    for entry_id, entry in enumerate(entries):
+        normalized = _normalize(entry['name'])
+        names.append((normalized, entry_id))
+        parts = normalized.split(' ')
+        for i in range(1, len(parts)):
+            words.append((' '.join(parts[i:]), entry_id))
+        for trigram in _trigrams(normalized):
+            trigrams.setdefault(trigram, set()).add(entry_id)
+    names.sort()
+    words.sort()
+    return {
+        'entries': entries,
+        'normalized': [_normalize(entry['name']) for entry in entries],
+        'names': names, 'name_keys': [key for key, _ in names],
+        'words': words, 'word_keys': [key for key, _ in words],
+        'trigrams': trigrams,
+    }
+
+def get_participant_index():
+    """Returns the participant index, rebuilt when the roster files change."""
+    return get_cached('participant-index', [_get_wrestlers_file_path(), _get_tagteams_file_path()],
+                      _build_participant_index)
+
+def _prefix_ids(keys, pairs, term):
+    """Entry ids whose key starts with term, in key order."""
+    i = bisect.bisect_left(keys, term)
+    while i < len(keys) and keys[i].startswith(term):
+        yield pairs[i][1]
+        i += 1
+
+def _substring_ids(index, term):
+    """Entry ids whose name contains term, found through the trigram postings, in display order."""
+    postings = sorted((index['trigrams'].get(t, set()) for t in _trigrams(term)), key=len)
+    if not postings or not postings[0]:
+        return
+    smallest, rest = postings[0], postings[1:]
+    for entry_id in sorted(smallest):
+        if all(entry_id in p for p in rest) and term in index['normalized'][entry_id]:
+            yield entry_id
+
+def get_related_teams(names):
+    """Tag teams sharing a member with any of the given wrestlers: [{'Name', 'Members'}]."""
+    team_index = get_team_index()
+    team_names = []
+    for name in names:
+        for team_name in team_index['teams_by_member'].get(name, ()):
+            if team_name not in team_names:
+                team_names.append(team_name)
+    return [{'Name': team_name, 'Members': list(team_index['members'][team_name])} for team_name in team_names]
+
+def search_participants(term, limit=AUTOCOMPLETE_LIMIT, active_only=True):
+    """
+    Returns up to limit wrestlers and tag teams matching term: names starting
+    with it first, then names with a word starting with it, then names containing
+    it (three characters or more). Each result carries its members and the tag
+    teams related to them, so the match builder can detect teams on a side:
+    [{'type', 'name', 'status', 'members', 'teams'}]
+    """
+    term = _normalize(term)
+    if not term:
+        return []
+    index = get_participant_index()
+    lookups = [_prefix_ids(index['name_keys'], index['names'], term),
+               _prefix_ids(index['word_keys'], index['words'], term)]
+    if len(term) >= 3:
+        lookups.append(_substring_ids(index, term))
+
+    found, results = set(), []
+    for lookup in lookups:
+        ranked = []
+        for entry_id in lookup:
+            if entry_id in found:
+                continue
+            if active_only and index['entries'][entry_id]['status'] != 'Active':
+                continue
+            found.add(entry_id)
+            ranked.append(entry_id)
+            if len(results) + len(ranked) >= limit:
+                break
+        results.extend(sorted(ranked)) # Display order within each kind of match
+        if len(results) >= limit:
+            break
+
+    return [dict(index['entries'][entry_id], teams=get_related_teams(index['entries'][entry_id]['members']))
+            for entry_id in results]
@@ -1,9 +1,12 @@
+import bisect
 import json
 import os
 import uuid
 from datetime import datetime
 from src.wrestlers import load_wrestlers, save_wrestlers
 from src.tagteams import load_tagteams, save_tagteams
+from src.generations import bump_generation, get_cached
+from src.date_utils import parse_date
 
 BELTS_FILE_RELATIVE_TO_ROOT = 'data/belts.json'
 BELT_HISTORY_FILE_RELATIVE_TO_ROOT = 'data/belt_history.json'
@@ -35,6 +38,7 @@ def save_belts(belts_list):
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(belts_list, f, indent=4)
+        bump_generation(file_path)
         return True
     except IOError: return False
 
@@ -95,6 +99,7 @@ def save_belt_history(history_list):
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(history_list, f, indent=4)
+        bump_generation(file_path)
         return True
     except IOError: return False
 
@@ -130,6 +135,81 @@ def delete_reign_from_history(reign_id):
         return (True, "Reign deleted successfully.") if save_belt_history(history_after) else (False, "Error saving changes.")
     return False, "Reign not found."
 
+# --- Reign interval index ---
+#
+# Each reign covers the days from Date_Won up to, but not including, Date_Lost
+# (open reigns never end), so a title that changes hands on a date belongs to the
+# new champion from that date on. Per belt, reigns are sorted by the ordinal of
+# Date_Won with a running maximum of the end ordinals, so a query bisects to the
+# last reign starting in time and walks back only while an earlier reign can
+# still cover the date. Reigns of one belt rarely overlap, which makes a lookup
+# logarithmic. The index is rebuilt per belt history generation.
+
+OPEN_REIGN_END = float('inf')
+
+def _build_reign_index(history):
+    reigns_by_belt = {}
+    for reign in history:
+        won = parse_date(reign.get('Date_Won'))
+        if won is None:
+            continue # A reign without a valid start date cannot be placed in time
+        lost = parse_date(reign.get('Date_Lost')) if reign.get('Date_Lost') else None
+        reigns_by_belt.setdefault(reign.get('Belt_ID'), []).append(
+            (won.toordinal(), lost.toordinal() if lost else OPEN_REIGN_END, reign))
+    index = {}
+    for belt_id, reigns in reigns_by_belt.items():
+        reigns.sort(key=lambda r: r[0]) # Stable, so reigns won on the same day keep their history order
+        max_ends, running = [], float('-inf')
+        for _won, lost, _reign in reigns:
+            running = max(running, lost)
+            max_ends.append(running)
+        index[belt_id] = {'starts': [r[0] for r in reigns], 'max_ends': max_ends, 'reigns': reigns}
+    return index
+
+def get_reign_index():
+    """Returns the reign interval index: {belt_id: {'starts', 'max_ends', 'reigns'}}."""
+    return get_cached('reign-index', [_get_belt_history_file_path()], lambda: _build_reign_index(load_belt_history()))
+
+def _overlapping_reigns(entry, first_day, last_day):
+    """Reigns of one belt covering any day from first_day to last_day (ordinals), in Date_Won order."""
+    found = []
+    i = bisect.bisect_right(entry['starts'], last_day) - 1
+    while i >= 0 and entry['max_ends'][i] > first_day:
+        won, lost, reign = entry['reigns'][i]
+        if lost > first_day:
+            found.append(reign)
+        i -= 1
+    found.reverse()
+    return found
+
+def get_champions_on(date_str, going_in=False):
+    """
+    Returns {belt_id: reign} for the reigns held on a date. With going_in, the
+    date's own title changes are left out, which gives the champions heading into
+    an event held that day.
+    """
+    day = parse_date(date_str)
+    if day is None:
+        return {}
+    point = day.toordinal() - 1 if going_in else day.toordinal()
+    champions = {}
+    for belt_id, entry in get_reign_index().items():
+        reigns = _overlapping_reigns(entry, point, point)
+        if reigns:
+            champions[belt_id] = reigns[-1] # The latest reign to start wins if history overlaps
+    return champions
+
+def get_belt_holders_on(date_str, going_in=False):
+    """[{'belt': belt, 'champion': name}] for every belt held on a date, in display order."""
+    champions = get_champions_on(date_str, going_in)
+    holders = []
+    for belt in sorted(load_belts(), key=lambda b: b.get('Display_Position', 0)):
+        reign = champions.get(belt.get('ID'))
+        if reign:
+            holders.append({'belt': belt, 'champion': reign.get('Champion_Name')})
+    return holders
+
+
 def process_championship_change(belt, winner_name, event_date):
     """Handles all data updates for a championship change."""
     all_belts = load_belts()
@@ -0,0 +1,349 @@
+"""
+Storage conformance and benchmark suite.
+
+Runs the public src/ storage API (load/get/add/update/delete for every entity,
+championship changes and record updates) against one or more storage backends
+at configurable league sizes, times every operation and checks that every
+backend returns exactly the same results as the first (reference) backend.
+
+A backend is a directory containing a complete 'src' package. Each run copies
+that package into a scratch project root with its own empty data/ directory and
+executes the workload in a separate process, so the real league data is never
+touched and backends cannot share in-process caches.
+
+Usage (from the project root):
+    python -m src.benchmark --sizes 1000x100,10000x1000 --output benchmark.json
+    python -m src.benchmark --backend json=src --backend candidate=/path/to/src
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SIZES = [(1000, 100)]
+DEFAULT_OPERATIONS = 20
+DEFAULT_SEED = 1234
+
+# Fields filled with random UUIDs by the storage layer. They can never match
+# between two runs, so they are left out of result digests.
+VOLATILE_FIELDS = {'Reign_ID', 'News_ID'}
+
+def _normalize(value):
+    """Strips volatile fields so results can be compared between runs."""
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+def _digest(values):
+    """Returns a stable hash of a list of operation results."""
+    encoded = json.dumps(_normalize(values), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+# --- League generation ---
+
+def _make_league(num_wrestlers, num_events, rng):
+    """Builds a deterministic league of the requested size."""
+    divisions = [
+        {'ID': 'singles-bench', 'Name': 'Singles', 'Holder_Type': 'Singles', 'Display_Position': 1, 'Status': 'Active'},
+        {'ID': 'tag-bench', 'Name': 'Tag Teams', 'Holder_Type': 'Tag-Team', 'Display_Position': 2, 'Status': 'Active'},
+    ]
+    wrestlers = []
+    for i in range(num_wrestlers):
+        wrestlers.append({
+            'Name': f'Wrestler {i:06d}', 'Status': rng.choice(['Active', 'Active', 'Active', 'Injured', 'Inactive']),
+            'Division': 'singles-bench', 'Nickname': '', 'Location': 'Somewhere', 'Height': '6-0',
+            'Weight': str(rng.randint(180, 320)), 'DOB': '', 'Alignment': rng.choice(['Face', 'Heel', 'Tweener']),
+            'Music': '', 'Faction': '', 'Manager': '', 'Moves': 'Suplex|Powerbomb', 'Awards': '', 'Salary': '',
+            'Team': '', 'Belt': '', 'Hide_From_Fan_Roster': False,
+            'Singles_Wins': str(rng.randint(0, 50)), 'Singles_Losses': str(rng.randint(0, 50)), 'Singles_Draws': str(rng.randint(0, 5)),
+            'Tag_Wins': str(rng.randint(0, 30)), 'Tag_Losses': str(rng.randint(0, 30)), 'Tag_Draws': str(rng.randint(0, 5)),
+        })
+    tagteams = []
+    for i in range(num_wrestlers // 4):
+        members = [wrestlers[2 * i]['Name'], wrestlers[2 * i + 1]['Name']]
+        tagteams.append({
+            'Name': f'Team {i:06d}', 'Status': 'Active', 'Division': 'tag-bench', 'Location': '', 'Weight': '500',
+            'Alignment': 'Face', 'Music': '', 'Members': '|'.join(members), 'Faction': '', 'Manager': '',
+            'Moves': '', 'Awards': '', 'Belt': '', 'Hide_From_Fan_Roster': False,
+            'Wins': str(rng.randint(0, 30)), 'Losses': str(rng.randint(0, 30)), 'Draws': str(rng.randint(0, 5)),
+        })
+    start = datetime.date(2000, 1, 1)
+    events = []
+    for i in range(num_events):
+        events.append({
+            'Event_Name': f'Event {i:06d}', 'Subtitle': '', 'Status': 'Past',
+            'Date': (start + datetime.timedelta(days=7 * i)).isoformat(), 'Venue': 'Arena', 'Location': 'City',
+            'Broadcasters': '', 'Finalized': False,
+        })
+    belts = [
+        {'ID': 'world-bench', 'Name': 'World Championship', 'Status': 'Active', 'Holder_Type': 'Singles',
+         'Current_Holder': '', 'Champion_Title': 'World Champion', 'Display_Position': 1},
+        {'ID': 'tag-bench', 'Name': 'Tag Team Championship', 'Status': 'Active', 'Holder_Type': 'Tag-Team',
+         'Current_Holder': '', 'Champion_Title': 'Tag Team Champions', 'Display_Position': 2},
+    ]
+    news = []
+    for i in range(num_events):
+        news.append({
+            'News_ID': f'news-{i:06d}', 'Subject': f'News {i:06d}', 'Content': 'Lorem ipsum.',
+            'Date': (start + datetime.timedelta(days=7 * i + 1)).isoformat(),
+        })
+    return {'divisions': divisions, 'wrestlers': wrestlers, 'tagteams': tagteams,
+            'events': events, 'belts': belts, 'news': news}
+
+# --- Workload (runs inside the scratch project) ---
+
+class _Recorder:
+    """Collects timings and results per operation."""
+
+    def __init__(self):
+        self.timings = {}
+        self.results = {}
+
+    def run(self, operation, func, *args, volatile=False):
+        """
+        Calls func(*args), timing it and recording its result under operation.
+        Volatile results (e.g. generated IDs) only record whether one was returned.
+        """
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        self.timings.setdefault(operation, []).append(elapsed)
+        self.results.setdefault(operation, []).append(bool(result) if volatile else result)
+        return result
+
+    def summary(self):
+        """Returns {'timings': {op: stats}, 'digests': {op: hash}}."""
+        timings = {}
+        for operation, samples in self.timings.items():
+            total = sum(samples)
+            timings[operation] = {
+                'count': len(samples),
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total * 1000 / len(samples), 3),
+                'min_ms': round(min(samples) * 1000, 3),
+                'max_ms': round(max(samples) * 1000, 3),
+            }
+        digests = {operation: _digest(values) for operation, values in self.results.items()}
+        return {'timings': timings, 'digests': digests}
+
+def _run_workload(num_wrestlers, num_events, operations, seed):
+    """Seeds a league through the storage API and exercises every operation."""
+    from src import belts, divisions, events, news, tagteams, wrestlers
+
+    rng = random.Random(seed)
+    league = _make_league(num_wrestlers, num_events, rng)
+    recorder = _Recorder()
+
+    # Bulk saves seed the league (adding rows one by one would dominate the run)
+    recorder.run('divisions.save', divisions.save_divisions, league['divisions'])
+    recorder.run('wrestlers.save', wrestlers.save_wrestlers, league['wrestlers'])
+    recorder.run('tagteams.save', tagteams.save_tagteams, league['tagteams'])
+    recorder.run('events.save', events.save_events, league['events'])
+    recorder.run('belts.save', belts.save_belts, league['belts'])
+    recorder.run('belts.save_history', belts.save_belt_history, [])
+    recorder.run('news.save', news.save_news_posts, league['news'])
+
+    wrestler_names = [w['Name'] for w in league['wrestlers']]
+    team_names = [t['Name'] for t in league['tagteams']]
+    event_names = [e['Event_Name'] for e in league['events']]
+    news_ids = [p['News_ID'] for p in league['news']]
+    results = ['Win', 'Loss', 'Draw']
+
+    for i in range(operations):
+        # Divisions
+        recorder.run('divisions.load', divisions.load_divisions)
+        recorder.run('divisions.get', divisions.get_division_by_id, rng.choice(['singles-bench', 'tag-bench', 'missing']))
+        division = {'ID': f'bench-division-{i}', 'Name': f'Bench Division {i}', 'Holder_Type': 'Singles', 'Display_Position': 10 + i, 'Status': 'Active'}
+        recorder.run('divisions.add', divisions.add_division, division)
+        recorder.run('divisions.update', divisions.update_division, division['ID'], dict(division, Status='Inactive'))
+        recorder.run('divisions.delete', divisions.delete_division, division['ID'])
+
+        # Wrestlers
+        recorder.run('wrestlers.load', wrestlers.load_wrestlers)
+        if wrestler_names:
+            name = rng.choice(wrestler_names)
+            recorder.run('wrestlers.get', wrestlers.get_wrestler_by_name, name)
+            recorder.run('wrestlers.record', wrestlers.update_wrestler_record, name,
+                         rng.choice(['singles', 'tag', 'other', 'battle_royal']), rng.choice(results))
+        new_wrestler = dict(league['wrestlers'][0] if league['wrestlers'] else {}, Name=f'Bench Wrestler {i}')
+        recorder.run('wrestlers.add', wrestlers.add_wrestler, new_wrestler)
+        recorder.run('wrestlers.update', wrestlers.update_wrestler, new_wrestler['Name'], dict(new_wrestler, Nickname='Updated'))
+        recorder.run('wrestlers.delete', wrestlers.delete_wrestler, new_wrestler['Name'])
+
+        # Tag teams
+        recorder.run('tagteams.load', tagteams.load_tagteams)
+        if team_names:
+            team_name = rng.choice(team_names)
+            recorder.run('tagteams.get', tagteams.get_tagteam_by_name, team_name)
+            recorder.run('tagteams.record', tagteams.update_tagteam_record, team_name, rng.choice(results))
+        new_team = dict(league['tagteams'][0] if league['tagteams'] else {}, Name=f'Bench Team {i}')
+        recorder.run('tagteams.add', tagteams.add_tagteam, new_team)
+        recorder.run('tagteams.update', tagteams.update_tagteam, new_team['Name'], dict(new_team, Location='Updated'))
+        recorder.run('tagteams.delete', tagteams.delete_tagteam, new_team['Name'])
+
+        # Events
+        recorder.run('events.load', events.load_events)
+        if event_names:
+            event_name = rng.choice(event_names)
+            recorder.run('events.get', events.get_event_by_name, event_name)
+            recorder.run('events.get_by_slug', events.get_event_by_slug, event_name.lower().replace(' ', '-'))
+        new_event = {'Event_Name': f'Bench Event {i}', 'Subtitle': '', 'Status': 'Future', 'Date': '2100-01-01',
+                     'Venue': '', 'Location': '', 'Broadcasters': '', 'Finalized': False}
+        recorder.run('events.add', events.add_event, new_event)
+        recorder.run('events.update', events.update_event, new_event['Event_Name'], dict(new_event, Venue='Updated'))
+        recorder.run('events.delete', events.delete_event, new_event['Event_Name'])
+
+        # News
+        recorder.run('news.load', news.load_news_posts)
+        if news_ids:
+            news_id = rng.choice(news_ids)
+            recorder.run('news.get', news.get_news_post_by_id, news_id)
+            recorder.run('news.update', news.update_news_post, news_id, {'Content': f'Updated {i}.'})
+        added_id = recorder.run('news.add', news.add_news_post, {'Subject': f'Bench News {i}', 'Content': '', 'Date': '2100-01-01'},
+                                volatile=True)
+        recorder.run('news.delete', news.delete_news_post, added_id)
+
+        # Belts and championship history
+        recorder.run('belts.load', belts.load_belts)
+        recorder.run('belts.get', belts.get_belt_by_id, 'world-bench')
+        recorder.run('belts.get_by_name', belts.get_belt_by_name, 'world championship')
+        new_belt = {'ID': f'bench-belt-{i}', 'Name': f'Bench Belt {i}', 'Status': 'Vacant', 'Holder_Type': 'Singles',
+                    'Current_Holder': '', 'Champion_Title': 'Champion', 'Display_Position': 10 + i}
+        recorder.run('belts.add', belts.add_belt, new_belt)
+        recorder.run('belts.update', belts.update_belt, new_belt['ID'], dict(new_belt, Status='Active'))
+        recorder.run('belts.delete', belts.delete_belt, new_belt['ID'])
+        reign = {'Belt_ID': 'tag-bench', 'Champion_Name': 'Nobody', 'Date_Won': '1999-01-01', 'Date_Lost': '1999-02-01', 'Defenses': 0, 'Notes': ''}
+        recorder.run('belts.add_reign', belts.add_reign_to_history, reign)
+        recorder.run('belts.update_reign', belts.update_reign_in_history, reign['Reign_ID'], dict(reign, Defenses=1))
+        recorder.run('belts.get_reign', belts.get_reign_by_id, reign['Reign_ID'])
+        recorder.run('belts.delete_reign', belts.delete_reign_from_history, reign['Reign_ID'])
+        if wrestler_names:
+            world = belts.get_belt_by_id('world-bench')
+            event_date = (datetime.date(2000, 1, 1) + datetime.timedelta(days=i)).isoformat()
+            recorder.run('belts.championship_change', belts.process_championship_change, world, rng.choice(wrestler_names), event_date)
+        recorder.run('belts.load_history', belts.load_history_for_belt, 'world-bench')
+
+    # The final contents of every entity must match between backends as well
+    recorder.run('final.divisions', divisions.load_divisions)
+    recorder.run('final.wrestlers', wrestlers.load_wrestlers)
+    recorder.run('final.tagteams', tagteams.load_tagteams)
+    recorder.run('final.events', events.load_events)
+    recorder.run('final.belts', belts.load_belts)
+    recorder.run('final.belt_history', belts.load_belt_history)
+    recorder.run('final.news', news.load_news_posts)
+    return recorder.summary()
+
+# --- Orchestration ---
+
+def _run_backend(backend_dir, num_wrestlers, num_events, operations, seed):
+    """Runs the workload for one backend and size in a scratch project root."""
+    scratch = tempfile.mkdtemp(prefix='slamsim-bench-')
+    try:
+        scratch_src = os.path.join(scratch, 'src')
+        shutil.copytree(backend_dir, scratch_src, ignore=shutil.ignore_patterns('__pycache__'))
+        if not os.path.exists(os.path.join(scratch_src, 'benchmark.py')):
+            shutil.copy(os.path.abspath(__file__), os.path.join(scratch_src, 'benchmark.py'))
+        os.makedirs(os.path.join(scratch, 'data', 'events'))
+        config = json.dumps({'wrestlers': num_wrestlers, 'events': num_events, 'operations': operations, 'seed': seed})
+        completed = subprocess.run(
+            [sys.executable, '-m', 'src.benchmark', '--worker', config],
+            cwd=scratch, capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'Worker failed.'}
+        return json.loads(completed.stdout.strip().splitlines()[-1]) # The report is the worker's last line
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def run_suite(backends, sizes=None, operations=DEFAULT_OPERATIONS, seed=DEFAULT_SEED):
+    """
+    Runs every backend at every (wrestlers, events) size and returns the report.
+    backends is an ordered {name: path to a src package}; the first one is the
+    reference every other backend is compared against.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    reference = next(iter(backends))
+    runs = []
+    mismatches = []
+    for num_wrestlers, num_events in sizes:
+        reference_digests = None
+        for name, backend_dir in backends.items():
+            result = _run_backend(backend_dir, num_wrestlers, num_events, operations, seed)
+            runs.append(dict(result, backend=name, wrestlers=num_wrestlers, events=num_events))
+            if 'error' in result:
+                mismatches.append({'backend': name, 'wrestlers': num_wrestlers, 'events': num_events,
+                                   'operation': None, 'error': result['error']})
+                continue
+            if name == reference:
+                reference_digests = result['digests']
+                continue
+            if reference_digests is None:
+                continue # The reference failed; its error is already reported
+            for operation in sorted(set(reference_digests) | set(result['digests'])):
+                if reference_digests.get(operation) != result['digests'].get(operation):
+                    mismatches.append({'backend': name, 'wrestlers': num_wrestlers, 'events': num_events,
+                                       'operation': operation})
+    return {
+        'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'operations_per_size': operations,
+        'seed': seed,
+        'backends': {name: os.path.abspath(path) for name, path in backends.items()},
+        'runs': runs,
+        'conformance': {'reference': reference, 'passed': not mismatches, 'mismatches': mismatches},
+    }
+
+def _parse_sizes(value):
+    """Parses '1000x100,10000x1000' into [(1000, 100), (10000, 1000)]."""
+    sizes = []
+    for part in value.split(','):
+        wrestlers, _, events = part.strip().lower().partition('x')
+        sizes.append((int(wrestlers), int(events or 0)))
+    return sizes
+
+def _parse_backends(values):
+    """Parses ['name=path', ...] into an ordered {name: path}; defaults to this package as 'json'."""
+    backends = {}
+    for value in values or []:
+        name, _, path = value.partition('=')
+        backends[name] = path or name
+    if not backends:
+        backends['json'] = os.path.dirname(os.path.abspath(__file__))
+    return backends
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Storage conformance and benchmark suite.')
+    parser.add_argument('--backend', action='append', help="name=path/to/src (repeatable; the first is the reference)")
+    parser.add_argument('--sizes', default='1000x100', help="Comma-separated WRESTLERSxEVENTS league sizes, e.g. 1000x100,10000x1000,50000x1000")
+    parser.add_argument('--operations', type=int, default=DEFAULT_OPERATIONS, help='Calls per operation and size')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        config = json.loads(args.worker)
+        print(json.dumps(_run_workload(config['wrestlers'], config['events'], config['operations'], config['seed'])))
+        return 0
+
+    report = run_suite(_parse_backends(args.backend), _parse_sizes(args.sizes), args.operations, args.seed)
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(encoded)
+    else:
+        print(encoded)
+    return 0 if report['conformance']['passed'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
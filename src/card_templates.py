@@ -0,0 +1,177 @@
+import json
+import os
+import uuid
+from datetime import date, timedelta
+from src.generations import bump_generation
+from src.events import load_events, save_events, get_event_by_name
+from src.wrestlers import load_wrestlers
+from src.segments import (
+    _slugify, _prepare_segment_match, _clear_segment_match_fields, _get_summary_file_path, save_event_card
+)
+from src.finalize import load_event_card
+
+CARD_TEMPLATES_FILE_RELATIVE_TO_ROOT = 'data/card_templates.json'
+
+# Event fields a template carries over to the events stamped from it
+TEMPLATE_EVENT_FIELDS = ('Subtitle', 'Venue', 'Location', 'Broadcasters')
+
+# A card template keeps the structure of an event's card:
+# {'Name': ..., 'Source_Event': ..., 'Event_Defaults': {field: value},
+#  'Segments': [{'type': ..., 'header': ..., 'sides': [[...]], 'match_championship': ...}]}
+# Results and summaries are never part of a template.
+
+def _get_card_templates_file_path():
+    """Constructs the absolute path to the card templates JSON file."""
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+    return os.path.join(project_root, CARD_TEMPLATES_FILE_RELATIVE_TO_ROOT)
+
+def load_card_templates():
+    """Loads all card templates from the JSON file."""
+    file_path = _get_card_templates_file_path()
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+        return json.loads(content) if content else []
+
+def save_card_templates(templates_list):
+    """Saves the list of card templates to the JSON file."""
+    file_path = _get_card_templates_file_path()
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(templates_list, f, indent=4)
+    bump_generation(file_path)
+
+def get_card_template(name):
+    """Retrieves a single card template by its name."""
+    return next((t for t in load_card_templates() if t.get('Name') == name), None)
+
+def create_card_template_from_event(event_name, template_name):
+    """Saves an event's card structure as a template. Returns (success, message)."""
+    event = get_event_by_name(event_name)
+    if not event:
+        return False, f"Event '{event_name}' not found."
+    if not template_name:
+        return False, "Template name is required."
+    templates = load_card_templates()
+    if any(t.get('Name') == template_name for t in templates):
+        return False, f"A card template named '{template_name}' already exists."
+
+    segments, matches_by_id = load_event_card(event_name)
+    template_segments = []
+    for segment in segments:
+        entry = {'type': segment.get('type', ''), 'header': segment.get('header', '')}
+        match = matches_by_id.get(segment.get('match_id')) if segment.get('match_id') else None
+        if segment.get('type') == 'Match':
+            entry['sides'] = match.get('sides', []) if match else []
+            entry['match_championship'] = match.get('match_championship', '') if match else ''
+        template_segments.append(entry)
+
+    templates.append({
+        'Name': template_name,
+        'Source_Event': event_name,
+        'Event_Defaults': {field: event.get(field, '') for field in TEMPLATE_EVENT_FIELDS},
+        'Segments': template_segments,
+    })
+    save_card_templates(templates)
+    return True, f"Card template '{template_name}' saved with {len(template_segments)} segment(s)."
+
+def delete_card_template(name):
+    """Deletes a card template. Returns (success, message)."""
+    templates = load_card_templates()
+    remaining = [t for t in templates if t.get('Name') != name]
+    if len(remaining) == len(templates):
+        return False, f"Card template '{name}' not found."
+    save_card_templates(remaining)
+    return True, f"Card template '{name}' deleted."
+
+def build_schedule(name_pattern, first_date, count, interval_days=7):
+    """
+    Returns [(event name, ISO date)] for count events starting at first_date,
+    interval_days apart. name_pattern may use {n} (1-based number) and {date}.
+    """
+    start = date.fromisoformat(first_date)
+    schedule = []
+    for n in range(1, count + 1):
+        event_date = (start + timedelta(days=interval_days * (n - 1))).isoformat()
+        schedule.append((name_pattern.format(n=n, date=event_date), event_date))
+    return schedule
+
+def _build_card(template, event_slug, include_participants, include_headers, include_championships,
+                all_wrestlers_data):
+    """Builds an event's (segments, matches) from a template in memory."""
+    segments, matches = [], []
+    for position, entry in enumerate(template.get('Segments', []), start=1):
+        segment = {'position': position, 'type': entry.get('type', ''),
+                   'header': entry.get('header', '') if include_headers else ''}
+        sides = entry.get('sides') if include_participants else None
+        if segment['type'] == 'Match' and sides:
+            match_data = {
+                'sides': sides, 'match_time': '', 'winning_side_index': -1,
+                'match_championship': entry.get('match_championship', '') if include_championships else '',
+                'individual_results': {}, 'team_results': {}, 'sync_teams_to_individuals': True,
+                'match_result': '', 'winner_method': '', 'match_result_display': '',
+                'match_visibility': {'hide_from_card': False, 'hide_summary': False, 'hide_result': False},
+            }
+            # Display strings come from the memo, so identical matches on every stamped card are generated once
+            matches.append(_prepare_segment_match(segment, match_data, all_wrestlers_data, str(uuid.uuid4())))
+        else:
+            _clear_segment_match_fields(segment)
+            if segment['type'] == 'Match' and not segment['header']:
+                segment['header'] = 'Match'
+        segment['summary_file'] = _get_summary_file_path(event_slug, segment['type'], segment['header'], position)
+        segments.append(segment)
+    return segments, matches
+
+def create_events_from_template(template_name, schedule, status='Future',
+                                include_participants=True, include_headers=True, include_championships=True):
+    """
+    Creates one event per (name, date) in schedule with the template's card.
+    All names are checked before anything is written; events.json is written
+    once and each new event's segments, matches and warnings files once.
+    Returns (success, message).
+    """
+    # Import here to avoid circular dependency
+    from src.slugs import find_slug_collision
+    template = get_card_template(template_name)
+    if not template:
+        return False, f"Card template '{template_name}' not found."
+    if not schedule:
+        return False, "No events to create."
+
+    events = load_events()
+    existing_names = {e.get('Event_Name') for e in events}
+    new_slugs = {}
+    for name, _event_date in schedule:
+        if not name:
+            return False, "Every event needs a name."
+        if name in existing_names:
+            return False, f"Event '{name}' already exists."
+        collision = find_slug_collision('events', name)
+        if collision:
+            return False, f"Event '{name}' would share its URL slug with '{collision}'."
+        slug = _slugify(name)
+        if slug in new_slugs:
+            return False, f"Events '{new_slugs[slug]}' and '{name}' would share a URL slug."
+        new_slugs[slug] = name
+
+    # Validate and build every card before writing any of them
+    all_wrestlers_data = load_wrestlers()
+    cards = []
+    try:
+        for name, _event_date in schedule:
+            slug = _slugify(name)
+            cards.append((slug, _build_card(template, slug, include_participants, include_headers,
+                                            include_championships, all_wrestlers_data)))
+    except ValueError as e:
+        return False, f"Template card is invalid: {e}"
+
+    for slug, (segments, matches) in cards:
+        save_event_card(slug, segments, matches)
+    defaults = template.get('Event_Defaults', {})
+    for name, event_date in schedule:
+        event = {'Event_Name': name, 'Subtitle': '', 'Status': status, 'Date': event_date,
+                 'Venue': '', 'Location': '', 'Broadcasters': '', 'Finalized': False}
+        event.update({field: defaults.get(field, '') for field in TEMPLATE_EVENT_FIELDS})
+        events.append(event)
+    save_events(events)
+    return True, f"Created {len(schedule)} event(s) from card template '{template_name}'."
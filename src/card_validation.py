@@ -0,0 +1,96 @@
+from src.wrestlers import load_wrestlers, _get_wrestlers_file_path
+from src.tagteams import get_team_index, _get_tagteams_file_path
+from src.segments import (
+    load_segments, load_event_warnings, get_event_matches_by_id, validate_match_data, _roster_fingerprint,
+    _get_all_wrestlers_involved, _get_segments_file_path, _get_matches_file_path, _get_warnings_file_path
+)
+from src.generations import get_cached
+
+# The card validator checks every match of an event together against one roster
+# context (wrestlers by name and the tag team index), built once per version of
+# wrestlers.json and tagteams.json and shared by every event and request.
+#
+# Per-match checks (structure, result completeness, team results) come from the
+# event's warnings aggregate, which stores each match's warnings from when it was
+# saved. A match whose aggregate entry is missing or was validated against tag
+# team memberships that have since changed is revalidated from the matches file.
+# Card-level checks then run over the whole card: wrestlers booked in more than
+# one match, wrestlers who are not active, and names that are not on the roster.
+#
+# The report is cached until the event's card or the roster changes:
+# {'issues': [{'position', 'severity', 'kind', 'message'}], 'matches': count,
+#  'revalidated': count, 'errors': count, 'warnings': count}
+
+def get_roster_context():
+    """Wrestlers by name and the tag team index, loaded once per version of the roster files."""
+    def build():
+        wrestlers_by_name = {}
+        for wrestler in load_wrestlers():
+            wrestlers_by_name.setdefault(wrestler.get('Name'), wrestler)
+        return {'wrestlers_by_name': wrestlers_by_name, 'team_index': get_team_index()}
+    return get_cached('card-roster-context', [_get_wrestlers_file_path(), _get_tagteams_file_path()], build)
+
+def _issue(position, severity, kind, message):
+    return {'position': position, 'severity': severity, 'kind': kind, 'message': message}
+
+def _match_issues(segment, entry, context, matches_by_id):
+    """
+    Returns (wrestlers, issues, revalidated) for one match segment, reusing its
+    aggregate entry when it is still current.
+    """
+    position = segment.get('position')
+    if entry and _roster_fingerprint(entry.get('wrestlers', []), context['team_index']) == entry.get('roster_fingerprint'):
+        return entry.get('wrestlers', []), [_issue(position, 'warning', 'match', w) for w in entry['warnings']], False
+
+    match = matches_by_id().get(segment['match_id'])
+    if not match:
+        return [], [_issue(position, 'error', 'match', 'Match record is missing from the matches file.')], True
+    sides = match.get('sides', [])
+    errors, warnings = validate_match_data(sides, match)
+    issues = [_issue(position, 'error', 'match', e) for e in errors] + [_issue(position, 'warning', 'match', w) for w in warnings]
+    return sorted(_get_all_wrestlers_involved(sides)), issues, True
+
+def _build_card_report(event_slug):
+    context = get_roster_context()
+    wrestlers_by_name = context['wrestlers_by_name']
+    aggregate = load_event_warnings(event_slug)['matches']
+    loaded = {}
+    def matches_by_id():
+        # The matches file is only read if some match has to be revalidated
+        if 'matches' not in loaded:
+            loaded['matches'] = get_event_matches_by_id(event_slug)
+        return loaded['matches']
+
+    issues = []
+    match_count = revalidated = 0
+    booked_at = {} # wrestler -> position of the first match they appear in
+    match_segments = [s for s in load_segments(event_slug) if s.get('type') == 'Match' and s.get('match_id')]
+    for segment in sorted(match_segments, key=lambda s: s.get('position', 0)):
+        position = segment.get('position')
+        wrestlers, match_issues, was_revalidated = _match_issues(
+            segment, aggregate.get(segment['match_id']), context, matches_by_id)
+        issues.extend(match_issues)
+        match_count += 1
+        revalidated += was_revalidated
+
+        for name in wrestlers:
+            wrestler = wrestlers_by_name.get(name)
+            if wrestler is None:
+                issues.append(_issue(position, 'warning', 'roster', f"'{name}' is not a wrestler on the roster."))
+            elif wrestler.get('Status') != 'Active':
+                issues.append(_issue(position, 'warning', 'availability', f"Wrestler '{name}' is {wrestler.get('Status') or 'not active'}."))
+            if name in booked_at:
+                issues.append(_issue(position, 'warning', 'double_booked', f"Wrestler '{name}' is also booked in segment {booked_at[name]}."))
+            else:
+                booked_at[name] = position
+
+    issues.sort(key=lambda issue: issue['position'] or 0)
+    error_count = sum(1 for issue in issues if issue['severity'] == 'error')
+    return {'issues': issues, 'matches': match_count, 'revalidated': revalidated,
+            'errors': error_count, 'warnings': len(issues) - error_count}
+
+def validate_event_card(event_slug):
+    """Validates every match on an event's card together. Returns the card report described above."""
+    paths = [_get_segments_file_path(event_slug), _get_matches_file_path(event_slug), _get_warnings_file_path(event_slug),
+             _get_wrestlers_file_path(), _get_tagteams_file_path()]
+    return get_cached(('card-validation', event_slug), paths, lambda: _build_card_report(event_slug))
@@ -0,0 +1,189 @@
+import threading
+import time
+from src.wrestlers import load_wrestlers, _get_wrestlers_file_path
+from src.tagteams import load_tagteams, _get_tagteams_file_path
+from src.belts import load_belts, load_belt_history, _get_belts_file_path, _get_belt_history_file_path
+from src.events import load_events, _get_events_file_path
+from src.segments import _slugify, _get_segments_file_path, _get_matches_file_path
+from src.generations import get_generation, get_cached
+from src.slugs import get_slug_collisions
+from src.records import WRESTLER_SINGLES_FIELDS, WRESTLER_TAG_FIELDS, TAGTEAM_RECORD_FIELDS, _record_value
+
+# The checker validates cross-file invariants between wrestlers, tag teams,
+# belts, belt history and the finalized match history. Everything is looked up
+# through dictionaries built in one pass per file, never by nested scans.
+# Records that share a slug (and so a page and data files) are reported too.
+#
+# Each checked unit (a belt, a wrestler, a team, a record) is reduced to a tuple
+# of the inputs its check depends on. Results are remembered per unit, and a unit
+# is only re-checked when its inputs differ from the last run. When no data file
+# generation changed at all, the previous report is returned as is. The record
+# replay is cached on the generations of the files it reads.
+
+_lock = threading.Lock()
+_last_generations = None
+_last_results = {} # unit key -> (inputs, issues)
+
+def _first_by_name(items):
+    """Indexes items by Name, keeping the first occurrence like every other lookup."""
+    index = {}
+    for item in items:
+        index.setdefault(item.get('Name'), item)
+    return index
+
+def _finalized_card_paths(events):
+    """Paths of the segments and matches files the record replay reads."""
+    paths = []
+    for event in events:
+        if event.get('Finalized'):
+            slug = _slugify(event['Event_Name'])
+            paths.extend([_get_segments_file_path(slug), _get_matches_file_path(slug)])
+    return paths
+
+def _issue(kind, entity, name, message):
+    return {'kind': kind, 'entity': entity, 'name': name, 'message': message}
+
+# --- Checks. Each takes the inputs tuple of one unit and returns its issues. ---
+
+def _check_belt(inputs):
+    belt_id, belt_name, holder_type, holder, holder_exists, holder_belt, open_reigns = inputs
+    issues = []
+    if holder and not holder_exists:
+        issues.append(_issue('belt', 'belt', belt_name, f"Current holder '{holder}' is not a known {holder_type} holder."))
+    elif holder and holder_belt != belt_name:
+        issues.append(_issue('belt', 'belt', belt_name, f"Holder '{holder}' has Belt '{holder_belt or ''}' instead of '{belt_name}'."))
+    if len(open_reigns) > 1:
+        issues.append(_issue('history', 'belt', belt_name, f"{len(open_reigns)} open reigns in the title history: {', '.join(open_reigns)}."))
+    if holder and holder not in open_reigns:
+        issues.append(_issue('history', 'belt', belt_name, f"No open reign in the title history for current holder '{holder}'."))
+    if not holder and open_reigns:
+        issues.append(_issue('history', 'belt', belt_name, f"Belt is vacant but {', '.join(open_reigns)} still has an open reign."))
+    return issues
+
+def _check_holder(inputs):
+    entity, name, belt_field, belt_exists, belt_holder_type, expected_type, belt_holder = inputs
+    if not belt_field:
+        return []
+    if not belt_exists:
+        return [_issue('belt', entity, name, f"Belt field names '{belt_field}', which is not a known belt.")]
+    if belt_holder_type != expected_type:
+        return [_issue('belt', entity, name, f"Holds '{belt_field}', which is a {belt_holder_type} belt.")]
+    if belt_holder != name:
+        return [_issue('belt', entity, name, f"Belt field says '{belt_field}' but its current holder is '{belt_holder or 'vacant'}'.")]
+    return []
+
+def _check_members(inputs):
+    name, missing_members = inputs
+    return [_issue('members', 'tagteam', name, f"Member '{member}' is not a known wrestler.") for member in missing_members]
+
+def _check_record(inputs):
+    entity, name, label, stored, rebuilt = inputs
+    if stored == rebuilt:
+        return []
+    return [_issue('record', entity, name, f"{label} record is {'-'.join(map(str, stored))} (W-L-D) "
+                                         f"but finalized matches add up to {'-'.join(map(str, rebuilt))}.")]
+
+def _check_slug(inputs):
+    entity, slug, names = inputs
+    return [_issue('slug', entity, name, f"Shares the slug '{slug}' with '{names[0]}', so it cannot have its own page "
+                                         "or data files. Rename one of them.") for name in names[1:]]
+
+# --- Units ---
+
+def _rebuilt_records(wrestlers, tagteams, events):
+    """Record matrices replayed from the finalized matches, cached on the files they come from."""
+    from src.rebuild import rebuild_record_matrices # Import here to avoid circular dependency
+    paths = [_get_events_file_path(), _get_wrestlers_file_path(), _get_tagteams_file_path()] + _finalized_card_paths(events)
+    finalized = [event for event in events if event.get('Finalized')]
+    return get_cached('consistency-rebuilt-records', paths,
+                      lambda: rebuild_record_matrices(wrestlers, tagteams, finalized))
+
+def _build_units(wrestlers, tagteams, belts, history, events):
+    """Returns {unit key: (check function, inputs)} for every invariant."""
+    wrestlers_by_name = _first_by_name(wrestlers)
+    teams_by_name = _first_by_name(tagteams)
+    belts_by_name = _first_by_name(belts)
+    holders_by_type = {'Singles': wrestlers_by_name, 'Tag-Team': teams_by_name}
+    open_reigns = {}
+    for reign in history:
+        if not reign.get('Date_Lost'):
+            open_reigns.setdefault(reign.get('Belt_ID'), []).append(reign.get('Champion_Name'))
+
+    units = {}
+    for belt in belts:
+        holder = belt.get('Current_Holder') or None
+        holder_data = holders_by_type.get(belt.get('Holder_Type'), {}).get(holder)
+        units[('belt', belt.get('ID'))] = (_check_belt, (
+            belt.get('ID'), belt.get('Name'), belt.get('Holder_Type'), holder, holder_data is not None,
+            holder_data.get('Belt') if holder_data else None, tuple(open_reigns.get(belt.get('ID'), ()))))
+
+    for entity, items, expected_type in (('wrestler', wrestlers_by_name, 'Singles'), ('tagteam', teams_by_name, 'Tag-Team')):
+        for name, item in items.items():
+            belt = belts_by_name.get(item.get('Belt')) if item.get('Belt') else None
+            units[('holder', entity, name)] = (_check_holder, (
+                entity, name, item.get('Belt') or '', belt is not None,
+                belt.get('Holder_Type') if belt else None, expected_type, belt.get('Current_Holder') if belt else None))
+
+    for name, team in teams_by_name.items():
+        missing = tuple(m for m in team.get('Members') or [] if m not in wrestlers_by_name)
+        units[('members', name)] = (_check_members, (name, missing))
+
+    for kind, entity in (('events', 'event'), ('wrestlers', 'wrestler'), ('tagteams', 'tagteam')):
+        for slug, names in get_slug_collisions(kind).items():
+            units[('slug', entity, slug)] = (_check_slug, (entity, slug, tuple(names)))
+
+    singles, tag, team_records, _match_count = _rebuilt_records(wrestlers, tagteams, events)
+    for i, wrestler in enumerate(wrestlers):
+        if wrestlers_by_name.get(wrestler.get('Name')) is not wrestler:
+            continue # Duplicate names are only ever credited on their first entry
+        for label, fields, matrix in (('Singles', WRESTLER_SINGLES_FIELDS, singles), ('Tag', WRESTLER_TAG_FIELDS, tag)):
+            stored = tuple(_record_value(wrestler.get(f, 0)) for f in fields)
+            units[('record', 'wrestler', label, wrestler.get('Name'))] = (_check_record, (
+                'wrestler', wrestler.get('Name'), label, stored, tuple(matrix[i].tolist())))
+    for i, team in enumerate(tagteams):
+        if teams_by_name.get(team.get('Name')) is not team:
+            continue
+        stored = tuple(_record_value(team.get(f, 0)) for f in TAGTEAM_RECORD_FIELDS)
+        units[('record', 'tagteam', team.get('Name'))] = (_check_record, (
+            'tagteam', team.get('Name'), 'Team', stored, tuple(team_records[i].tolist())))
+    return units
+
+def check_consistency(full=False):
+    """
+    Validates belt holders, open reigns, team members and records. Only units
+    whose inputs changed since the last run are re-checked unless full is set.
+    Returns a report:
+    {'issues': [...], 'units': count, 'checked': count, 'reused': count, 'elapsed_ms': float}
+    """
+    global _last_generations, _last_results
+    started = time.perf_counter()
+    events = load_events()
+    paths = [_get_wrestlers_file_path(), _get_tagteams_file_path(), _get_belts_file_path(),
+             _get_belt_history_file_path(), _get_events_file_path()] + _finalized_card_paths(events)
+    generations = tuple(get_generation(path) for path in paths)
+
+    with _lock:
+        if full:
+            _last_generations, _last_results = None, {}
+        if generations == _last_generations:
+            issues = [issue for _inputs, unit_issues in _last_results.values() for issue in unit_issues]
+            return {'issues': issues, 'units': len(_last_results), 'checked': 0, 'reused': len(_last_results),
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)}
+        previous = _last_results
+
+    units = _build_units(load_wrestlers(), load_tagteams(), load_belts(), load_belt_history(), events)
+    results = {}
+    checked = 0
+    for key, (check, inputs) in units.items():
+        cached = previous.get(key)
+        if cached is not None and cached[0] == inputs:
+            results[key] = cached
+        else:
+            results[key] = (inputs, check(inputs))
+            checked += 1
+
+    with _lock:
+        _last_generations, _last_results = generations, results
+    issues = [issue for _inputs, unit_issues in results.values() for issue in unit_issues]
+    return {'issues': issues, 'units': len(results), 'checked': checked, 'reused': len(results) - checked,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)}
@@ -1,4 +1,5 @@
 import datetime
+import functools
 from src.prefs import load_preferences
 
 def get_current_working_date():
@@ -26,3 +27,27 @@ def get_current_working_date():
     else:
         # Default fallback
         return datetime.date.today()
+
+@functools.lru_cache(maxsize=8192)
+def parse_date(date_str):
+    """
+    Parses a YYYY-MM-DD string into a datetime.date, or returns None if it is
+    missing or malformed. Results are cached, so repeated sorts and lookups over
+    the same data never re-parse a date.
+    """
+    if not date_str or not isinstance(date_str, str):
+        return None
+    try:
+        return datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+def date_ordinal(date_str, default=0):
+    """Returns the proleptic ordinal of a YYYY-MM-DD string for use as a sort key."""
+    parsed = parse_date(date_str)
+    return parsed.toordinal() if parsed else default
+
+def date_year(date_str):
+    """Returns the year of a YYYY-MM-DD string, or None if it is missing or malformed."""
+    parsed = parse_date(date_str)
+    return parsed.year if parsed else None
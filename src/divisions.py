@@ -1,5 +1,6 @@
 import json
 import os
+from src.generations import bump_generation, get_cached
 from src.wrestlers import load_wrestlers
 from src.tagteams import load_tagteams
 
@@ -25,12 +26,26 @@ def save_divisions(divisions_list):
     try:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(divisions_list, f, indent=4)
+        bump_generation(file_path)
         return True
     except IOError: return False
 
+def get_division_map():
+    """
+    Returns {division ID: division} for the current divisions file. The map is
+    built once per file generation; callers must not modify the returned dicts.
+    """
+    def build():
+        division_map = {}
+        for division in load_divisions():
+            division_map.setdefault(division.get('ID'), division) # First match wins, as in a linear search
+        return division_map
+    return get_cached('division_map', [_get_divisions_file_path()], build)
+
 def get_division_by_id(division_id):
     """Retrieves a single division by its ID."""
-    return next((d for d in load_divisions() if d.get('ID') == division_id), None)
+    division = get_division_map().get(division_id)
+    return dict(division) if division else None
 
 def add_division(division_data):
     """Adds a new division to the list."""
@@ -59,27 +74,44 @@ def delete_division(division_id):
 
 def get_division_name_by_id(division_id):
     """Returns the name of a division given its ID."""
-    division = get_division_by_id(division_id)
+    division = get_division_map().get(division_id)
     return division.get('Name') if division else 'Unknown Division'
 
+def resolve_division_names(items, field='Division', target='DivisionName'):
+    """Sets items' target field to the name of the division in their field, using one map lookup each."""
+    division_map = get_division_map()
+    for item in items:
+        division = division_map.get(item.get(field, ''))
+        item[target] = division.get('Name') if division else 'Unknown Division'
+    return items
+
 def get_all_division_ids_and_names():
     """Returns a list of dictionaries with 'ID' and 'Name' for all active divisions."""
-    return [{'ID': d['ID'], 'Name': d['Name']} for d in load_divisions() if d.get('Status') == 'Active']
+    return [{'ID': d['ID'], 'Name': d['Name']} for d in get_division_map().values() if d.get('Status') == 'Active']
 
-def is_division_in_use(division_data):
+def is_division_in_use(division_data, ids_in_use=None):
     """
     Checks if any wrestler or tag team is currently assigned to this division,
-    based on its Holder_Type.
+    based on its Holder_Type. ids_in_use is get_division_ids_in_use()'s result,
+    passed when checking many divisions so the roster is read once.
     """
+    singles_in_use, tagteams_in_use = ids_in_use or get_division_ids_in_use()
     division_id = division_data.get('ID')
     holder_type = division_data.get('Holder_Type')
 
     if holder_type == 'Singles':
-        all_wrestlers = load_wrestlers()
-        return any(w.get('Division') == division_id for w in all_wrestlers)
+        return division_id in singles_in_use
     elif holder_type == 'Tag-Team':
-        all_tagteams = load_tagteams()
-        return any(t.get('Division') == division_id for t in all_tagteams)
+        return division_id in tagteams_in_use
     
     return False # Should not happen if Holder_Type is always set
 
+def get_division_ids_in_use():
+    """
+    Returns (singles IDs, tag-team IDs): the division IDs assigned to at least one
+    wrestler or tag team, so a list of divisions can be checked in one pass.
+    """
+    singles_in_use = {w.get('Division') for w in load_wrestlers()}
+    tagteams_in_use = {t.get('Division') for t in load_tagteams()}
+    return singles_in_use, tagteams_in_use
+
@@ -0,0 +1,124 @@
+import bisect
+import calendar
+from datetime import date
+from src.generations import get_cached
+from src.date_utils import date_ordinal
+from src.events import load_events, _get_events_file_path
+from src.query import Page
+
+# The event calendar keeps events.json sorted by date, once per data generation,
+# for every subset the app lists: all events, the events of each Status and the
+# finalized events. Each subset is a "series":
+#   {'ordinals': [date ordinal, ascending], 'asc': [row], 'desc': [row],
+#    'years': {year: (lo, hi)}, 'months': {(year, month): (lo, hi)}}
+# 'asc' and 'desc' list row numbers oldest and newest first; events on the same
+# date keep their events.json order in both, like a stable sort. The year and
+# month partitions are (lo, hi) bounds into 'asc'; the same events sit at
+# (m - hi, m - lo) in 'desc', m being the number of dated events. Events without
+# a valid date come last in both directions, in events.json order, like the
+# query layer sorts them; they have no ordinal and belong to no year. Date ranges
+# are found by bisecting 'ordinals', so no query scans the whole calendar.
+
+def _build_series(rows, events):
+    all_keyed = [(date_ordinal(events[i].get('Date')), i) for i in rows]
+    keyed = sorted(k for k in all_keyed if k[0])
+    undated = [i for ordinal, i in all_keyed if not ordinal]
+    ordinals = [ordinal for ordinal, _ in keyed]
+    series = {
+        'ordinals': ordinals,
+        'asc': [i for _, i in keyed] + undated,
+        'desc': [i for _, i in sorted(keyed, key=lambda k: (-k[0], k[1]))] + undated,
+        'years': {}, 'months': {},
+    }
+    for position, ordinal in enumerate(ordinals):
+        day = date.fromordinal(ordinal)
+        for partitions, key in ((series['years'], day.year), (series['months'], (day.year, day.month))):
+            lo, _hi = partitions.get(key, (position, position))
+            partitions[key] = (lo, position + 1)
+    return series
+
+def _build_calendar():
+    events = load_events()
+    subsets = {'all': range(len(events)), 'finalized': [i for i, e in enumerate(events) if e.get('Finalized')]}
+    for i, event in enumerate(events):
+        subsets.setdefault(('status', event.get('Status')), []).append(i)
+    return {'events': events, 'series': {key: _build_series(rows, events) for key, rows in subsets.items()}}
+
+def get_event_calendar():
+    """Returns the event calendar index, rebuilt when events.json changes."""
+    return get_cached('event-calendar', [_get_events_file_path()], _build_calendar)
+
+def _series(index, status=None, finalized=False):
+    """The series of finalized events, of one Status, or of every event."""
+    if finalized:
+        return index['series']['finalized']
+    if status is not None:
+        return index['series'].get(('status', status))
+    return index['series']['all']
+
+def _window(index, series, lo, hi, reverse, start=0, stop=None):
+    """Copies of the events at positions lo..hi of a series, optionally newest first and sliced."""
+    if series is None:
+        return []
+    if reverse:
+        m = len(series['ordinals'])
+        rows = series['desc'][m - min(hi, m):m - min(lo, m)] + series['desc'][max(lo, m):max(hi, m)]
+    else:
+        rows = series['asc'][lo:hi]
+    return [dict(index['events'][i]) for i in rows[start:stop]]
+
+def get_upcoming_events(limit=None, status='Future', from_date=None):
+    """The first events of a Status (from a date on, if given), oldest first."""
+    index = get_event_calendar()
+    series = _series(index, status)
+    lo = bisect.bisect_left(series['ordinals'], date_ordinal(from_date)) if series and from_date else 0
+    return _window(index, series, lo, len(series['asc']) if series else 0, False, 0, limit)
+
+def get_recent_events(limit=None, status=None, finalized=True):
+    """The latest finalized events (or of a Status), newest first."""
+    index = get_event_calendar()
+    series = _series(index, status, finalized)
+    return _window(index, series, 0, len(series['asc']) if series else 0, True, 0, limit)
+
+def get_event_years(status=None, finalized=False):
+    """The years that have events in the series, newest first."""
+    series = _series(get_event_calendar(), status, finalized)
+    return sorted(series['years'], reverse=True) if series else []
+
+def get_events_page(number, size, status=None, finalized=False, year=None, month=None, reverse=True):
+    """
+    Returns a Page of events, newest first unless reverse is False, limited to a
+    year (and month) through the calendar partitions. Only the page is copied.
+    size=None returns every event on one page, like query().page().
+    """
+    index = get_event_calendar()
+    series = _series(index, status, finalized)
+    if series is None:
+        lo = hi = 0
+    elif year is None:
+        lo, hi = 0, len(series['asc'])
+    else:
+        partitions, key = (series['months'], (year, month)) if month else (series['years'], year)
+        lo, hi = partitions.get(key, (0, 0))
+    total = hi - lo
+    if size is None:
+        return Page(_window(index, series, lo, hi, reverse), 1, size, total)
+    if size <= 0:
+        return Page([], 1, size, total)
+    number = min(max(1, number), max(1, -(-total // size)))
+    items = _window(index, series, lo, hi, reverse, (number - 1) * size, number * size)
+    return Page(items, number, size, total)
+
+def get_month_calendar(year, month):
+    """
+    Returns the weeks of a month for a calendar grid: a list of weeks, each a
+    list of (date, [events that day]) from Monday to Sunday.
+    """
+    index = get_event_calendar()
+    series = index['series']['all']
+    lo, hi = series['months'].get((year, month), (0, 0))
+    events_by_day = {}
+    for position in range(lo, hi):
+        events_by_day.setdefault(series['ordinals'][position], []).append(dict(index['events'][series['asc'][position]]))
+    return [[(day, events_by_day.get(day.toordinal(), [])) for day in week]
+            for week in calendar.Calendar().monthdatescalendar(year, month)]
@@ -1,6 +1,7 @@
 import json
 import os
-from src.segments import _slugify, _get_segments_file_path, load_segments, delete_summary_file
+from src.generations import bump_generation
+from src.segments import _get_segments_file_path, load_segments, delete_summary_file
 
 EVENTS_FILE_RELATIVE_TO_ROOT = 'data/events.json'
 
@@ -39,6 +40,7 @@ def save_events(events_list):
     file_path = _get_events_file_path()
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(events_list, f, indent=4)
+    bump_generation(file_path)
 
 def get_event_by_name(event_name):
     """Retrieves a single event by its name."""
@@ -50,29 +52,32 @@ def get_event_by_name(event_name):
 
 def get_event_by_slug(event_slug):
     """Retrieves a single event by its slugified name."""
-    events = load_events()
-    for event in events:
-        if _slugify(event.get('Event_Name', '')) == event_slug:
-            return event
-    return None
+    from src.slugs import find_by_slug # Import here to avoid circular dependency
+    return find_by_slug('events', event_slug)
 
 def add_event(event_data):
     """Adds a new event to the list."""
+    from src.slugs import find_slug_collision # Import here to avoid circular dependency
     events = load_events()
     if get_event_by_name(event_data['Event_Name']):
         return False # Event with this name already exists
+    if find_slug_collision('events', event_data['Event_Name']):
+        return False # Another event's data files already use this name's slug
     events.append(event_data)
     save_events(events)
     return True
 
 def update_event(original_name, updated_data):
     """Updates an existing event."""
+    from src.slugs import find_slug_collision # Import here to avoid circular dependency
     events = load_events()
     for i, event in enumerate(events):
         if event.get('Event_Name') == original_name:
             # Check if name changed and new name already exists (and it's not the same event)
             if updated_data['Event_Name'] != original_name and get_event_by_name(updated_data['Event_Name']):
                 return False # New name conflicts with another existing event
+            if find_slug_collision('events', updated_data['Event_Name'], original_name):
+                return False # New name would share another event's slug
             events[i] = updated_data
             save_events(events)
             return True
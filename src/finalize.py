@@ -0,0 +1,570 @@
+import argparse
+import json
+import os
+import sys
+import uuid
+from src.wrestlers import load_wrestlers, save_wrestlers
+from src.tagteams import load_tagteams, save_tagteams, build_team_index
+from src.belts import load_belts, save_belts, load_belt_history, save_belt_history
+from src.events import load_events, save_events, get_event_by_name, update_event, save_event_summary
+from src.segments import (
+    load_segments, get_event_matches_by_id, get_segment_summary_fragment, _slugify, _get_project_root, EVENTS_DATA_DIR,
+    _get_all_wrestlers_involved, _get_all_tag_teams_involved
+)
+from src.card_validation import validate_event_card
+from src.prefs import load_preferences
+from src.date_utils import date_ordinal
+from src.records import RESULT_COLUMNS, WRESTLER_SINGLES_FIELDS, WRESTLER_TAG_FIELDS, TAGTEAM_RECORD_FIELDS
+
+# Finalizing an event used to call update_wrestler_record, update_tagteam_record,
+# process_championship_change and update_reign_in_history per participant, each
+# reloading and rewriting whole files. Here every dataset is loaded once into a
+# "state", all results are applied to it in memory with exactly the same rules,
+# and each changed file is written once at the end.
+
+WRESTLER_RECORD_FIELDS = {
+    'singles': WRESTLER_SINGLES_FIELDS,
+    'tag': WRESTLER_TAG_FIELDS,
+    'other': WRESTLER_TAG_FIELDS,
+    'battle_royal': WRESTLER_TAG_FIELDS,
+}
+
+def load_finalization_state():
+    """
+    Loads every dataset touched by finalization once, with the tag teams'
+    membership index. Finalization changes records and titles, never
+    memberships, so the index stays valid for every event applied to the state.
+    """
+    tagteams = load_tagteams()
+    return {
+        'wrestlers': load_wrestlers(),
+        'tagteams': tagteams,
+        'team_index': build_team_index(tagteams),
+        'belts': load_belts(),
+        'belt_history': load_belt_history(),
+        'dirty': set(),
+    }
+
+def save_finalization_state(state):
+    """Writes each dataset that changed, once."""
+    if 'belt_history' in state['dirty']:
+        save_belt_history(state['belt_history'])
+    if 'belts' in state['dirty']:
+        save_belts(state['belts'])
+    if 'wrestlers' in state['dirty']:
+        save_wrestlers(state['wrestlers'])
+    if 'tagteams' in state['dirty']:
+        save_tagteams(state['tagteams'])
+    state['dirty'] = set()
+
+def _first_by_name(items, name):
+    """Returns the first item with the given Name, like the per-call lookups did."""
+    return next((item for item in items if item.get('Name') == name), None)
+
+def _add_wrestler_result(state, changes, wrestler_name, match_class, result):
+    """In-memory equivalent of update_wrestler_record."""
+    wrestler = _first_by_name(state['wrestlers'], wrestler_name)
+    fields = WRESTLER_RECORD_FIELDS.get(match_class)
+    column = RESULT_COLUMNS.get(result)
+    if wrestler is None or fields is None or column is None:
+        return
+    field = fields[column]
+    wrestler[field] = str(int(wrestler.get(field, 0)) + 1)
+    state['dirty'].add('wrestlers')
+    changes.append({'type': 'record', 'entity': 'wrestler', 'name': wrestler_name, 'field': field, 'delta': 1})
+
+def _add_team_result(state, changes, team_name, result):
+    """In-memory equivalent of update_tagteam_record."""
+    team = _first_by_name(state['tagteams'], team_name)
+    column = RESULT_COLUMNS.get(result)
+    if team is None or column is None:
+        return
+    field = TAGTEAM_RECORD_FIELDS[column]
+    team[field] = str(int(team.get(field, 0)) + 1)
+    state['dirty'].add('tagteams')
+    changes.append({'type': 'record', 'entity': 'tagteam', 'name': team_name, 'field': field, 'delta': 1})
+
+def _find_belt_by_name(state, belt_name):
+    """In-memory equivalent of get_belt_by_name (case-insensitive, stripped)."""
+    normalized_belt_name = belt_name.strip().lower()
+    return next((belt for belt in state['belts'] if belt.get('Name', '').strip().lower() == normalized_belt_name), None)
+
+def _change_champion(state, changes, belt, winner_name, event_date):
+    """In-memory equivalent of process_championship_change."""
+    belt_id = belt['ID']
+    old_champion_name = belt.get('Current_Holder')
+    belt_type = belt.get('Holder_Type')
+
+    # 1. Close the old reign in history
+    closed_reign_id = None
+    closed_reign_date_lost = None
+    if old_champion_name:
+        for reign in state['belt_history']:
+            if reign.get('Belt_ID') == belt_id and not reign.get('Date_Lost'):
+                closed_reign_date_lost = reign.get('Date_Lost')
+                reign['Date_Lost'] = event_date
+                closed_reign_id = reign.get('Reign_ID')
+                break
+
+    # 2. Create the new reign in history
+    new_reign = {
+        "Reign_ID": str(uuid.uuid4()), "Belt_ID": belt_id, "Champion_Name": winner_name,
+        "Date_Won": event_date, "Date_Lost": None, "Defenses": 0,
+        "Notes": f"Won from {old_champion_name or 'vacant status'}"
+    }
+    state['belt_history'].append(new_reign)
+
+    # 3. Update the belt's current holder
+    for b in state['belts']:
+        if b['ID'] == belt_id:
+            b['Current_Holder'] = winner_name
+            break
+
+    # 4. Update the Belt field for the old and new champion
+    if belt_type == 'Singles':
+        holders = state['wrestlers']
+        state['dirty'].add('wrestlers')
+    elif belt_type == 'Tag-Team':
+        holders = state['tagteams']
+        state['dirty'].add('tagteams')
+    else:
+        holders = []
+    previous_belts = {} # Belt field values before the change, so it can be reversed
+    if old_champion_name:
+        for holder in holders:
+            if holder['Name'] == old_champion_name:
+                previous_belts.setdefault(holder['Name'], holder.get('Belt'))
+                holder['Belt'] = ''
+    for holder in holders:
+        if holder['Name'] == winner_name:
+            previous_belts.setdefault(holder['Name'], holder.get('Belt'))
+            holder['Belt'] = belt['Name']
+
+    state['dirty'].update(['belt_history', 'belts'])
+    changes.append({
+        'type': 'title_change', 'belt_id': belt_id, 'belt_name': belt.get('Name'),
+        'from': old_champion_name or None, 'to': winner_name, 'date': event_date,
+        'closed_reign_id': closed_reign_id, 'new_reign_id': new_reign['Reign_ID'],
+        'closed_reign_date_lost': closed_reign_date_lost, 'previous_holder': old_champion_name,
+        'holder_type': belt_type, 'previous_belts': previous_belts,
+    })
+
+def _add_defense(state, changes, belt):
+    """In-memory equivalent of the defense increment done through update_reign_in_history."""
+    history = state['belt_history']
+    for reign in history:
+        if reign.get('Belt_ID') == belt['ID'] and reign.get('Champion_Name') == belt['Current_Holder'] and not reign.get('Date_Lost'):
+            updated_reign = dict(reign, Defenses=reign.get('Defenses', 0) + 1)
+            # update_reign_in_history replaces the first reign carrying this Reign_ID
+            index = next(i for i, r in enumerate(history) if r.get('Reign_ID') == reign.get('Reign_ID'))
+            history[index] = updated_reign
+            state['dirty'].add('belt_history')
+            changes.append({'type': 'defense', 'belt_id': belt['ID'], 'belt_name': belt.get('Name'),
+                            'champion': belt['Current_Holder'], 'reign_id': reign.get('Reign_ID')})
+            return
+
+def apply_match_results(state, match, event_date, changes=None):
+    """Applies one match's records, title change or defense to the state. Returns the change list."""
+    changes = [] if changes is None else changes
+    all_teams_in_match = _get_all_tag_teams_involved(match.get('sides', []), team_index=state['team_index'])
+    for team_name in all_teams_in_match:
+        team_result = match['team_results'].get(team_name)
+        if team_result:
+            _add_team_result(state, changes, team_name, team_result)
+            team_data = _first_by_name(state['tagteams'], team_name)
+            if team_data and team_data.get('Members'):
+                for member_name in team_data['Members']:
+                    _add_wrestler_result(state, changes, member_name, 'tag', team_result)
+
+    # Individual records are only updated here for singles matches; tag matches
+    # were handled through the teams above, battle royals and others are not counted.
+    if match.get('match_class') == 'singles':
+        for wrestler_name in _get_all_wrestlers_involved(match.get('sides', [])):
+            result = match['individual_results'].get(wrestler_name)
+            if result:
+                _add_wrestler_result(state, changes, wrestler_name, 'singles', result)
+
+    belt_name = match.get('match_championship')
+    if belt_name:
+        belt = _find_belt_by_name(state, belt_name)
+        winning_side_idx = match.get('winning_side_index', -1)
+        if belt and belt['Status'] == 'Active' and winning_side_idx != -1:
+            winning_side = match['sides'][winning_side_idx]
+            winner_name = None
+            if belt['Holder_Type'] == 'Singles' and len(winning_side) == 1:
+                winner_name = winning_side[0]
+            elif belt['Holder_Type'] == 'Tag-Team':
+                winning_teams = _get_all_tag_teams_involved([winning_side], team_index=state['team_index'])
+                if winning_teams: winner_name = winning_teams[0]
+            if winner_name and belt.get('Current_Holder') != winner_name:
+                _change_champion(state, changes, belt, winner_name, event_date)
+            elif winner_name and belt.get('Current_Holder') == winner_name:
+                _add_defense(state, changes, belt)
+    return changes
+
+def apply_event_results(state, event, segments, matches_by_id):
+    """Applies every match of an event, in card order. Returns the change list."""
+    changes = []
+    for segment in segments:
+        if segment.get('type') == 'Match' and segment.get('match_id'):
+            match = matches_by_id.get(segment['match_id'])
+            if not match: continue
+            apply_match_results(state, match, event['Date'], changes)
+    return changes
+
+def get_event_warnings(event):
+    """
+    Returns the card validation issues that must be acknowledged before
+    finalizing an event, as "Segment N: ..." messages in card order.
+    """
+    report = validate_event_card(_slugify(event['Event_Name']))
+    return [f"Segment {issue['position']}: {issue['message']}" for issue in report['issues']]
+
+def _event_summary_fragments(segments, matches_by_id, prefs):
+    """The cached summary fragments of an event's visible segments, in card order."""
+    show_non_match_headers = prefs.get('fan_mode_show_non_match_headers')
+    fragments = []
+    for segment in segments:
+        match = matches_by_id.get(segment['match_id']) if segment.get('type') == 'Match' and segment.get('match_id') else None
+        fragment = get_segment_summary_fragment(segment, match, show_non_match_headers)
+        if fragment is not None:
+            fragments.append(fragment)
+    return fragments
+
+def build_event_summary(segments, matches_by_id, prefs):
+    """Builds the consolidated Markdown summary of an event's segments."""
+    return "\n\n---\n\n".join(f['markdown'] for f in _event_summary_fragments(segments, matches_by_id, prefs))
+
+def load_event_card(event_name):
+    """Returns (segments in card order, matches by id) for an event. The matches are shared and read-only."""
+    event_slug = _slugify(event_name)
+    segments = sorted(load_segments(event_slug), key=lambda s: s.get('position', 0))
+    return segments, get_event_matches_by_id(event_slug)
+
+def _write_finalized_event(event, segments, matches_by_id, prefs, changes):
+    """Stores an event's applied changes and summary and flags the event dict as finalized."""
+    save_finalize_changes(event['Event_Name'], changes)
+    final_summary = build_event_summary(segments, matches_by_id, prefs)
+    event['event_summary_file'] = save_event_summary(_slugify(event['Event_Name']), final_summary)
+    event['Finalized'] = True
+
+def _finalize_loaded_event(state, event, segments, matches_by_id, prefs):
+    """Applies an event's results to the state, writes its summary and flags the event dict as finalized."""
+    changes = apply_event_results(state, event, segments, matches_by_id)
+    _write_finalized_event(event, segments, matches_by_id, prefs, changes)
+    return changes
+
+def summarize_changes(changes):
+    """
+    Groups a change list for display: record deltas are summed per wrestler and
+    team, title changes and defenses are listed in card order.
+    """
+    records = {}
+    for change in changes:
+        if change['type'] == 'record':
+            entry = records.setdefault((change['entity'], change['name']),
+                                       {'entity': change['entity'], 'name': change['name'], 'deltas': {}})
+            entry['deltas'][change['field']] = entry['deltas'].get(change['field'], 0) + change['delta']
+    return {
+        'wrestlers': [r for r in records.values() if r['entity'] == 'wrestler'],
+        'tagteams': [r for r in records.values() if r['entity'] == 'tagteam'],
+        'title_changes': [c for c in changes if c['type'] == 'title_change'],
+        'defenses': [c for c in changes if c['type'] == 'defense'],
+    }
+
+def build_finalize_preview(event, segments, matches_by_id, prefs):
+    """
+    Runs the finalization pipeline against freshly loaded in-memory data and
+    returns what it would do, without writing anything: the summarized changes
+    plus the generated event summary.
+    """
+    changes = apply_event_results(load_finalization_state(), event, segments, matches_by_id)
+    preview = summarize_changes(changes)
+    fragments = _event_summary_fragments(segments, matches_by_id, prefs)
+    preview['summary'] = "\n\n---\n\n".join(f['markdown'] for f in fragments)
+    preview['summary_html'] = "\n<hr />\n".join(f['html'] for f in fragments)
+    return preview
+
+# --- Stored changes and unfinalizing ---
+#
+# The change list an event's finalization applied is kept next to its segments
+# and matches (data/events/<slug>_finalize.json). Unfinalizing applies the
+# inverse of each change, newest first, to one loaded state and writes each file
+# once, which is much cheaper than rebuilding every record and title history.
+
+def _get_finalize_changes_file_path(event_slug):
+    """Constructs the absolute path to the stored finalization changes for an event."""
+    return os.path.join(_get_project_root(), EVENTS_DATA_DIR, f'{event_slug}_finalize.json')
+
+def save_finalize_changes(event_name, changes):
+    """Stores the change list applied when an event was finalized."""
+    file_path = _get_finalize_changes_file_path(_slugify(event_name))
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(changes, f, indent=4)
+
+def load_finalize_changes(event_name):
+    """Returns the stored change list for a finalized event, or None if there is none."""
+    file_path = _get_finalize_changes_file_path(_slugify(event_name))
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _touched_by(changes):
+    """Returns (belt IDs, participant names) a change list touched."""
+    belt_ids, names = set(), set()
+    for change in changes:
+        if change['type'] == 'record':
+            names.add(change['name'])
+        else:
+            belt_ids.add(change['belt_id'])
+            names.update(name for name in (change.get('champion'), change.get('from'), change.get('to')) if name)
+    return belt_ids, names
+
+def find_dependent_event(event_name, changes):
+    """
+    Returns the name of a finalized event after this one (by date, then events.json
+    order) that touched the same belts or participants, or None. Its stored changes
+    build on this event's, so this event cannot be reversed first. A later event
+    without stored changes is assumed to depend on it.
+    """
+    events = load_events()
+    position = next(i for i, e in enumerate(events) if e.get('Event_Name') == event_name)
+    event_key = (date_ordinal(events[position].get('Date')), position)
+    belt_ids, names = _touched_by(changes)
+    for i, other in enumerate(events):
+        if i == position or not other.get('Finalized') or (date_ordinal(other.get('Date')), i) < event_key:
+            continue
+        other_changes = load_finalize_changes(other['Event_Name'])
+        if other_changes is None:
+            return other['Event_Name']
+        other_belt_ids, other_names = _touched_by(other_changes)
+        if belt_ids & other_belt_ids or names & other_names:
+            return other['Event_Name']
+    return None
+
+def _find_reign(state, reign_id):
+    """Returns the first reign in the state with the given Reign_ID."""
+    return next((r for r in state['belt_history'] if r.get('Reign_ID') == reign_id), None)
+
+def reverse_changes(state, changes):
+    """
+    Applies the inverse of a change list to the state, newest change first.
+    Returns (success, message); on failure the state is partly modified and must
+    not be saved.
+    """
+    for change in reversed(changes):
+        if change['type'] == 'record':
+            items = state['wrestlers'] if change['entity'] == 'wrestler' else state['tagteams']
+            item = _first_by_name(items, change['name'])
+            if item is None:
+                continue # Deleted since; there is no record left to correct
+            item[change['field']] = str(int(item.get(change['field'], 0)) - change['delta'])
+            state['dirty'].add('wrestlers' if change['entity'] == 'wrestler' else 'tagteams')
+
+        elif change['type'] == 'defense':
+            reign = _find_reign(state, change['reign_id'])
+            if reign is None:
+                return False, f"The {change['belt_name']} reign of {change['champion']} no longer exists."
+            reign['Defenses'] = max(reign.get('Defenses', 0) - 1, 0)
+            state['dirty'].add('belt_history')
+
+        elif change['type'] == 'title_change':
+            belt = next((b for b in state['belts'] if b['ID'] == change['belt_id']), None)
+            new_reign = _find_reign(state, change['new_reign_id'])
+            if belt is None or new_reign is None or new_reign.get('Date_Lost') or belt.get('Current_Holder') != change['to']:
+                return False, (f"The {change['belt_name']} has changed hands since {change['to']} won it. "
+                               "Unfinalize the later events first, or rebuild the title histories.")
+            state['belt_history'].remove(new_reign)
+            if change.get('closed_reign_id'):
+                closed_reign = _find_reign(state, change['closed_reign_id'])
+                if closed_reign is not None:
+                    closed_reign['Date_Lost'] = change.get('closed_reign_date_lost')
+            belt['Current_Holder'] = change.get('previous_holder')
+            holder_type = change.get('holder_type')
+            holders = state['wrestlers'] if holder_type == 'Singles' else state['tagteams'] if holder_type == 'Tag-Team' else []
+            for holder in holders:
+                if holder['Name'] in change.get('previous_belts', {}):
+                    holder['Belt'] = change['previous_belts'][holder['Name']]
+            state['dirty'].update(['belt_history', 'belts'])
+            if holder_type == 'Singles': state['dirty'].add('wrestlers')
+            elif holder_type == 'Tag-Team': state['dirty'].add('tagteams')
+    return True, 'Changes reversed.'
+
+def unfinalize_event(event_name):
+    """
+    Reverses a finalized event's stored changes in one batched write and makes
+    the event editable again. Returns (success, message).
+    """
+    event = get_event_by_name(event_name)
+    if not event or not event.get('Finalized'):
+        return False, 'Event not found or not finalized.'
+    changes = load_finalize_changes(event_name)
+    if changes is None:
+        return False, (f"No stored changes for '{event_name}' (it was finalized before changes were recorded). "
+                       "Use the record and title history rebuild tools instead.")
+    dependent = find_dependent_event(event_name, changes)
+    if dependent:
+        return False, (f"'{dependent}' was finalized after '{event_name}' and involves the same championships or "
+                       "participants. Unfinalize the later events first, newest first.")
+
+    state = load_finalization_state()
+    success, message = reverse_changes(state, changes)
+    if not success:
+        return False, message
+
+    # The event is marked editable before the reversed records are written, so a
+    # failed update leaves everything as it was instead of reversing twice later
+    summary_file = event.pop('event_summary_file', None)
+    event['Finalized'] = False
+    if not update_event(event_name, event):
+        return False, f"Could not update event '{event_name}'. Nothing has been changed."
+    save_finalization_state(state)
+    if summary_file and os.path.exists(os.path.join(_get_project_root(), summary_file)):
+        os.remove(os.path.join(_get_project_root(), summary_file))
+    os.remove(_get_finalize_changes_file_path(_slugify(event_name)))
+    return True, f"Event '{event_name}' has been unfinalized and its {len(changes)} change(s) reversed."
+
+def finalize_event(event_name, dry_run=False):
+    """
+    Applies an event's results, writes its summary and marks it finalized.
+    Returns (success, message, changes). With dry_run nothing is written and the
+    third value is the build_finalize_preview dict instead.
+    """
+    event = get_event_by_name(event_name)
+    if not event or event.get('Finalized'):
+        return False, 'Event not found or already finalized.', []
+
+    segments, matches_by_id = load_event_card(event_name)
+    if dry_run:
+        preview = build_finalize_preview(event, segments, matches_by_id, load_preferences())
+        return True, f"Preview of finalizing '{event_name}'. Nothing has been changed.", preview
+    state = load_finalization_state()
+    changes = _finalize_loaded_event(state, event, segments, matches_by_id, load_preferences())
+    # Mark the event finalized before writing the records, so a failed update
+    # never leaves results applied to an event that can be finalized again
+    if not update_event(event_name, event):
+        # Nothing is finalized, so the changes and summary files just written go too
+        os.remove(_get_finalize_changes_file_path(_slugify(event_name)))
+        summary_path = os.path.join(_get_project_root(), event.pop('event_summary_file'))
+        if os.path.exists(summary_path):
+            os.remove(summary_path)
+        return False, f"Could not mark event '{event_name}' as finalized. No records have been changed.", []
+    save_finalization_state(state)
+    return True, f"Event '{event_name}' has been finalized and records updated!", changes
+
+# --- Batch finalization ---
+
+def _unfinalized_past_events(event_names=None):
+    selected = [e for e in load_events() if e.get('Status') == 'Past' and not e.get('Finalized')]
+    if event_names is not None:
+        wanted = set(event_names)
+        selected = [e for e in selected if e.get('Event_Name') in wanted]
+    return selected
+
+def select_events_to_finalize(through_date=None, event_names=None):
+    """
+    Returns the unfinalized 'Past' events to finalize, oldest first. Events can be
+    limited to those on or before through_date (YYYY-MM-DD) and/or to a list of
+    names. Events on the same date keep their order in events.json. Events without
+    a valid date cannot be put in order, so they are left out (see select_undated_events).
+    """
+    selected = [e for e in _unfinalized_past_events(event_names) if date_ordinal(e.get('Date'))]
+    if through_date:
+        cutoff = date_ordinal(through_date)
+        selected = [e for e in selected if date_ordinal(e.get('Date')) <= cutoff]
+    return sorted(selected, key=lambda e: date_ordinal(e.get('Date')))
+
+def select_undated_events(event_names=None):
+    """Returns the unfinalized 'Past' events a batch leaves out because their Date is missing or invalid."""
+    return [e for e in _unfinalized_past_events(event_names) if not date_ordinal(e.get('Date'))]
+
+def finalize_events(through_date=None, event_names=None, acknowledge_warnings=False, progress=None):
+    """
+    Finalizes a backlog of events in date order over one shared in-memory state,
+    so title changes apply in sequence and each data file is written once at the
+    end. If any selected event has match warnings and they were not acknowledged,
+    nothing is finalized. progress, if given, is called as
+    progress(events_done, events_total, message) before anything is written, so
+    raising from it abandons the batch cleanly. Returns a report:
+    {'events': [{'Event_Name', 'Date', 'warnings', 'changes', 'finalized'}],
+     'undated': [event names left out], 'finalized': count, 'blocked': bool, 'message': str}
+    """
+    events = select_events_to_finalize(through_date, event_names)
+    undated = [e['Event_Name'] for e in select_undated_events(event_names)]
+    cards = {}
+    report_events = []
+    for event in events:
+        segments, matches_by_id = load_event_card(event['Event_Name'])
+        cards[event['Event_Name']] = (segments, matches_by_id)
+        report_events.append({
+            'Event_Name': event['Event_Name'], 'Date': event.get('Date'),
+            'warnings': get_event_warnings(event),
+            'changes': [], 'finalized': False,
+        })
+
+    report = {'events': report_events, 'undated': undated, 'finalized': 0, 'blocked': False}
+    if not events:
+        report['message'] = 'No unfinalized past events to finalize.'
+        return report
+    if any(entry['warnings'] for entry in report_events) and not acknowledge_warnings:
+        report['blocked'] = True
+        report['message'] = 'Please acknowledge the warnings before finalizing these events.'
+        return report
+
+    state = load_finalization_state()
+    prefs = load_preferences()
+    results = []
+    for i, event in enumerate(events):
+        if progress:
+            progress(i, len(events), f"Applying results of {event['Event_Name']}")
+        segments, matches_by_id = cards[event['Event_Name']]
+        results.append(apply_event_results(state, event, segments, matches_by_id))
+    if progress:
+        progress(len(events), len(events), 'Writing records and summaries')
+
+    for event, entry, changes in zip(events, report_events, results):
+        segments, matches_by_id = cards[event['Event_Name']]
+        _write_finalized_event(event, segments, matches_by_id, prefs, changes)
+        entry['changes'] = changes
+        entry['finalized'] = True
+    save_finalization_state(state)
+
+    # One write of events.json for every finalized event
+    finalized_by_name = {event['Event_Name']: event for event in events}
+    all_events = load_events()
+    for i, event in enumerate(all_events):
+        name = event.get('Event_Name')
+        if name in finalized_by_name:
+            all_events[i] = finalized_by_name.pop(name) # First event with the name, like update_event
+    save_events(all_events)
+
+    report['finalized'] = len(events)
+    report['message'] = f"Finalized {len(events)} event(s) and updated all records."
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Finalize unfinalized past events in date order.')
+    parser.add_argument('--through', help='Finalize events dated on or before this date (YYYY-MM-DD)')
+    parser.add_argument('--event', action='append', help='Finalize only this event (repeatable)')
+    parser.add_argument('--acknowledge-warnings', action='store_true', help='Finalize even if matches have warnings')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args(argv)
+
+    report = finalize_events(args.through, args.event, args.acknowledge_warnings)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for entry in report['events']:
+            status = 'finalized' if entry['finalized'] else 'pending'
+            print(f"{entry['Date']}  {entry['Event_Name']}: {status}, {len(entry['changes'])} change(s)")
+            for warning in entry['warnings']:
+                print(f"    warning: {warning}")
+        for name in report['undated']:
+            print(f"(no date)   {name}: skipped, set a valid date to finalize it")
+        print(report['message'])
+    return 1 if report['blocked'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
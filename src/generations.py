@@ -0,0 +1,63 @@
+import os
+import threading
+
+# Every data file has a "generation": a token that changes whenever the file is
+# rewritten by the app (via bump_generation) or replaced on disk by something else
+# (detected through its mtime and size). Cached views built from a file are keyed
+# by its generation and rebuilt lazily the next time they are requested.
+
+_lock = threading.Lock()
+_counters = {}
+_epoch = 0
+_cache = {}
+
+def _normalize_path(file_path):
+    """Returns the absolute form of a data file path used as a generation key."""
+    return os.path.abspath(file_path)
+
+def bump_generation(file_path):
+    """Marks a data file as changed so that any views cached from it are rebuilt."""
+    path = _normalize_path(file_path)
+    with _lock:
+        _counters[path] = _counters.get(path, 0) + 1
+
+def invalidate_all_generations():
+    """Marks every data file as changed, e.g. after a restore or a full league reset."""
+    global _epoch
+    with _lock:
+        _epoch += 1
+        _cache.clear()
+
+def get_generation(file_path):
+    """Returns a token identifying the current contents of a data file."""
+    path = _normalize_path(file_path)
+    try:
+        stat_result = os.stat(path)
+        stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        stamp = None
+    with _lock:
+        return (_epoch, _counters.get(path, 0), stamp)
+
+def get_cached(cache_key, file_paths, builder):
+    """
+    Returns the value produced by builder(), cached under cache_key until the
+    generation of any of the given data files changes.
+    """
+    generation = tuple(get_generation(path) for path in file_paths)
+    with _lock:
+        entry = _cache.get(cache_key)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+    value = builder()
+    with _lock:
+        _cache[cache_key] = (generation, value)
+    return value
+
+def clear_cached(cache_key=None):
+    """Drops one cached view, or all of them when no key is given."""
+    with _lock:
+        if cache_key is None:
+            _cache.clear()
+        else:
+            _cache.pop(cache_key, None)
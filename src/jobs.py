@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from src.system import get_project_root, DATA_DIR
+
+# Long operations (batch finalization, static site generation, backups,
+# restores, AI roster generation) run on a small in-process thread pool instead
+# of the request thread. Threads rather than processes, because the operations
+# share the app's generation caches and the static site generator renders pages
+# through the Flask app itself. Each job's state is persisted to
+# data/jobs/<id>.json so progress and results survive page reloads, and the most
+# recent finished jobs are kept for JOB_RETENTION results.
+
+JOBS_DIR = os.path.join(DATA_DIR, 'jobs')
+MAX_WORKERS = 2
+JOB_RETENTION = 50 # Finished jobs kept on disk; older ones are pruned on submit
+
+JOB_ACTIVE_STATUSES = ('queued', 'running')
+
+# Jobs that load roster, belt and event data when they start and write it back
+# when they finish, or replace the data directory outright. Edits made through
+# the normal routes while one is active would be overwritten, so the app refuses
+# them until it is done, and only one of these jobs runs at a time.
+DATA_WRITING_JOB_KINDS = ('finalize_event', 'finalize_batch', 'restore')
+
+_executor = None
+_futures = {} # job id -> Future, for jobs started by this process
+_active_jobs = {} # job id -> state of unfinished jobs; rewritten even if data/ was replaced (restores)
+_cancel_requests = set()
+_lock = threading.Lock()
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+class JobConflict(Exception):
+    """Raised by submit_job when a data-writing job is submitted while another one is active."""
+
+    def __init__(self, job):
+        super().__init__(f"{job['label']} is running. Try again when it has finished.")
+        self.job = job
+
+def _get_jobs_dir():
+    """Returns the absolute path to the jobs directory, creating it if needed."""
+    jobs_dir = os.path.join(get_project_root(), JOBS_DIR)
+    os.makedirs(jobs_dir, exist_ok=True)
+    return jobs_dir
+
+def _get_job_file_path(job_id):
+    """Constructs the absolute path to a job's state file."""
+    return os.path.join(_get_jobs_dir(), f'{job_id}.json')
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+def _save_job(job):
+    """Writes a job's state atomically, so a reader never sees a partial file."""
+    file_path = _get_job_file_path(job['id'])
+    temp_path = f'{file_path}.tmp'
+    content = json.dumps(job, indent=4, default=str) # Results that are not plain JSON are kept as text
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, file_path)
+
+def _load_job_file(job_id):
+    file_path = _get_job_file_path(job_id)
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _update_job(job_id, **fields):
+    """Updates and persists a job's state under the lock."""
+    with _lock:
+        job = _active_jobs.get(job_id) or _load_job_file(job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        _save_job(job)
+        if job['status'] not in JOB_ACTIVE_STATUSES:
+            _active_jobs.pop(job_id, None)
+        return dict(job)
+
+def get_job(job_id):
+    """
+    Returns a job's state, or None. Jobs left queued or running by a previous
+    server process can never finish, so they are reported as failed.
+    """
+    if not job_id or not all(c.isalnum() or c == '-' for c in job_id):
+        return None
+    with _lock:
+        job = dict(_active_jobs[job_id]) if job_id in _active_jobs else _load_job_file(job_id)
+    if job and job['status'] in JOB_ACTIVE_STATUSES and job_id not in _futures:
+        job = _update_job(job_id, status='failed', error='Interrupted by a server restart.', finished=_now())
+    return job
+
+def _find_data_writing_job():
+    """Unfinished DATA_WRITING_JOB_KINDS job of this process, or None. Call with _lock held."""
+    return next((job for job_id, job in _active_jobs.items()
+                 if job['kind'] in DATA_WRITING_JOB_KINDS and job_id in _futures), None)
+
+def get_data_writing_job():
+    """Returns the state of an unfinished DATA_WRITING_JOB_KINDS job of this process, or None."""
+    with _lock:
+        job = _find_data_writing_job()
+        return dict(job) if job else None
+
+def list_jobs(limit=None):
+    """Returns jobs newest first."""
+    jobs = [get_job(name[:-len('.json')]) for name in os.listdir(_get_jobs_dir()) if name.endswith('.json')]
+    jobs = sorted((job for job in jobs if job), key=lambda job: job['created'], reverse=True)
+    return jobs[:limit] if limit else jobs
+
+def prune_jobs(keep=JOB_RETENTION):
+    """Deletes all but the newest `keep` finished jobs."""
+    finished = [job for job in list_jobs() if job['status'] not in JOB_ACTIVE_STATUSES]
+    for job in finished[keep:]:
+        try:
+            os.remove(_get_job_file_path(job['id']))
+        except OSError:
+            pass
+
+class JobContext:
+    """Handed to a job function to report progress and notice cancellation."""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def check_cancelled(self):
+        """Raises JobCancelled if cancellation was requested."""
+        if self.job_id in _cancel_requests:
+            raise JobCancelled()
+
+    def progress(self, done, total, message=None):
+        """Records progress (done out of total) and checks for cancellation."""
+        fields = {'progress': round(100.0 * done / total, 1) if total else 0.0}
+        if message is not None:
+            fields['message'] = message
+        _update_job(self.job_id, **fields)
+        self.check_cancelled()
+
+def _run_job(job_id, func, args, kwargs):
+    """Thread entry point: runs the job function and records its outcome."""
+    context = JobContext(job_id)
+    try:
+        context.check_cancelled()
+        _update_job(job_id, status='running', started=_now())
+        result = func(context, *args, **kwargs)
+        _update_job(job_id, status='succeeded', progress=100.0, result=result, finished=_now())
+    except JobCancelled:
+        _update_job(job_id, status='cancelled', message='Cancelled.', finished=_now())
+    except Exception as e:
+        _update_job(job_id, status='failed', error=str(e), traceback=traceback.format_exc(), finished=_now())
+    finally:
+        _cancel_requests.discard(job_id)
+        _futures.pop(job_id, None)
+
+def submit_job(kind, label, func, *args, **kwargs):
+    """
+    Queues func(context, *args, **kwargs) on the job pool and returns the new
+    job's id. The function's return value must be JSON-serializable; it is kept
+    as the job's result. Raises JobConflict if kind is one of
+    DATA_WRITING_JOB_KINDS and another such job is still active.
+    """
+    global _executor
+    prune_jobs()
+    job_id = uuid.uuid4().hex
+    job = {
+        'id': job_id, 'kind': kind, 'label': label, 'status': 'queued',
+        'progress': 0.0, 'message': '', 'created': _now(), 'started': None, 'finished': None,
+        'result': None, 'error': None,
+    }
+    with _lock:
+        running = _find_data_writing_job() if kind in DATA_WRITING_JOB_KINDS else None
+        if running is not None:
+            raise JobConflict(dict(running))
+        _save_job(job)
+        _active_jobs[job_id] = job
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='slamsim-job')
+        _futures[job_id] = _executor.submit(_run_job, job_id, func, args, kwargs)
+    return job_id
+
+def cancel_job(job_id):
+    """
+    Requests cancellation. Queued jobs never start; running jobs stop at their
+    next progress report. Returns (success, message).
+    """
+    job = get_job(job_id)
+    if not job:
+        return False, 'Job not found.'
+    if job['status'] not in JOB_ACTIVE_STATUSES:
+        return False, f"Job has already {job['status']}."
+    _cancel_requests.add(job_id)
+    future = _futures.get(job_id)
+    if future is not None and future.cancel():
+        _cancel_requests.discard(job_id)
+        _futures.pop(job_id, None)
+        _update_job(job_id, status='cancelled', message='Cancelled before it started.', finished=_now())
+    return True, 'Cancellation requested.'
@@ -1,7 +1,8 @@
 import json
 import os
 import uuid
-from datetime import datetime
+from src.generations import bump_generation
+from src.date_utils import date_ordinal
 
 NEWS_FILE_RELATIVE_TO_ROOT = 'data/news.json'
 NEWS_DATE_FORMAT = '%Y-%m-%d'
@@ -47,12 +48,11 @@ def load_news_posts():
         elif 'Subject' not in post: # Ensure Subject exists
             post['Subject'] = ''
 
-    # Sort posts by date, newest first
-    try:
-        news_posts.sort(key=lambda x: datetime.strptime(x.get('Date', '1970-01-01'), NEWS_DATE_FORMAT), reverse=True)
-    except ValueError:
-        # Fallback if date format is inconsistent
-        pass
+    # Sort posts by date, newest first (dates are parsed once and cached)
+    sort_keys = [date_ordinal(post.get('Date', '1970-01-01'), None) for post in news_posts]
+    if None not in sort_keys: # Fallback if date format is inconsistent: keep file order
+        order = sorted(range(len(news_posts)), key=sort_keys.__getitem__, reverse=True)
+        news_posts = [news_posts[i] for i in order]
 
     return news_posts
 
@@ -63,6 +63,7 @@ def save_news_posts(news_posts_list):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(news_posts_list, f, indent=4)
+    bump_generation(file_path)
 
 def get_news_post_by_id(news_id):
     """Retrieves a single news post by its ID."""
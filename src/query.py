@@ -0,0 +1,239 @@
+import math
+from src.generations import get_cached
+from src.date_utils import date_ordinal, date_year
+from src.wrestlers import load_wrestlers, _get_wrestlers_file_path
+from src.tagteams import load_tagteams, _get_tagteams_file_path
+from src.events import load_events, _get_events_file_path
+from src.news import load_news_posts, _get_news_file_path
+from src.belts import load_belts, _get_belts_file_path
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def name_sort_key(name):
+    """Returns a sort key for a roster name that ignores a leading 'The '."""
+    if name.lower().startswith('the '):
+        return name[4:]
+    return name
+
+# Each queryable entity: how to load it, which data files it depends on, the sort
+# keys that can be used with order_by() and any derived fields usable in where().
+# A sort key of None (a missing or malformed date) sorts last in either direction.
+ENTITIES = {
+    'wrestlers': {
+        'loader': load_wrestlers,
+        'files': [_get_wrestlers_file_path],
+        'sort_keys': {'Name': lambda w: w.get('Name', '')},
+        'derived': {},
+    },
+    'tagteams': {
+        'loader': load_tagteams,
+        'files': [_get_tagteams_file_path],
+        'sort_keys': {'Name': lambda t: name_sort_key(t.get('Name', ''))},
+        'derived': {},
+    },
+    'events': {
+        'loader': load_events,
+        'files': [_get_events_file_path],
+        'sort_keys': {
+            'Date': lambda e: date_ordinal(e.get('Date'), None),
+            'Event_Name': lambda e: e.get('Event_Name', ''),
+        },
+        'derived': {'Year': lambda e: date_year(e.get('Date'))},
+    },
+    'news': {
+        'loader': load_news_posts,
+        'files': [_get_news_file_path],
+        'sort_keys': {'Date': lambda p: date_ordinal(p.get('Date'), None)},
+        'derived': {'Year': lambda p: date_year(p.get('Date'))},
+    },
+    'belts': {
+        'loader': load_belts,
+        'files': [_get_belts_file_path],
+        'sort_keys': {
+            'Display_Position': lambda b: b.get('Display_Position', 0),
+            'Name': lambda b: b.get('Name', ''),
+        },
+        'derived': {},
+    },
+}
+
+def _hashable(value):
+    """Converts list values to tuples so they can be used as index keys."""
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+def _build_view(entity):
+    """
+    Loads an entity and prepares the per-generation structures used by queries.
+    Sort keys (date ordinals, names without a leading 'The', positions) are
+    computed once here, so ordering never re-parses a field.
+    """
+    config = ENTITIES[entity]
+    rows = config['loader']()
+    return {
+        'rows': rows,
+        'keys': {field: [key_func(row) for row in rows] for field, key_func in config['sort_keys'].items()},
+        'indexes': {},
+        'orders': {},
+        'results': {},
+    }
+
+def _get_view(entity):
+    """Returns the cached view of an entity for the current data generation."""
+    config = ENTITIES[entity]
+    return get_cached(('query_view', entity), [get_path() for get_path in config['files']],
+                      lambda: _build_view(entity))
+
+class Page:
+    """One window of query results plus the numbers needed to render pagination."""
+
+    def __init__(self, items, number, size, total):
+        self.items = items
+        self.number = number
+        self.size = size
+        self.total = total
+        self.pages = max(1, math.ceil(total / size)) if size else 1
+        self.has_prev = number > 1
+        self.has_next = number < self.pages
+        self.prev_num = number - 1 if self.has_prev else None
+        self.next_num = number + 1 if self.has_next else None
+
+class Query:
+    """
+    A filter/sort/paginate query over one entity, e.g.
+    query('events').where(Status='Past').order_by('Date', reverse=True).page(1, 50).
+    Equality indexes and sorted orders are built once per data generation and
+    reused by every later query, so paging only copies the requested window.
+    """
+
+    def __init__(self, entity):
+        if entity not in ENTITIES:
+            raise ValueError(f"Unknown entity '{entity}'.")
+        self.entity = entity
+        self._conditions = {}
+        self._order = None
+
+    def where(self, **conditions):
+        """Adds equality filters. A list or tuple value matches any of its items."""
+        for field, value in conditions.items():
+            if isinstance(value, (list, tuple, set, frozenset)):
+                self._conditions[field] = frozenset(_hashable(v) for v in value)
+            else:
+                self._conditions[field] = frozenset([_hashable(value)])
+        return self
+
+    def order_by(self, field, reverse=False):
+        """Orders results by one of the entity's sort keys (stable, like sorted())."""
+        if field not in ENTITIES[self.entity]['sort_keys']:
+            raise ValueError(f"'{field}' is not a sort key for {self.entity}.")
+        self._order = (field, reverse)
+        return self
+
+    def _field_value(self, row, field):
+        """Returns a row's value for a stored or derived field."""
+        derived = ENTITIES[self.entity]['derived'].get(field)
+        return _hashable(derived(row) if derived else row.get(field))
+
+    def _index(self, view, field):
+        """Returns (building on first use) the value -> row indices index for a field."""
+        index = view['indexes'].get(field)
+        if index is None:
+            index = {}
+            for i, row in enumerate(view['rows']):
+                index.setdefault(self._field_value(row, field), []).append(i)
+            view['indexes'][field] = index
+        return index
+
+    def _ordered_rows(self, view):
+        """Returns all row indices in the requested order."""
+        if self._order is None:
+            return range(len(view['rows']))
+        order = view['orders'].get(self._order)
+        if order is None:
+            field, reverse = self._order
+            keys = view['keys'][field]
+            keyed = [i for i in range(len(keys)) if keys[i] is not None]
+            order = sorted(keyed, key=keys.__getitem__, reverse=reverse)
+            order.extend(i for i in range(len(keys)) if keys[i] is None)
+            view['orders'][self._order] = order
+        return order
+
+    def _matching_rows(self, view):
+        """Returns the ordered row indices matching every condition, memoized per generation."""
+        result_key = (tuple(sorted(self._conditions.items())), self._order)
+        matches = view['results'].get(result_key)
+        if matches is None:
+            candidates = None
+            for field, values in self._conditions.items():
+                index = self._index(view, field)
+                rows = set()
+                for value in values:
+                    rows.update(index.get(value, ()))
+                candidates = rows if candidates is None else candidates & rows
+            ordered = self._ordered_rows(view)
+            if candidates is None:
+                matches = list(ordered)
+            else:
+                matches = [i for i in ordered if i in candidates]
+            view['results'][result_key] = matches
+        return matches
+
+    def page(self, number=1, size=DEFAULT_PAGE_SIZE):
+        """
+        Returns the requested page. Items are shallow copies, so callers can add
+        display fields without touching the cached rows. size=None returns everything.
+        """
+        view = _get_view(self.entity)
+        matches = self._matching_rows(view)
+        total = len(matches)
+        if size is None:
+            number = 1
+            window = matches
+        elif size <= 0:
+            number = 1
+            window = []
+        else:
+            pages = max(1, math.ceil(total / size))
+            number = min(max(1, number), pages)
+            window = matches[(number - 1) * size:number * size]
+        items = [dict(view['rows'][i]) for i in window]
+        return Page(items, number, size, total)
+
+    def all(self):
+        """Returns every matching item."""
+        return self.page(1, None).items
+
+    def first(self):
+        """Returns the first matching item, or None."""
+        items = self.page(1, 1).items
+        return items[0] if items else None
+
+    def count(self):
+        """Returns the number of matching items."""
+        return len(self._matching_rows(_get_view(self.entity)))
+
+    def distinct(self, field):
+        """Returns the set of values a field takes across the matching items."""
+        view = _get_view(self.entity)
+        if not self._conditions:
+            return set(self._index(view, field).keys())
+        rows = self._matching_rows(view)
+        return {self._field_value(view['rows'][i], field) for i in rows}
+
+def query(entity):
+    """Starts a new query over 'wrestlers', 'tagteams', 'events', 'news' or 'belts'."""
+    return Query(entity)
+
+def parse_page_args(args, default_size=DEFAULT_PAGE_SIZE):
+    """Reads 'page' and 'per_page' from request arguments, falling back to sane defaults."""
+    try:
+        number = max(1, int(args.get('page', 1)))
+    except (TypeError, ValueError):
+        number = 1
+    try:
+        size = min(max(1, int(args.get('per_page', default_size))), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        size = default_size
+    return number, size
@@ -0,0 +1,408 @@
+import argparse
+import json
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.wrestlers import load_wrestlers, save_wrestlers
+from src.tagteams import load_tagteams, save_tagteams, build_team_index
+from src.belts import load_belts, save_belts, load_belt_history, save_belt_history
+from src.segments import _get_all_tag_teams_involved
+from src.events import load_events
+from src.finalize import load_event_card
+from src.date_utils import date_ordinal
+from src.records import RESULT_COLUMNS, WRESTLER_SINGLES_FIELDS, WRESTLER_TAG_FIELDS, TAGTEAM_RECORD_FIELDS, _record_value
+
+# Records are rebuilt by replaying every finalized event's matches with the
+# same rules finalize_event uses. Each replayed result becomes a (row, column)
+# pair; the pairs are collected for the whole archive and summed into zeroed
+# W/L/D matrices with one np.add.at per matrix, so the cost is one pass over
+# the match files plus a handful of array operations.
+#
+# Tag-team membership is taken from the current tagteams.json, as it would be
+# when finalizing today.
+
+def _first_rows(items):
+    """Maps each Name to the row of its first occurrence, like the finalize lookups."""
+    rows = {}
+    for i, item in enumerate(items):
+        rows.setdefault(item.get('Name'), i)
+    return rows
+
+def get_finalized_events():
+    """Returns the finalized events, oldest first."""
+    return sorted((e for e in load_events() if e.get('Finalized')), key=lambda e: date_ordinal(e.get('Date')))
+
+def iter_finalized_matches(events=None):
+    """Yields (event, match) for every match on a finalized event's card, in the order they were finalized."""
+    for event in events if events is not None else get_finalized_events():
+        segments, matches_by_id = load_event_card(event['Event_Name'])
+        for segment in segments:
+            if segment.get('type') == 'Match' and segment.get('match_id'):
+                match = matches_by_id.get(segment['match_id'])
+                if match:
+                    yield event, match
+
+def rebuild_record_matrices(wrestlers, tagteams, events=None):
+    """
+    Replays the finalized match history and returns (singles, tag, team) W/L/D
+    matrices aligned with the wrestlers and tagteams lists, plus the number of
+    matches replayed.
+    """
+    wrestler_rows = _first_rows(wrestlers)
+    team_rows = _first_rows(tagteams)
+    team_members = {name: tagteams[row].get('Members') or [] for name, row in team_rows.items()}
+    team_index = build_team_index(tagteams)
+
+    singles_hits, tag_hits, team_hits = [], [], []
+    match_count = 0
+    for _event, match in iter_finalized_matches(events):
+        match_count += 1
+        sides = [set(side) for side in match.get('sides', [])]
+        teams_in_match = _get_all_tag_teams_involved(match.get('sides', []), team_index=team_index)
+        for team_name in teams_in_match:
+            column = RESULT_COLUMNS.get(match['team_results'].get(team_name))
+            if column is None:
+                continue
+            team_hits.append((team_rows[team_name], column))
+            for member_name in team_members.get(team_name, []):
+                row = wrestler_rows.get(member_name)
+                if row is not None:
+                    tag_hits.append((row, column))
+
+        if match.get('match_class') == 'singles':
+            for wrestler_name in set().union(*sides):
+                row = wrestler_rows.get(wrestler_name)
+                column = RESULT_COLUMNS.get(match['individual_results'].get(wrestler_name))
+                if row is not None and column is not None:
+                    singles_hits.append((row, column))
+
+    return (_accumulate(singles_hits, len(wrestlers)), _accumulate(tag_hits, len(wrestlers)),
+            _accumulate(team_hits, len(tagteams)), match_count)
+
+def _accumulate(hits, size):
+    """Sums (row, column) hits into a zeroed (size, 3) int64 matrix."""
+    matrix = np.zeros((size, len(RESULT_COLUMNS)), dtype=np.int64)
+    if hits:
+        rows, columns = np.asarray(hits, dtype=np.int64).T
+        np.add.at(matrix, (rows, columns), 1)
+    return matrix
+
+def _record_drift(entity, items, fields, matrix):
+    """Lists every stored record field that differs from the rebuilt matrix."""
+    stored = np.array([[_record_value(item.get(field, 0)) for field in fields] for item in items], dtype=np.int64).reshape(matrix.shape)
+    drift = []
+    for row, column in zip(*np.nonzero(stored != matrix)):
+        drift.append({'entity': entity, 'name': items[row].get('Name'), 'field': fields[column],
+                      'stored': int(stored[row, column]), 'rebuilt': int(matrix[row, column])})
+    return drift
+
+def _write_matrix(items, fields, matrix):
+    """Copies a W/L/D matrix back onto the dicts as strings."""
+    for item, values in zip(items, matrix.tolist()):
+        for field, value in zip(fields, values):
+            item[field] = str(value)
+
+def rebuild_records(verify_only=False):
+    """
+    Recomputes every wrestler's and tag team's W/L/D from the finalized match
+    history. With verify_only, nothing is written and the report only lists the
+    drift between stored and rebuilt records. Returns a report:
+    {'events': count, 'matches': count, 'drift': [...], 'applied': bool}
+    """
+    wrestlers = load_wrestlers()
+    tagteams = load_tagteams()
+    events = get_finalized_events()
+    singles, tag, team, match_count = rebuild_record_matrices(wrestlers, tagteams, events)
+
+    drift = (_record_drift('wrestler', wrestlers, WRESTLER_SINGLES_FIELDS, singles)
+             + _record_drift('wrestler', wrestlers, WRESTLER_TAG_FIELDS, tag)
+             + _record_drift('tagteam', tagteams, TAGTEAM_RECORD_FIELDS, team))
+    report = {'events': len(events), 'matches': match_count, 'drift': drift, 'applied': False}
+    if verify_only or not drift:
+        return report
+
+    if any(d['entity'] == 'wrestler' for d in drift):
+        _write_matrix(wrestlers, WRESTLER_SINGLES_FIELDS, singles)
+        _write_matrix(wrestlers, WRESTLER_TAG_FIELDS, tag)
+        save_wrestlers(wrestlers)
+    if any(d['entity'] == 'tagteam' for d in drift):
+        _write_matrix(tagteams, TAGTEAM_RECORD_FIELDS, team)
+        save_tagteams(tagteams)
+    report['applied'] = True
+    return report
+
+def describe_record_drift(report):
+    """One-line summary of a rebuild_records report."""
+    if not report['drift']:
+        return 'All records match the finalized match history.'
+    action = 'were rebuilt' if report['applied'] else 'differ from the finalized match history'
+    return f"{len(report['drift'])} record field(s) {action}."
+
+# --- Championship lineage ---
+#
+# Title histories are rebuilt the same way: finalized title matches are walked
+# in chronological order per belt, applying the process_championship_change
+# rules (a new winner closes the open reign and starts a new one, the holder
+# winning again is a defense). Each belt's lineage depends only on its own
+# matches, so belts are rebuilt independently and can be spread over a process
+# pool. Reigns won before a belt's first finalized title match were entered by
+# hand and are kept as its starting lineage, Defenses included: their stored
+# count may already hold replayed defenses, so replaying does not add to it.
+# Rebuilt reigns that match a stored reign (same champion and Date_Won) keep its
+# Reign_ID.
+
+REIGN_DIFF_FIELDS = ('Date_Lost', 'Defenses', 'Notes')
+
+def _find_belt_id(belts_by_name, belt_name):
+    """Case-insensitive belt lookup, like get_belt_by_name."""
+    return belts_by_name.get(belt_name.strip().lower())
+
+def collect_title_matches(belts, events=None):
+    """
+    Returns {belt_id: [(event_date, match), ...]} for every finalized title match,
+    in chronological order. Belts are looked up by name like finalize_event does;
+    retired belts keep their history, so the Active check is not repeated here.
+    """
+    belts_by_name = {}
+    for belt in belts:
+        belts_by_name.setdefault(belt.get('Name', '').strip().lower(), belt['ID'])
+    title_matches = {}
+    for event, match in iter_finalized_matches(events):
+        belt_name = match.get('match_championship')
+        if not belt_name:
+            continue
+        belt_id = _find_belt_id(belts_by_name, belt_name)
+        if belt_id is not None:
+            title_matches.setdefault(belt_id, []).append((event['Date'], match))
+    return title_matches
+
+def _match_winner(belt, match, team_index):
+    """Returns the champion a title match produces, using the finalize rules (None if no winner)."""
+    winning_side_idx = match.get('winning_side_index', -1)
+    if winning_side_idx == -1:
+        return None
+    winning_side = match['sides'][winning_side_idx]
+    if belt.get('Holder_Type') == 'Singles' and len(winning_side) == 1:
+        return winning_side[0]
+    if belt.get('Holder_Type') == 'Tag-Team':
+        winning_teams = _get_all_tag_teams_involved([winning_side], team_index=team_index)
+        if winning_teams:
+            return winning_teams[0]
+    return None
+
+def rebuild_belt_lineage(belt, stored_reigns, title_matches, team_index):
+    """
+    Rebuilds one belt's reigns from its title matches. stored_reigns are the
+    belt's current history entries, title_matches its (event_date, match) list
+    in chronological order and team_index the tag teams' membership index.
+    Returns (reigns, current_holder).
+    """
+    if not title_matches:
+        open_reign = next((r for r in stored_reigns if not r.get('Date_Lost')), None)
+        return [dict(r) for r in stored_reigns], belt.get('Current_Holder') or (open_reign or {}).get('Champion_Name')
+
+    first_match = date_ordinal(title_matches[0][0])
+    reigns = [dict(r) for r in stored_reigns if date_ordinal(r.get('Date_Won')) < first_match]
+    for reign in reigns:
+        if reign.get('Date_Lost') and date_ordinal(reign['Date_Lost']) >= first_match:
+            reign['Date_Lost'] = None # Closed by a replayed match; reopened until the replay closes it again
+    kept = {id(r) for r in reigns}
+    open_reign = next((r for r in reigns if not r.get('Date_Lost')), None)
+    holder = open_reign['Champion_Name'] if open_reign else None
+    stored_ids = {(r.get('Champion_Name'), r.get('Date_Won')): r.get('Reign_ID') for r in stored_reigns}
+
+    for event_date, match in title_matches:
+        winner_name = _match_winner(belt, match, team_index)
+        if not winner_name:
+            continue
+        if holder != winner_name:
+            if holder:
+                open_reign = next((r for r in reigns if not r.get('Date_Lost')), None)
+                if open_reign:
+                    open_reign['Date_Lost'] = event_date
+            reigns.append({
+                "Reign_ID": stored_ids.get((winner_name, event_date)) or str(uuid.uuid4()),
+                "Belt_ID": belt['ID'], "Champion_Name": winner_name,
+                "Date_Won": event_date, "Date_Lost": None, "Defenses": 0,
+                "Notes": f"Won from {holder or 'vacant status'}"
+            })
+            holder = winner_name
+        else:
+            for reign in reigns:
+                if reign.get('Champion_Name') == holder and not reign.get('Date_Lost'):
+                    if id(reign) not in kept: # A kept reign's stored Defenses already count it
+                        reign['Defenses'] = reign.get('Defenses', 0) + 1
+                    break
+    return reigns, holder
+
+def _rebuild_belt_lineage_job(args):
+    """Process-pool entry point for rebuild_belt_lineage."""
+    return rebuild_belt_lineage(*args)
+
+def _diff_belt_lineage(belt, stored_reigns, reigns, stored_holder, holder):
+    """Returns the differences between a belt's stored and rebuilt lineage, or None if they match."""
+    stored_by_key = {(r.get('Champion_Name'), r.get('Date_Won')): r for r in stored_reigns}
+    rebuilt_keys = {(r.get('Champion_Name'), r.get('Date_Won')) for r in reigns}
+    diff = {'belt_id': belt['ID'], 'belt_name': belt.get('Name'),
+            'added': [], 'removed': [r for key, r in stored_by_key.items() if key not in rebuilt_keys],
+            'changed': [], 'holder': None}
+    for reign in reigns:
+        stored = stored_by_key.get((reign.get('Champion_Name'), reign.get('Date_Won')))
+        if stored is None:
+            diff['added'].append(reign)
+            continue
+        for field in REIGN_DIFF_FIELDS:
+            if (stored.get(field) or None) != (reign.get(field) or None):
+                diff['changed'].append({'reign_id': stored.get('Reign_ID'), 'champion': reign['Champion_Name'],
+                                        'date_won': reign['Date_Won'], 'field': field,
+                                        'stored': stored.get(field), 'rebuilt': reign.get(field)})
+    if (stored_holder or None) != (holder or None):
+        diff['holder'] = {'stored': stored_holder or None, 'rebuilt': holder}
+    return diff if diff['added'] or diff['removed'] or diff['changed'] or diff['holder'] else None
+
+def _merge_history(history, rebuilt):
+    """
+    Applies rebuilt lineages to the full history. Kept reigns are updated in
+    place, removed reigns are dropped and new reigns are inserted after the
+    reign they follow and after every reign won on or before their date, so the
+    file keeps the chronological order finalization appends in.
+    """
+    rebuilt_by_key = {belt_id: {(r.get('Champion_Name'), r.get('Date_Won')): r for r in reigns}
+                      for belt_id, reigns in rebuilt.items()}
+    merged = []
+    for reign in history:
+        belt_id = reign.get('Belt_ID')
+        if belt_id not in rebuilt:
+            merged.append(reign)
+        else:
+            replacement = rebuilt_by_key[belt_id].get((reign.get('Champion_Name'), reign.get('Date_Won')))
+            if replacement is not None:
+                merged.append(replacement)
+    for belt_id, reigns in rebuilt.items():
+        placed = {id(r) for r in merged}
+        previous = None
+        for reign in reigns:
+            if id(reign) not in placed:
+                won = date_ordinal(reign.get('Date_Won'))
+                index = next((i for i in range(len(merged), 0, -1) if date_ordinal(merged[i - 1].get('Date_Won')) <= won), 0)
+                if previous is not None:
+                    index = max(index, next(i for i, r in enumerate(merged) if r is previous) + 1)
+                merged.insert(index, reign)
+            previous = reign
+    return merged
+
+def _apply_holders(belts, wrestlers, tagteams, holder_changes):
+    """Sets each belt's Current_Holder and the Belt field of its old and new holders."""
+    belts_by_id = {b['ID']: b for b in belts}
+    for belt_id, change in holder_changes.items():
+        belt = belts_by_id[belt_id]
+        belt['Current_Holder'] = change['rebuilt'] or ''
+        holders = wrestlers if belt.get('Holder_Type') == 'Singles' else tagteams if belt.get('Holder_Type') == 'Tag-Team' else []
+        for holder in holders:
+            if holder.get('Name') == change['stored'] and holder.get('Belt') == belt['Name']:
+                holder['Belt'] = ''
+        for holder in holders:
+            if holder.get('Name') == change['rebuilt']:
+                holder['Belt'] = belt['Name']
+
+def rebuild_lineage(belt_ids=None, apply=False, processes=None):
+    """
+    Rebuilds the title history of every belt (or the given belt IDs) from the
+    finalized title matches and diffs it against belt_history.json. With apply,
+    the whole rebuilt lineage is written at once: belt history, belts and the
+    wrestlers/tag-teams whose Belt field changed, each file a single write.
+    processes > 1 rebuilds belts in a process pool. Returns a report:
+    {'belts': count, 'matches': count, 'diffs': [...], 'applied': bool}
+    """
+    belts = load_belts()
+    history = load_belt_history()
+    tagteams = load_tagteams()
+    team_index = build_team_index(tagteams)
+    selected = [b for b in belts if belt_ids is None or b['ID'] in belt_ids]
+    title_matches = collect_title_matches(belts)
+
+    jobs = [(belt, [r for r in history if r.get('Belt_ID') == belt['ID']], title_matches.get(belt['ID'], []), team_index)
+            for belt in selected]
+    if processes and processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_rebuild_belt_lineage_job, jobs))
+    else:
+        results = [rebuild_belt_lineage(*job) for job in jobs]
+
+    diffs = []
+    rebuilt = {}
+    holder_changes = {}
+    for (belt, stored_reigns, _matches, _teams), (reigns, holder) in zip(jobs, results):
+        diff = _diff_belt_lineage(belt, stored_reigns, reigns, belt.get('Current_Holder'), holder)
+        if diff:
+            diffs.append(diff)
+            rebuilt[belt['ID']] = reigns
+            if diff['holder']:
+                holder_changes[belt['ID']] = diff['holder']
+
+    report = {'belts': len(selected), 'matches': sum(len(job[2]) for job in jobs), 'diffs': diffs, 'applied': False}
+    if not apply or not diffs:
+        return report
+
+    save_belt_history(_merge_history(history, rebuilt))
+    if holder_changes:
+        wrestlers = load_wrestlers()
+        _apply_holders(belts, wrestlers, tagteams, holder_changes)
+        save_belts(belts)
+        save_wrestlers(wrestlers)
+        save_tagteams(tagteams)
+    report['applied'] = True
+    return report
+
+def describe_lineage_diff(report):
+    """One-line summary of a rebuild_lineage report."""
+    if not report['diffs']:
+        return 'All title histories match the finalized title matches.'
+    action = 'were rebuilt' if report['applied'] else 'differ from the finalized title matches'
+    return f"{len(report['diffs'])} title histor{'y' if len(report['diffs']) == 1 else 'ies'} {action}."
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild league data from the finalized event history.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    records_parser = subparsers.add_parser('records', help='Rebuild wrestler and tag-team W/L/D records')
+    records_parser.add_argument('--verify', action='store_true', help='Only report drift, do not write')
+    records_parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    lineage_parser = subparsers.add_parser('lineage', help='Rebuild championship histories and current holders')
+    lineage_parser.add_argument('--belt', action='append', help='Only rebuild this belt ID (repeatable)')
+    lineage_parser.add_argument('--apply', action='store_true', help='Write the rebuilt lineage (default is to only show the diff)')
+    lineage_parser.add_argument('--processes', type=int, default=None, help='Rebuild belts in this many worker processes')
+    lineage_parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.command == 'lineage':
+        report = rebuild_lineage(args.belt, apply=args.apply, processes=args.processes)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            for diff in report['diffs']:
+                print(f"{diff['belt_name']}:")
+                for reign in diff['removed']:
+                    print(f"    - {reign.get('Champion_Name')} (won {reign.get('Date_Won')})")
+                for reign in diff['added']:
+                    print(f"    + {reign['Champion_Name']} (won {reign['Date_Won']})")
+                for change in diff['changed']:
+                    print(f"    ~ {change['champion']} (won {change['date_won']}): {change['field']} {change['stored']} -> {change['rebuilt']}")
+                if diff['holder']:
+                    print(f"    holder: {diff['holder']['stored']} -> {diff['holder']['rebuilt']}")
+            print(f"Replayed {report['matches']} title matches for {report['belts']} belts.")
+            print(describe_lineage_diff(report))
+        return 1 if not args.apply and report['diffs'] else 0
+
+    report = rebuild_records(verify_only=args.verify)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for d in report['drift']:
+            print(f"{d['entity']} {d['name']}: {d['field']} {d['stored']} -> {d['rebuilt']}")
+        print(f"Replayed {report['matches']} matches from {report['events']} finalized events.")
+        print(describe_record_drift(report))
+    return 1 if args.verify and report['drift'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
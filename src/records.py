@@ -0,0 +1,208 @@
+import numpy as np
+from src.wrestlers import load_wrestlers, _get_wrestlers_file_path
+from src.tagteams import load_tagteams, _get_tagteams_file_path
+from src.generations import get_cached
+from src.query import name_sort_key
+
+# Column order used by every W/L/D array in the store.
+RESULT_COLUMNS = {'Win': 0, 'Loss': 1, 'Draw': 2}
+
+WRESTLER_SINGLES_FIELDS = ('Singles_Wins', 'Singles_Losses', 'Singles_Draws')
+WRESTLER_TAG_FIELDS = ('Tag_Wins', 'Tag_Losses', 'Tag_Draws')
+TAGTEAM_RECORD_FIELDS = ('Wins', 'Losses', 'Draws')
+
+# Records with fewer decided matches than this are ranked below everyone else
+# when sorting by win percentage (same rule the fan roster has always used).
+MIN_MATCHES_FOR_PERCENTAGE = 5
+
+def _record_value(value):
+    """Converts a stored record field (normally a numeric string) to an int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def _record_matrix(rows, fields):
+    """Builds an (n, 3) int64 W/L/D matrix from a list of dicts."""
+    matrix = np.zeros((len(rows), len(fields)), dtype=np.int64)
+    for i, row in enumerate(rows):
+        for j, field in enumerate(fields):
+            matrix[i, j] = _record_value(row.get(field, 0))
+    return matrix
+
+class RecordStore:
+    """
+    Columnar win/loss/draw store. Wrestler singles and tag records and tag-team
+    records are kept as parallel (n, 3) NumPy arrays with a name -> row map, so
+    totals, percentages and rankings are single array operations.
+    """
+
+    def __init__(self, wrestler_names, singles, tag, team_names, team):
+        self.wrestler_names = list(wrestler_names)
+        self.wrestler_rows = {name: i for i, name in enumerate(self.wrestler_names)}
+        self.singles = singles
+        self.tag = tag
+        self.team_names = list(team_names)
+        self.team_rows = {name: i for i, name in enumerate(self.team_names)}
+        self.team = team
+        # Alphabetical sort keys are computed once per store, not per roster request
+        self.wrestler_sort_keys = np.asarray(self.wrestler_names, dtype=str)
+        self.team_sort_keys = np.asarray([name_sort_key(name) for name in self.team_names], dtype=str)
+
+    @classmethod
+    def from_rosters(cls, wrestlers, tagteams):
+        """Builds a store from loaded wrestler and tag-team lists."""
+        return cls(
+            [w.get('Name', '') for w in wrestlers],
+            _record_matrix(wrestlers, WRESTLER_SINGLES_FIELDS),
+            _record_matrix(wrestlers, WRESTLER_TAG_FIELDS),
+            [t.get('Name', '') for t in tagteams],
+            _record_matrix(tagteams, TAGTEAM_RECORD_FIELDS),
+        )
+
+    def copy(self):
+        """Returns an independent copy whose arrays can be modified freely."""
+        return RecordStore(self.wrestler_names, self.singles.copy(), self.tag.copy(),
+                           self.team_names, self.team.copy())
+
+    # --- Lookups ---
+
+    def wrestler_record(self, name, record_type='Singles'):
+        """Returns {'wins', 'losses', 'draws'} for a wrestler, or None if unknown."""
+        row = self.wrestler_rows.get(name)
+        if row is None:
+            return None
+        return _record_dict(self.wrestler_records(record_type)[row])
+
+    def team_record(self, name):
+        """Returns {'wins', 'losses', 'draws'} for a tag team, or None if unknown."""
+        row = self.team_rows.get(name)
+        if row is None:
+            return None
+        return _record_dict(self.team[row])
+
+    def wrestler_records(self, record_type='Singles'):
+        """Returns the wrestler W/L/D matrix for 'Singles', 'Tag' or 'Overall'."""
+        if record_type == 'Tag':
+            return self.tag
+        if record_type == 'Overall':
+            return self.singles + self.tag
+        return self.singles
+
+    # --- Vectorized statistics ---
+
+    def totals(self, records, mask=None):
+        """Returns summed W/L/D over the rows selected by mask (all rows if None)."""
+        if mask is not None:
+            records = records[mask]
+        return _record_dict(records.sum(axis=0))
+
+    def wrestler_mask(self, names):
+        """Returns a boolean row mask selecting the given wrestler names."""
+        return _names_mask(self.wrestler_rows, len(self.wrestler_names), names)
+
+    def team_mask(self, names):
+        """Returns a boolean row mask selecting the given tag-team names."""
+        return _names_mask(self.team_rows, len(self.team_names), names)
+
+    @staticmethod
+    def win_percentages(records, min_matches=MIN_MATCHES_FOR_PERCENTAGE):
+        """
+        Returns wins / (wins + losses) per row. Rows with fewer than min_matches
+        decided matches get -1.0 so they sort below every ranked row.
+        """
+        wins = records[:, 0].astype(np.float64)
+        decided = wins + records[:, 1]
+        percentages = np.full(len(records), -1.0)
+        ranked = decided >= max(min_matches, 1)
+        percentages[ranked] = wins[ranked] / decided[ranked]
+        return percentages
+
+    @staticmethod
+    def rank_order(records, sort_keys, sort_order):
+        """
+        Returns row indices ordered for a roster sort. sort_keys are the name keys
+        used for alphabetical ordering and tie-breaks.
+        """
+        sort_keys = np.asarray(sort_keys, dtype=str)
+        if sort_order == 'Total Wins':
+            return np.argsort(-records[:, 0], kind='stable')
+        if sort_order == 'Win Percentage':
+            percentages = RecordStore.win_percentages(records)
+            return np.lexsort((sort_keys, percentages))[::-1]
+        if sort_order == 'Alphabetical':
+            return np.argsort(sort_keys, kind='stable')
+        return np.arange(len(records)) # Unknown sort orders keep file order
+
+    @staticmethod
+    def ranks(order):
+        """Converts an ordering of row indices into a rank per row."""
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(len(order))
+        return ranks
+
+    # --- Updates ---
+
+    def add_wrestler_result(self, name, match_class, result, count=1):
+        """Applies a result to a wrestler using the same rules as update_wrestler_record."""
+        row = self.wrestler_rows.get(name)
+        if row is None:
+            return False
+        column = RESULT_COLUMNS.get(result)
+        if column is not None:
+            if match_class == 'singles':
+                self.singles[row, column] += count
+            elif match_class in ['tag', 'other', 'battle_royal']:
+                self.tag[row, column] += count
+        return True
+
+    def add_team_result(self, name, result, count=1):
+        """Applies a result to a tag team using the same rules as update_tagteam_record."""
+        row = self.team_rows.get(name)
+        if row is None:
+            return False
+        column = RESULT_COLUMNS.get(result)
+        if column is not None:
+            self.team[row, column] += count
+        return True
+
+    def write_to_rosters(self, wrestlers, tagteams):
+        """Copies the stored records back onto wrestler and tag-team dicts as strings."""
+        for wrestler in wrestlers:
+            row = self.wrestler_rows.get(wrestler.get('Name'))
+            if row is None:
+                continue
+            for j, field in enumerate(WRESTLER_SINGLES_FIELDS):
+                wrestler[field] = str(int(self.singles[row, j]))
+            for j, field in enumerate(WRESTLER_TAG_FIELDS):
+                wrestler[field] = str(int(self.tag[row, j]))
+        for team in tagteams:
+            row = self.team_rows.get(team.get('Name'))
+            if row is None:
+                continue
+            for j, field in enumerate(TAGTEAM_RECORD_FIELDS):
+                team[field] = str(int(self.team[row, j]))
+
+def _record_dict(values):
+    """Converts a W/L/D row into a plain dictionary."""
+    return {'wins': int(values[0]), 'losses': int(values[1]), 'draws': int(values[2])}
+
+def _names_mask(rows, size, names):
+    """Builds a boolean mask over rows for the given names."""
+    mask = np.zeros(size, dtype=bool)
+    indices = [rows[name] for name in names if name in rows]
+    mask[indices] = True
+    return mask
+
+def get_record_store():
+    """
+    Returns the record store for the current wrestlers and tag-teams files. The
+    store is rebuilt automatically whenever either file changes, so record
+    updates made through update_wrestler_record/update_tagteam_record are always
+    reflected. Callers must treat the returned store as read-only (use copy()).
+    """
+    return get_cached(
+        'record_store',
+        [_get_wrestlers_file_path(), _get_tagteams_file_path()],
+        lambda: RecordStore.from_rosters(load_wrestlers(), load_tagteams()),
+    )
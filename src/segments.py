@@ -1,13 +1,20 @@
+import copy
+import functools
+import hashlib
 import json
 import os
 import re
 import unicodedata
+import threading
 import uuid
 
+import markdown
+
+from .generations import bump_generation, get_cached, get_generation
 from .prefs import load_preferences
 from .wrestlers import load_wrestlers
-from .tagteams import load_tagteams
-from .belts import load_belts # Added for championship logic
+from .tagteams import get_team_index, _get_tagteams_file_path
+from .belts import load_belts, _get_belts_file_path # Added for championship logic
 
 # Base directories
 DATA_DIR = 'data'
@@ -15,6 +22,13 @@ EVENTS_DATA_DIR = os.path.join(DATA_DIR, 'events')
 INCLUDES_DIR = 'includes'
 TMP_DIR = os.path.join(INCLUDES_DIR, 'tmp')
 
+# Rendered Markdown is cached by a hash of its source, so a summary is only
+# re-rendered when its text changes. Oldest entries are evicted past this size.
+MARKDOWN_CACHE_SIZE = 4096
+# Generated match display strings, keyed by a hash of the match and the tag team
+# and belt data generations, are cached the same way.
+DISPLAY_CACHE_SIZE = 8192
+
 # File paths for static data (relative to project root)
 WRESTLERS_FILE = os.path.join(DATA_DIR, 'wrestlers.json')
 TAGTEAMS_FILE = os.path.join(DATA_DIR, 'tagteams.json')
@@ -45,54 +59,106 @@ def _get_all_wrestlers_involved(sides):
             wrestlers.add(participant)
     return list(wrestlers)
 
-def _get_all_tag_teams_involved(sides, all_tagteams_data):
+def _get_contained_teams(side, team_index):
+    """
+    Names of the teams whose members are all on the side. Only the teams of the
+    side's own members are tested, so the cost follows the side, not the league.
+    """
+    side_set = set(side)
+    contained = []
+    seen = set()
+    for member in side_set:
+        for team_name in team_index['teams_by_member'].get(member, ()):
+            if team_name not in seen:
+                seen.add(team_name)
+                if team_index['member_sets'][team_name] <= side_set:
+                    contained.append(team_name)
+    return contained
+
+def _get_all_tag_teams_involved(sides, all_tagteams_data=None, team_index=None):
     """
     Identifies tag teams from the provided `sides` that match known tag teams.
+    A prebuilt team_index of the tag teams can be given in place of the list.
     """
+    if team_index is None:
+        team_index = get_team_index(all_tagteams_data)
     teams = set()
-    team_member_sets = {
-        team_data.get('Name'): set(_get_members_list_from_team_data(team_data))
-        for team_data in all_tagteams_data if team_data.get('Name') and team_data.get('Members')
-    }
-    
     for side in sides:
-        side_members_set = set(side)
-        for team_name, members_set in team_member_sets.items():
-            if members_set.issubset(side_members_set) and len(members_set) > 1:
-                teams.add(team_name)
-    
+        teams.update(_get_contained_teams(side, team_index))
     return list(teams)
 
-def _generate_side_display_string(side, all_tagteams_data):
+def _generate_side_display_string(side, all_tagteams_data=None):
     """Generates a display string for a single side, expanding tag teams."""
-    side_set = set(side)
-    # Find teams whose members are fully contained within this side
-    contained_teams = [
-        team for team in all_tagteams_data 
-        if set(_get_members_list_from_team_data(team)).issubset(side_set) and len(_get_members_list_from_team_data(team)) > 1
-    ]
+    team_index = get_team_index(all_tagteams_data)
+    # Find teams whose members are fully contained within this side, in roster order
+    contained_teams = sorted(_get_contained_teams(side, team_index), key=team_index['order'].get)
     
     # Get all wrestlers who are part of the found teams
     wrestlers_in_teams = set()
-    for team in contained_teams:
-        for member in _get_members_list_from_team_data(team):
-            wrestlers_in_teams.add(member)
+    for team_name in contained_teams:
+        wrestlers_in_teams.update(team_index['member_sets'][team_name])
             
     # Get wrestlers who are not in any of the found teams
     independent_wrestlers = [w for w in side if w not in wrestlers_in_teams]
     
     # Build the string parts
     parts = []
-    for team in contained_teams:
-        members_str = ", ".join(_get_members_list_from_team_data(team))
-        parts.append(f"{team['Name']} ({members_str})")
+    for team_name in contained_teams:
+        members_str = ", ".join(team_index['members'][team_name])
+        parts.append(f"{team_name} ({members_str})")
     
     parts.extend(independent_wrestlers)
     
     return ", ".join(parts)
 
-def _generate_match_result_string(match_data, all_tagteams_data):
-    """Constructs the match result string, e.g., 'Winner(s) def. Loser(s) (Time)'."""
+def _bounded_cache_get(cache, lock, key, builder, max_size):
+    """Returns cache[key], building and storing it on a miss. The oldest entry is evicted past max_size."""
+    with lock:
+        value = cache.get(key)
+    if value is None:
+        value = builder()
+        with lock:
+            if len(cache) >= max_size:
+                cache.pop(next(iter(cache)), None)
+            cache[key] = value
+    return value
+
+_display_cache = {} # (kind, sha1 of the match fields, tag team generation, belt generation) -> string
+_display_lock = threading.Lock()
+
+# Fields of a match that its display strings are generated from
+DISPLAY_FIELDS = ('sides', 'winning_side_index', 'match_result', 'winner_method', 'match_championship', 'match_time')
+
+def _memoized_display_string(kind, match_data, builder):
+    """
+    Returns builder(), cached under a canonical hash of the match's display
+    fields and the current tag team and belt data generations, so the string is
+    regenerated only when the match, a team or a belt changed.
+    """
+    encoded = json.dumps({field: match_data.get(field) for field in DISPLAY_FIELDS}, sort_keys=True)
+    key = (kind, hashlib.sha1(encoded.encode('utf-8')).hexdigest(),
+           get_generation(_get_tagteams_file_path()), get_generation(_get_belts_file_path()))
+    return _bounded_cache_get(_display_cache, _display_lock, key, builder, DISPLAY_CACHE_SIZE)
+
+def _get_belts_by_name():
+    """Belts keyed by name (first one wins, like the lookups it replaces), cached on belts.json."""
+    def build():
+        belts_by_name = {}
+        for belt in load_belts():
+            belts_by_name.setdefault(belt.get('Name'), belt)
+        return belts_by_name
+    return get_cached('belts-by-name', [_get_belts_file_path()], build)
+
+def _generate_match_result_string(match_data, all_tagteams_data=None):
+    """
+    Constructs the match result string, e.g., 'Winner(s) def. Loser(s) (Time)'.
+    Memoized when generated from the stored tag teams (no list given).
+    """
+    if all_tagteams_data is None:
+        return _memoized_display_string('result', match_data, lambda: _build_match_result_string(match_data, None))
+    return _build_match_result_string(match_data, all_tagteams_data)
+
+def _build_match_result_string(match_data, all_tagteams_data):
     winning_idx = match_data.get('winning_side_index')
     if winning_idx is None or winning_idx == -1:
         return "Result not determined."
@@ -114,10 +180,17 @@ def _generate_match_result_string(match_data, all_tagteams_data):
 
     return f"{winning_side_str} def. {losing_side_str} {time_str}".strip()
 
-def generate_match_result_display_string(match_data, all_tagteams_data, all_belts_data):
+def generate_match_result_display_string(match_data, all_tagteams_data=None, all_belts_data=None):
     """
-    Generates a human-readable display string for a match result.
+    Generates a human-readable display string for a match result. Memoized
+    when generated from the stored tag teams and belts (no lists given).
     """
+    if all_tagteams_data is None and all_belts_data is None:
+        return _memoized_display_string('result_display', match_data,
+                                        lambda: _build_match_result_display_string(match_data, None, None))
+    return _build_match_result_display_string(match_data, all_tagteams_data, all_belts_data)
+
+def _build_match_result_display_string(match_data, all_tagteams_data, all_belts_data):
     sides = match_data.get('sides', [])
     winning_side_index = match_data.get('winning_side_index', -1)
     match_result_overall = match_data.get('match_result', '') # e.g., "Side 1 (...) wins", "Draw (Time limit)"
@@ -144,14 +217,17 @@ def generate_match_result_display_string(match_data, all_tagteams_data, all_belt
             display_parts.append(f"by {winner_method}")
 
         if match_championship:
-            belt = next((b for b in all_belts_data if b.get('Name') == match_championship), None)
+            if all_belts_data is None:
+                belt = _get_belts_by_name().get(match_championship)
+            else:
+                belt = next((b for b in all_belts_data if b.get('Name') == match_championship), None)
             if belt:
                 current_holder = belt.get('Current_Holder')
                 is_retain = False
                 if current_holder:
                     if belt.get('Holder_Type') == 'Tag-Team':
                         winning_side_members = set(winning_side_participants)
-                        team_members = set(next((_get_members_list_from_team_data(t) for t in all_tagteams_data if t['Name'] == current_holder), []))
+                        team_members = set(get_team_index(all_tagteams_data)['members'].get(current_holder, ()))
                         if team_members and team_members.issubset(winning_side_members):
                             is_retain = True
                     else: # Singles
@@ -266,10 +342,7 @@ def _sync_team_results_to_individuals(match_results, all_tagteams_data):
     team_results = match_results.get("team_results", {})
     individual_results = match_results.get("individual_results", {})
     
-    team_members_map = {
-        team_data['Name']: _get_members_list_from_team_data(team_data)
-        for team_data in all_tagteams_data if 'Name' in team_data and 'Members' in team_data
-    }
+    team_members_map = get_team_index(all_tagteams_data)['members']
 
     for team_name, result in team_results.items():
         if team_name in team_members_map:
@@ -302,7 +375,7 @@ def _validate_match_structure(sides):
 
     return warnings
 
-def _validate_result_completeness(match_results, sides, all_wrestlers_in_match, all_teams_in_match, all_tagteams_data):
+def _validate_result_completeness(match_results, sides, all_wrestlers_in_match, all_teams_in_match, all_tagteams_data=None):
     """
     Validates the completeness and consistency of match results.
     Returns a list of warning messages.
@@ -338,10 +411,7 @@ def _validate_result_completeness(match_results, sides, all_wrestlers_in_match,
                     if individual_results.get(wrestler) == "Win":
                         warnings.append(f"Wrestler '{wrestler}' on a non-winning side has result 'Win'.")
         
-        team_members_map = {
-            team_data['Name']: set(_get_members_list_from_team_data(team_data))
-            for team_data in all_tagteams_data if 'Name' in team_data and 'Members' in team_data
-        }
+        team_members_map = get_team_index(all_tagteams_data)['member_sets']
         
         for team_name in all_teams_in_match:
             if team_name in team_members_map:
@@ -377,10 +447,18 @@ def _get_matches_file_path(event_slug):
     return os.path.join(root, EVENTS_DATA_DIR, f'{event_slug}_matches.json')
 
 
+def _get_warnings_file_path(event_slug):
+    """Constructs the absolute path to the match warnings JSON file for a given event."""
+    root = _get_project_root()
+    return os.path.join(root, EVENTS_DATA_DIR, f'{event_slug}_warnings.json')
+
+
+@functools.lru_cache(maxsize=16384)
 def _slugify(value):
     """
     Normalizes string, converts to lowercase, removes non-alpha characters,
-    and converts spaces to hyphens.
+    and converts spaces to hyphens. Results are cached, since the same names are
+    slugified for every link on every page.
     """
     value = str(value)
     value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('utf-8')
@@ -424,6 +502,7 @@ def save_segments(event_slug, segments_list):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(segments_list, f, indent=4)
+    bump_generation(file_path)
 
 
 def load_matches(event_slug):
@@ -444,6 +523,7 @@ def save_matches(event_slug, matches_list):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(matches_list, f, indent=4)
+    bump_generation(file_path)
 
 
 def get_segment_by_position(event_slug, position):
@@ -455,13 +535,24 @@ def get_segment_by_position(event_slug, position):
     return None
 
 
+def get_event_matches_by_id(event_slug):
+    """
+    Returns an event's matches keyed by match_id (first match wins), loaded once
+    per version of the matches file. The dict and its matches are shared by every
+    caller and must not be modified; copy a match before changing it.
+    """
+    def build():
+        matches_by_id = {}
+        for match in load_matches(event_slug):
+            matches_by_id.setdefault(match.get('match_id'), match)
+        return matches_by_id
+    return get_cached(('event-matches', event_slug), [_get_matches_file_path(event_slug)], build)
+
+
 def get_match_by_id(event_slug, match_id):
-    """Retrieves a single match by its match_id for a given event."""
-    matches = load_matches(event_slug)
-    for match in matches:
-        if match.get('match_id') == match_id:
-            return match
-    return None
+    """Retrieves a single match by its match_id for a given event, as a copy the caller may modify."""
+    match = get_event_matches_by_id(event_slug).get(match_id)
+    return copy.deepcopy(match) if match is not None else None
 
 
 def load_summary_content(summary_file_path):
@@ -477,29 +568,141 @@ def save_summary_content(summary_file_path, content):
     os.makedirs(os.path.dirname(summary_file_path), exist_ok=True)
     with open(summary_file_path, 'w', encoding='utf-8') as f:
         f.write(content)
+    bump_generation(summary_file_path)
 
 
 def delete_summary_file(summary_file_path):
     """Deletes a summary file if it exists."""
     if os.path.exists(summary_file_path):
         os.remove(summary_file_path)
+        bump_generation(summary_file_path)
+
+
+def load_summary_content_cached(summary_file_path):
+    """Loads a summary file, reusing the last read until the file changes."""
+    if not summary_file_path:
+        return ""
+    return get_cached(('summary', os.path.abspath(summary_file_path)), [summary_file_path],
+                      lambda: load_summary_content(summary_file_path))
+
 
+_markdown_cache = {} # sha1 of the Markdown source -> rendered HTML
+_markdown_lock = threading.Lock()
 
-def load_active_wrestlers():
-    """Loads active wrestlers from wrestlers.json."""
-    return [w for w in load_wrestlers() if w.get('Status') == 'Active']
+def render_markdown(text):
+    """Renders Markdown to HTML, cached by a hash of the source text."""
+    text = text or ""
+    key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    return _bounded_cache_get(_markdown_cache, _markdown_lock, key, lambda: markdown.markdown(text), MARKDOWN_CACHE_SIZE)
 
 
-def load_active_tagteams():
-    """Loads active tag teams from tagteams.json."""
-    return [t for t in load_tagteams() if t.get('Status') == 'Active']
+def get_segment_summary_fragment(segment, match, show_non_match_headers):
+    """
+    Returns a segment's part of the consolidated event summary as
+    {'markdown': ..., 'html': ...}, or None if the match hides its summary. Only
+    the segment's own summary file is read, and only when it changed.
+    """
+    if match and match.get('match_visibility', {}).get('hide_summary'):
+        return None
+    summary_content = load_summary_content_cached(segment.get('summary_file'))
+    if segment.get('type') == 'Match':
+        fragment = f"### {segment['header']}\n#### {segment['participants_display']}\n\n{summary_content}"
+    elif show_non_match_headers:
+        fragment = f"### {segment['header']}\n\n{summary_content}"
+    else:
+        fragment = summary_content
+    return {'markdown': fragment, 'html': render_markdown(fragment)}
+
+
+# --- Event-level match warnings ---
+#
+# Each event keeps its matches' validation warnings in
+# data/events/<slug>_warnings.json, maintained by add_segment, update_segment and
+# delete_segment, so they are served without reading the matches file:
+#   {"matches": {match_id: {"position": 3, "warnings": [...], "wrestlers": [...], "roster_fingerprint": "..."}}}
+# The fingerprint hashes the memberships of the tag teams the validation could
+# have detected; when it no longer matches the current tag teams, the stored
+# warnings are stale and src.card_validation revalidates the match.
+
+def _roster_fingerprint(wrestlers, team_index):
+    """Hashes the memberships of every tag team that shares a wrestler with the match."""
+    team_names = set()
+    for wrestler in wrestlers:
+        team_names.update(team_index['teams_by_member'].get(wrestler, ()))
+    encoded = json.dumps(sorted((name, team_index['members'][name]) for name in team_names))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _match_warnings_entry(match_data, position, team_index):
+    wrestlers = sorted(_get_all_wrestlers_involved(match_data.get('sides', [])))
+    return {
+        'position': position,
+        'warnings': match_data.get('warnings') or [],
+        'wrestlers': wrestlers,
+        'roster_fingerprint': _roster_fingerprint(wrestlers, team_index),
+    }
+
+
+def _build_event_warnings(event_slug):
+    """Builds the warnings aggregate from an event's stored matches, for events saved before it existed."""
+    team_index = get_team_index()
+    positions = {s.get('match_id'): s.get('position') for s in load_segments(event_slug) if s.get('match_id')}
+    aggregate = {'matches': {}}
+    for match in load_matches(event_slug):
+        match_id = match.get('match_id')
+        if match_id in positions and match_id not in aggregate['matches']:
+            aggregate['matches'][match_id] = _match_warnings_entry(match, positions[match_id], team_index)
+    return aggregate
 
 
-def _generate_participants_display_string(sides, all_tagteams_data):
+def load_event_warnings(event_slug):
+    """
+    Loads an event's warnings aggregate. An event with none stored yet gets one
+    built from its matches; it is only written when a segment of the event is
+    next saved, so loading never touches the data directory.
+    """
+    file_path = _get_warnings_file_path(event_slug)
+    if not os.path.exists(file_path):
+        return _build_event_warnings(event_slug)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_event_warnings(event_slug, aggregate):
+    """Saves an event's warnings aggregate."""
+    file_path = _get_warnings_file_path(event_slug)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(aggregate, f, indent=4)
+    bump_generation(file_path)
+
+
+def _record_match_warnings(event_slug, match_data, position):
+    """Stores a freshly validated match's warnings in its event's aggregate."""
+    aggregate = load_event_warnings(event_slug)
+    aggregate['matches'][match_data['match_id']] = _match_warnings_entry(match_data, position, get_team_index())
+    save_event_warnings(event_slug, aggregate)
+
+
+def _forget_match_warnings(event_slug, match_id):
+    """Removes a deleted match from its event's aggregate."""
+    aggregate = load_event_warnings(event_slug)
+    if aggregate['matches'].pop(match_id, None) is not None:
+        save_event_warnings(event_slug, aggregate)
+
+
+def _generate_participants_display_string(sides, all_tagteams_data=None):
     """
     Generates a human-readable display string for match participants,
-    expanding tag teams within each side.
+    expanding tag teams within each side. Memoized when generated from the
+    stored tag teams (no list given).
     """
+    if all_tagteams_data is None:
+        return _memoized_display_string('participants', {'sides': sides},
+                                        lambda: _build_participants_display_string(sides, None))
+    return _build_participants_display_string(sides, all_tagteams_data)
+
+def _build_participants_display_string(sides, all_tagteams_data):
     side_display_strings = []
     for side in sides:
         side_display_strings.append(_generate_side_display_string(side, all_tagteams_data))
@@ -524,13 +727,71 @@ def validate_match_data(sides, match_results=None):
     warnings.extend(_validate_match_structure(sides))
 
     if match_results:
-        all_tagteams_data = load_tagteams()
         all_wrestlers_in_match = _get_all_wrestlers_involved(sides)
-        all_teams_in_match = _get_all_tag_teams_involved(sides, all_tagteams_data)
-        warnings.extend(_validate_result_completeness(match_results, sides, all_wrestlers_in_match, all_teams_in_match, all_tagteams_data))
+        all_teams_in_match = _get_all_tag_teams_involved(sides) # Uses the cached index of tagteams.json
+        warnings.extend(_validate_result_completeness(match_results, sides, all_wrestlers_in_match, all_teams_in_match))
 
     return errors, warnings
 
+def _prepare_segment_match(segment_data, match_data, all_wrestlers_data, match_id):
+    """
+    Classifies and validates a match segment's match data, fills in the
+    segment's header and display fields and returns the full match record to
+    store. Raises ValueError if the match fails validation. Tag teams are
+    detected with the cached index of tagteams.json.
+    """
+    processed_match_data = _prepare_match_data_for_storage(match_data, all_wrestlers_data, None)
+    processed_match_data = _sync_team_results_to_individuals(processed_match_data, None)
+
+    # Auto-generate header if empty
+    if not segment_data.get('header'):
+        match_class = processed_match_data.get('match_class', 'other')
+        if match_class == 'singles':
+            segment_data['header'] = 'Singles Match'
+        elif match_class == 'tag':
+            segment_data['header'] = 'Tag-Team Match'
+        elif match_class == 'battle_royal':
+            segment_data['header'] = 'Battle Royal'
+        else:
+            segment_data['header'] = 'Match'
+
+    errors, warnings = validate_match_data(processed_match_data.get('sides', []), processed_match_data)
+    if errors:
+        raise ValueError(f"Match data validation failed: {', '.join(errors)}")
+    processed_match_data['warnings'] = warnings if warnings else []
+
+    # Generate the match_result_display string (memoized on the stored tag teams and belts)
+    generated_display_string = generate_match_result_display_string(processed_match_data)
+
+    # Use user-provided match_result_display if available, otherwise use generated
+    final_match_result_display = match_data.get('match_result_display') or generated_display_string
+
+    # Generate participants_display here
+    participants_display = _generate_participants_display_string(processed_match_data['sides'])
+
+    segment_data['match_id'] = match_id
+    segment_data['participants_display'] = participants_display # Use the generated string
+    segment_data['sides'] = processed_match_data['sides']
+    segment_data['match_result'] = processed_match_data.get('match_result', "")
+    segment_data['match_result_display'] = final_match_result_display # Store the final string
+
+    full_match_data_to_save = processed_match_data.copy()
+    full_match_data_to_save['match_id'] = match_id
+    full_match_data_to_save['segment_position'] = segment_data['position']
+    full_match_data_to_save['match_result_display'] = final_match_result_display # Also store in full match data
+    return full_match_data_to_save
+
+
+def _clear_segment_match_fields(segment_data):
+    """Removes match-specific fields from a segment that is not a match."""
+    segment_data.pop('match_id', None)
+    segment_data.pop('participants_display', None)
+    segment_data.pop('sides', None)
+    segment_data.pop('match_result', None)
+    segment_data.pop('match_result_display', None)
+    segment_data.pop('match_visibility', None) # Clear this too
+
+
 def add_segment(event_slug, segment_data, summary_content, match_data=None):
     """Adds a new segment to an event. If it's a match, also adds match data."""
     segments = load_segments(event_slug)
@@ -539,59 +800,12 @@ def add_segment(event_slug, segment_data, summary_content, match_data=None):
 
     if segment_data['type'] == 'Match' and match_data is not None:
         all_wrestlers_data = load_wrestlers()
-        all_tagteams_data = load_tagteams()
-        processed_match_data = _prepare_match_data_for_storage(match_data, all_wrestlers_data, all_tagteams_data)
-        processed_match_data = _sync_team_results_to_individuals(processed_match_data, all_tagteams_data)
-
-        # Auto-generate header if empty
-        if not segment_data.get('header'):
-            match_class = processed_match_data.get('match_class', 'other')
-            if match_class == 'singles':
-                segment_data['header'] = 'Singles Match'
-            elif match_class == 'tag':
-                segment_data['header'] = 'Tag-Team Match'
-            elif match_class == 'battle_royal':
-                segment_data['header'] = 'Battle Royal'
-            else:
-                segment_data['header'] = 'Match'
-
-        errors, warnings = validate_match_data(processed_match_data.get('sides', []), processed_match_data)
-        if errors:
-            raise ValueError(f"Match data validation failed: {', '.join(errors)}")
-        processed_match_data['warnings'] = warnings if warnings else []
-
-        # Generate the match_result_display string
-        all_belts_data = load_belts() # Load belts here for the display string generation
-        generated_display_string = generate_match_result_display_string(processed_match_data, all_tagteams_data, all_belts_data)
-        
-        # Use user-provided match_result_display if available, otherwise use generated
-        final_match_result_display = match_data.get('match_result_display') or generated_display_string
-
-        match_id = str(uuid.uuid4())
-        # Generate participants_display here
-        participants_display = _generate_participants_display_string(processed_match_data['sides'], all_tagteams_data)
-
-        match_id = str(uuid.uuid4())
-        segment_data['match_id'] = match_id
-        segment_data['participants_display'] = participants_display # Use the generated string
-        segment_data['sides'] = processed_match_data['sides']
-        segment_data['match_result'] = processed_match_data.get('match_result', "")
-        segment_data['match_result_display'] = final_match_result_display # Store the final string
-
-        full_match_data_to_save = processed_match_data.copy()
-        full_match_data_to_save['match_id'] = match_id
-        full_match_data_to_save['segment_position'] = segment_data['position']
-        full_match_data_to_save['match_result_display'] = final_match_result_display # Also store in full match data
-        
+        full_match_data_to_save = _prepare_segment_match(segment_data, match_data, all_wrestlers_data, str(uuid.uuid4()))
         _add_match(event_slug, full_match_data_to_save)
+        _record_match_warnings(event_slug, full_match_data_to_save, segment_data['position'])
     else:
         # If not a match, ensure match-specific fields are cleared
-        segment_data.pop('match_id', None)
-        segment_data.pop('participants_display', None)
-        segment_data.pop('sides', None)
-        segment_data.pop('match_result', None)
-        segment_data.pop('match_result_display', None)
-        segment_data.pop('match_visibility', None) # Clear this too
+        _clear_segment_match_fields(segment_data)
 
     # Generate summary file path (must be done after header is set)
     segment_data['summary_file'] = _get_summary_file_path(
@@ -635,64 +849,18 @@ def update_segment(event_slug, original_position, updated_data, summary_content,
 
     if updated_data['type'] == 'Match' and match_data is not None:
         all_wrestlers_data = load_wrestlers()
-        all_tagteams_data = load_tagteams()
-        processed_match_data = _prepare_match_data_for_storage(match_data, all_wrestlers_data, all_tagteams_data)
-        processed_match_data = _sync_team_results_to_individuals(processed_match_data, all_tagteams_data)
-
-        # Auto-generate header if empty
-        if not updated_data.get('header'):
-            match_class = processed_match_data.get('match_class', 'other')
-            if match_class == 'singles':
-                updated_data['header'] = 'Singles Match'
-            elif match_class == 'tag':
-                updated_data['header'] = 'Tag-Team Match'
-            elif match_class == 'battle_royal':
-                updated_data['header'] = 'Battle Royal'
-            else:
-                updated_data['header'] = 'Match'
-
-        errors, warnings = validate_match_data(processed_match_data.get('sides', []), processed_match_data)
-        if errors:
-            raise ValueError(f"Match data validation failed: {', '.join(errors)}")
-        processed_match_data['warnings'] = warnings if warnings else []
-
-        # Generate the match_result_display string
-        all_belts_data = load_belts() # Load belts here for the display string generation
-        generated_display_string = generate_match_result_display_string(processed_match_data, all_tagteams_data, all_belts_data)
-
-        # Use user-provided match_result_display if available, otherwise use generated
-        final_match_result_display = match_data.get('match_result_display') or generated_display_string
-
-        # Generate participants_display here
-        participants_display = _generate_participants_display_string(processed_match_data['sides'], all_tagteams_data)
-
-        updated_data['participants_display'] = participants_display # Use the generated string
-        updated_data['sides'] = processed_match_data['sides']
-        updated_data['match_result'] = processed_match_data.get('match_result', "")
-        updated_data['match_result_display'] = final_match_result_display # Store the final string
-
-        full_match_data_to_save = processed_match_data.copy()
-        full_match_data_to_save['segment_position'] = updated_data['position']
-        full_match_data_to_save['match_result_display'] = final_match_result_display # Also store in full match data
-
+        full_match_data_to_save = _prepare_segment_match(updated_data, match_data, all_wrestlers_data,
+                                                         old_match_id or str(uuid.uuid4()))
         if old_match_id:
-            updated_data['match_id'] = old_match_id
-            full_match_data_to_save['match_id'] = old_match_id
             _update_match(event_slug, old_match_id, full_match_data_to_save)
         else:
-            match_id = str(uuid.uuid4())
-            updated_data['match_id'] = match_id
-            full_match_data_to_save['match_id'] = match_id
             _add_match(event_slug, full_match_data_to_save)
+        _record_match_warnings(event_slug, full_match_data_to_save, updated_data['position'])
             
     elif old_match_id:
         _delete_match(event_slug, old_match_id)
-        updated_data.pop('match_id', None)
-        updated_data.pop('participants_display', None)
-        updated_data.pop('sides', None)
-        updated_data.pop('match_result', None)
-        updated_data.pop('match_result_display', None)
-        updated_data.pop('match_visibility', None) # Clear this too
+        _forget_match_warnings(event_slug, old_match_id)
+        _clear_segment_match_fields(updated_data)
 
     segments[segment_index] = updated_data
     new_summary_file_path = _get_summary_file_path(
@@ -738,10 +906,138 @@ def delete_segment(event_slug, position):
         
         if segment_to_delete.get('match_id'):
             _delete_match(event_slug, segment_to_delete['match_id'])
+            _forget_match_warnings(event_slug, segment_to_delete['match_id'])
         return True
     return False
 
 
+def apply_card_changes(event_slug, order, inserts=None, deletes=None):
+    """
+    Applies a whole-card edit in one pass. `order` is the final card from top to
+    bottom: each entry is either the current position of an existing segment or
+    the 'key' of one of `inserts`, and the card is renumbered 1..N in that order.
+    `inserts` are {'key', 'segment', 'summary', 'match'} with the segment,
+    summary and match data add_segment takes; `deletes` are current positions.
+    The segments, matches and warnings files are written once each, and only
+    summaries whose path changed are rewritten. Returns (success, message);
+    raises ValueError, before anything is written, if an inserted match fails
+    validation.
+    """
+    inserts = inserts or []
+    deletes = [int(position) for position in deletes or []]
+    segments = load_segments(event_slug)
+    by_position = {s.get('position'): s for s in segments}
+    inserts_by_key = {}
+    for insert in inserts:
+        if insert.get('key') in inserts_by_key:
+            return False, f"Insert key '{insert.get('key')}' is used more than once."
+        inserts_by_key[insert.get('key')] = insert
+
+    for position in deletes:
+        if position not in by_position:
+            return False, f"Segment at position {position} not found."
+    seen = set()
+    for ref in order:
+        if ref in seen:
+            return False, f"'{ref}' appears more than once in the card order."
+        seen.add(ref)
+        if isinstance(ref, int):
+            if ref not in by_position:
+                return False, f"Segment at position {ref} not found."
+            if ref in deletes:
+                return False, f"Segment at position {ref} is both deleted and kept in the card order."
+        elif ref not in inserts_by_key:
+            return False, f"Unknown segment '{ref}' in the card order."
+    missing = [p for p in by_position if p not in seen and p not in deletes]
+    if missing:
+        return False, f"The card order must list every segment that is not deleted (missing: {', '.join(map(str, sorted(missing)))})."
+    unplaced = [key for key in inserts_by_key if key not in seen]
+    if unplaced:
+        return False, f"Inserted segments missing from the card order: {', '.join(map(str, unplaced))}."
+
+    # Build the new card in memory first, so a failed match validation writes nothing
+    all_wrestlers_data = None
+    new_segments, new_matches, moved_positions = [], [], {} # moved_positions: match_id -> new position
+    summary_writes = {} # new summary path -> content
+    replaced_paths = set() # summary paths that may no longer be used
+    for new_position, ref in enumerate(order, start=1):
+        if isinstance(ref, int):
+            segment = by_position[ref]
+            old_summary_file = segment.get('summary_file')
+            segment['position'] = new_position
+            new_summary_file = _get_summary_file_path(event_slug, segment.get('type', ''), segment.get('header', ''), new_position)
+            if new_summary_file != old_summary_file:
+                summary_writes[new_summary_file] = load_summary_content(old_summary_file) if old_summary_file else ""
+                if old_summary_file:
+                    replaced_paths.add(old_summary_file)
+                segment['summary_file'] = new_summary_file
+            if segment.get('match_id'):
+                moved_positions[segment['match_id']] = new_position
+        else:
+            insert = inserts_by_key[ref]
+            segment = dict(insert.get('segment') or {})
+            segment['position'] = new_position
+            if segment.get('type') == 'Match' and insert.get('match') is not None:
+                if all_wrestlers_data is None:
+                    all_wrestlers_data = load_wrestlers()
+                new_matches.append(_prepare_segment_match(segment, insert['match'], all_wrestlers_data, str(uuid.uuid4())))
+            else:
+                _clear_segment_match_fields(segment)
+            segment['summary_file'] = _get_summary_file_path(event_slug, segment.get('type', ''), segment.get('header', ''), new_position)
+            summary_writes[segment['summary_file']] = insert.get('summary') or ""
+        new_segments.append(segment)
+
+    deleted_match_ids = set()
+    for position in deletes:
+        segment = by_position[position]
+        if segment.get('summary_file'):
+            replaced_paths.add(segment['summary_file'])
+        if segment.get('match_id'):
+            deleted_match_ids.add(segment['match_id'])
+
+    # One write per file
+    matches = [m for m in load_matches(event_slug) if m.get('match_id') not in deleted_match_ids]
+    for match in matches:
+        if match.get('match_id') in moved_positions:
+            match['segment_position'] = moved_positions[match['match_id']]
+    save_matches(event_slug, matches + new_matches)
+
+    aggregate = load_event_warnings(event_slug)
+    for match_id in deleted_match_ids:
+        aggregate['matches'].pop(match_id, None)
+    for match_id, position in moved_positions.items():
+        if match_id in aggregate['matches']:
+            aggregate['matches'][match_id]['position'] = position
+    if new_matches:
+        team_index = get_team_index()
+        for match in new_matches:
+            aggregate['matches'][match['match_id']] = _match_warnings_entry(match, match['segment_position'], team_index)
+    save_event_warnings(event_slug, aggregate)
+
+    save_segments(event_slug, new_segments)
+    for summary_file, content in summary_writes.items():
+        save_summary_content(summary_file, content)
+    kept_paths = {segment['summary_file'] for segment in new_segments}
+    for summary_file in replaced_paths - kept_paths:
+        delete_summary_file(summary_file)
+    return True, f"Card updated: {len(new_segments)} segment(s), {len(inserts)} added, {len(deletes)} deleted."
+
+
+def save_event_card(event_slug, segments, matches):
+    """
+    Writes a whole new card for an event: its segments, matches and warnings
+    aggregate, one write each. Summary files are not written; a segment without
+    one reads as an empty summary until it is edited.
+    """
+    team_index = get_team_index()
+    positions = {match['match_id']: match['segment_position'] for match in matches}
+    aggregate = {'matches': {match['match_id']: _match_warnings_entry(match, positions[match['match_id']], team_index)
+                             for match in matches}}
+    save_matches(event_slug, matches)
+    save_event_warnings(event_slug, aggregate)
+    save_segments(event_slug, segments)
+
+
 def _delete_match(event_slug, match_id):
     """Internal function to delete a match from an event's matches file."""
     matches = load_matches(event_slug)
@@ -770,5 +1066,10 @@ def delete_all_segments_for_event(event_name):
 
     if os.path.exists(matches_file_path):
         os.remove(matches_file_path)
+
+    warnings_file_path = _get_warnings_file_path(sluggified_event_name)
+    if os.path.exists(warnings_file_path):
+        os.remove(warnings_file_path)
+        bump_generation(warnings_file_path)
         
     return True
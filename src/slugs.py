@@ -0,0 +1,68 @@
+from src.generations import get_cached
+from src.segments import _slugify
+from src.events import load_events, _get_events_file_path
+from src.wrestlers import load_wrestlers, _get_wrestlers_file_path
+from src.tagteams import load_tagteams, _get_tagteams_file_path
+
+# Slugged record types: how to load them, which data file they live in and the
+# field their slug is derived from. Event slugs also name the event's data files
+# (data/events/<slug>_segments.json etc.), so two events must never share one.
+SLUG_SOURCES = {
+    'events': (load_events, _get_events_file_path, 'Event_Name'),
+    'wrestlers': (load_wrestlers, _get_wrestlers_file_path, 'Name'),
+    'tagteams': (load_tagteams, _get_tagteams_file_path, 'Name'),
+}
+
+def _build_registry(kind):
+    """Slugifies every record of a kind once and indexes it by slug."""
+    loader, _, name_field = SLUG_SOURCES[kind]
+    by_slug = {}
+    slugs = {}
+    collisions = {}
+    for item in loader():
+        name = item.get(name_field, '')
+        slug = _slugify(name)
+        slugs[name] = slug
+        if slug in by_slug:
+            # The first record keeps the slug, matching the old linear lookup
+            collisions.setdefault(slug, [by_slug[slug].get(name_field, '')]).append(name)
+        else:
+            by_slug[slug] = item
+    return {'by_slug': by_slug, 'slugs': slugs, 'collisions': collisions}
+
+def get_slug_registry(kind):
+    """Returns the slug registry for 'events', 'wrestlers' or 'tagteams', rebuilt when its file changes."""
+    _, get_path, _ = SLUG_SOURCES[kind]
+    return get_cached(('slug_registry', kind), [get_path()], lambda: _build_registry(kind))
+
+def get_slug(kind, name):
+    """Returns the stored slug for a record name (slugifying it if the record is unknown)."""
+    slug = get_slug_registry(kind)['slugs'].get(name)
+    return slug if slug is not None else _slugify(name)
+
+def find_by_slug(kind, slug):
+    """Returns a copy of the record with the given slug, or None."""
+    item = get_slug_registry(kind)['by_slug'].get(slug)
+    return dict(item) if item is not None else None
+
+def find_slug_collision(kind, name, original_name=None):
+    """
+    Returns the name of another record whose slug is the same as name's, or None.
+    original_name is the record being renamed, which may keep its own slug: only
+    a change of slug is checked, so records that already share one stay editable.
+    """
+    _, _, name_field = SLUG_SOURCES[kind]
+    slug = _slugify(name)
+    if original_name is not None and _slugify(original_name) == slug:
+        return None
+    item = get_slug_registry(kind)['by_slug'].get(slug)
+    if item is None:
+        return None
+    existing_name = item.get(name_field, '')
+    if existing_name in (name, original_name):
+        return None # Exact duplicates are reported by the callers' own name checks
+    return existing_name
+
+def get_slug_collisions(kind):
+    """Returns {slug: [names]} for existing records that already share a slug."""
+    return get_slug_registry(kind)['collisions']
@@ -10,6 +10,7 @@ from src.events import load_events
 from src.belts import load_belts
 from src.news import load_news_posts
 from src.segments import _slugify # Import _slugify for consistent slug generation
+from src.date_utils import date_year
 
 STATIC_SITE_OUTPUT_DIR_NAME = 'static_export'
 STATIC_SITE_ZIP_DIR_NAME = 'static_site_zips' # Directory to store generated zip files
@@ -32,10 +33,11 @@ def _save_static_page(client, url, dest_path):
     else:
         print(f"Warning: Could not generate static page for {url} (Status: {response.status_code}).")
 
-def generate_static_site(flask_app):
+def generate_static_site(flask_app, progress=None):
     """
     Generates a static version of the Fan Mode section of the application.
-    Returns the path to the generated zip file.
+    progress, if given, is called as progress(pages_done, pages_total, message)
+    after each page. Returns the path to the generated zip file.
     """
     project_root = get_project_root()
     output_path = _get_static_site_output_path()
@@ -61,6 +63,23 @@ def generate_static_site(flask_app):
         shutil.copy2(logo_src, os.path.join(logo_dest_dir, LEAGUE_LOGO_FILENAME))
 
     # 3. Generate Fan Mode pages
+    wrestlers = load_wrestlers()
+    tagteams = load_tagteams()
+    events = load_events()
+    belts = load_belts()
+    news_posts = load_news_posts()
+    event_years = {date_year(e.get('Date')) for e in events if e.get('Event_Name') and e.get('Date')} - {None}
+    news_years = {date_year(p.get('Date')) for p in news_posts if p.get('News_ID') and p.get('Date')} - {None}
+    pages_total = 5 + len(wrestlers) + len(tagteams) + len(events) + len(event_years) + len(belts) + len(news_posts) + len(news_years)
+    pages_done = 0
+
+    def save_page(url, filename):
+        nonlocal pages_done
+        _save_static_page(client, url, os.path.join(output_path, filename))
+        pages_done += 1
+        if progress:
+            progress(pages_done, pages_total, f"Rendered {filename}")
+
     with flask_app.test_client() as client:
         # Base fan pages
         base_fan_pages = {
@@ -71,88 +90,69 @@ def generate_static_site(flask_app):
             'fan.news_list': 'news.html',
         }
         for endpoint, filename in base_fan_pages.items():
-            with flask_app.app_context():
+            with flask_app.test_request_context():
                 url = url_for(endpoint)
-            _save_static_page(client, url, os.path.join(output_path, filename))
+            save_page(url, filename)
 
         # Generate wrestler detail pages
-        wrestlers = load_wrestlers()
         for wrestler in wrestlers:
             wrestler_name = wrestler.get('Name')
             if wrestler_name:
-                with flask_app.app_context():
+                with flask_app.test_request_context():
                     url = url_for('fan.view_wrestler', wrestler_name=wrestler_name)
                     static_filename = f"wrestler-{_slugify(wrestler_name)}.html"
-                _save_static_page(client, url, os.path.join(output_path, static_filename))
+                save_page(url, static_filename)
 
         # Generate tagteam detail pages
-        tagteams = load_tagteams()
         for tagteam in tagteams:
             tagteam_name = tagteam.get('Name')
             if tagteam_name:
-                with flask_app.app_context():
+                with flask_app.test_request_context():
                     url = url_for('fan.view_tagteam', tagteam_name=tagteam_name)
                     static_filename = f"tagteam-{_slugify(tagteam_name)}.html"
-                _save_static_page(client, url, os.path.join(output_path, static_filename))
+                save_page(url, static_filename)
 
         # Generate event detail pages and archive pages
-        events = load_events()
-        event_years = set()
         for event in events:
             event_name = event.get('Event_Name')
             event_date_str = event.get('Date')
             if event_name and event_date_str:
                 event_slug = _slugify(event_name)
-                with flask_app.app_context():
+                with flask_app.test_request_context():
                     url = url_for('fan.view_event', event_slug=event_slug)
                     static_filename = f"event-{event_slug}.html"
-                _save_static_page(client, url, os.path.join(output_path, static_filename))
-                
-                try:
-                    event_year = datetime.strptime(event_date_str, '%Y-%m-%d').year
-                    event_years.add(event_year)
-                except ValueError:
-                    pass
+                save_page(url, static_filename)
         
         for year in sorted(list(event_years)):
-            with flask_app.app_context():
+            with flask_app.test_request_context():
                 url = url_for('fan.archive_by_year', year=year)
                 static_filename = f"events-archive-{year}.html"
-            _save_static_page(client, url, os.path.join(output_path, static_filename))
+            save_page(url, static_filename)
 
         # Generate belt history pages
-        belts = load_belts()
         for belt in belts:
             belt_id = belt.get('ID')
             if belt_id:
-                with flask_app.app_context():
+                with flask_app.test_request_context():
                     url = url_for('fan.belt_history', belt_id=belt_id)
                     static_filename = f"belt-{belt_id}.html"
-                _save_static_page(client, url, os.path.join(output_path, static_filename))
+                save_page(url, static_filename)
 
         # Generate news detail pages and archive pages
-        news_posts = load_news_posts()
-        news_years = set()
         for post in news_posts:
             news_id = post.get('News_ID')
             news_date_str = post.get('Date')
             if news_id and news_date_str:
-                with flask_app.app_context():
+                with flask_app.test_request_context():
                     url = url_for('fan.view_news', news_id=news_id)
                     static_filename = f"news-{news_id}.html"
-                _save_static_page(client, url, os.path.join(output_path, static_filename))
-
-                try:
-                    news_year = datetime.strptime(news_date_str, '%Y-%m-%d').year
-                    news_years.add(news_year)
-                except ValueError:
-                    pass
+                save_page(url, static_filename)
         
         for year in sorted(list(news_years)):
-            with flask_app.app_context():
+            with flask_app.test_request_context():
                 url = url_for('fan.news_archive_by_year', year=year)
                 static_filename = f"news-archive-{year}.html"
-            _save_static_page(client, url, os.path.join(output_path, static_filename))
+            save_page(url, static_filename)
 
     # 4. Create a zip archive of the generated static site
     archive_name = f"slamsim_fan_site_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
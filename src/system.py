@@ -1,5 +1,8 @@
 import os
 import shutil
+import zipfile
+from datetime import datetime
+from src.generations import invalidate_all_generations
 
 DATA_DIR = 'data'
 EVENTS_DATA_SUBDIR = os.path.join(DATA_DIR, 'events')
@@ -58,6 +61,9 @@ def delete_all_league_data():
             os.remove(logo_path)
         except OSError as e:
             print(f"Error removing league logo {logo_path}: {e}")
+
+    # 5. Drop every cached view built from the deleted files
+    invalidate_all_generations()
             
     return True
 
@@ -78,3 +84,85 @@ def delete_all_temporary_files():
         os.makedirs(tmp_dir_path, exist_ok=True) # Ensure parent 'includes' also exists
         return True
 
+
+def create_backup_archive():
+    """Zips the data directory into the project root. Returns the archive path."""
+    root_path = get_project_root()
+    data_path = os.path.join(root_path, DATA_DIR)
+    if not os.path.exists(data_path):
+        raise FileNotFoundError("No data directory found to backup.")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_filename = f"slamsim_backup_{timestamp}" # No .zip extension here for make_archive
+
+    # shutil.make_archive(base_name, format, root_dir, base_dir)
+    # base_name: The name of the archive file to create, including the path, but without the .zip extension.
+    # root_dir: The directory from which to start archiving.
+    # base_dir: The directory that will be archived.
+    return shutil.make_archive(
+        os.path.join(root_path, backup_filename), # Archive will be created in root_path
+        'zip',
+        root_path, # Start archiving from the project root
+        DATA_DIR    # Archive the 'data' directory relative to root_path
+    )
+
+def restore_backup_archive(temp_zip_path):
+    """
+    Replaces the data directory with the contents of a backup zip. The current
+    data is kept aside until the restore succeeds and put back if it fails.
+    Returns (success, messages) where messages are (text, category) pairs.
+    """
+    root_path = get_project_root()
+    data_path = os.path.join(root_path, DATA_DIR)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    old_data_path = f"{data_path}_old_{timestamp}"
+    messages = []
+
+    try:
+        # 1. Rename existing data directory as a safeguard
+        if os.path.exists(data_path):
+            shutil.move(data_path, old_data_path)
+            messages.append((f"Existing data moved to '{os.path.basename(old_data_path)}' as a safeguard.", "info"))
+
+        # 2. Create a new, empty data directory
+        os.makedirs(data_path, exist_ok=True)
+
+        # 3. Unzip the contents of the uploaded file into the new data directory
+        with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
+            # Check if the zip contains a 'data/' directory at its root
+            # If so, extract to root_path so 'data/' is created correctly
+            namelist = zip_ref.namelist()
+            if any(name.startswith(f'{DATA_DIR}/') for name in namelist):
+                zip_ref.extractall(root_path)
+            else:
+                # Otherwise, extract directly into the new data_path
+                zip_ref.extractall(data_path)
+
+        # 4. Remove the old data directory after successful restore
+        if os.path.exists(old_data_path):
+            shutil.rmtree(old_data_path)
+
+        # 5. Clear any temporary files generated by the application
+        delete_all_temporary_files()
+        invalidate_all_generations() # Cached views refer to the replaced data
+
+        messages.append(('League data restored successfully!', 'success'))
+        return True, messages
+
+    except zipfile.BadZipFile:
+        messages.append(('Invalid backup file. Please upload a valid .zip file.', 'danger'))
+        # Attempt to revert if extraction failed due to bad zip
+        if os.path.exists(data_path):
+            shutil.rmtree(data_path) # Remove the incomplete new data dir
+        if os.path.exists(old_data_path):
+            shutil.move(old_data_path, data_path) # Restore old data
+            messages.append(("Attempted to restore previous data due to invalid backup file.", "info"))
+    except Exception as e:
+        messages.append((f'Error restoring data: {e}. Please check the "{os.path.basename(old_data_path)}" directory for manual recovery.', 'danger'))
+        # If any other error, ensure old data is preserved and new (potentially corrupt) data is removed
+        if os.path.exists(data_path):
+            shutil.rmtree(data_path) # Remove the incomplete new data dir
+        if os.path.exists(old_data_path) and not os.path.exists(data_path): # Only move back if data_path is truly gone
+            shutil.move(old_data_path, data_path) # Restore old data
+            messages.append(("Attempted to restore previous data due to restoration error.", "info"))
+    return False, messages
@@ -1,5 +1,6 @@
 import json
 import os
+from src.generations import bump_generation, get_cached
 from src.wrestlers import get_wrestler_by_name
 
 TAGTEAMS_FILE_RELATIVE_TO_ROOT = 'data/tagteams.json'
@@ -69,6 +70,43 @@ def save_tagteams(tagteams_list):
 
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(tagteams_to_save, f, indent=4)
+    bump_generation(filepath)
+
+def build_team_index(all_tagteams_data):
+    """
+    Builds the tag-team membership index:
+    {'members': {team: members tuple}, 'member_sets': {team: frozenset},
+     'teams_by_member': {wrestler: team names}, 'team_by_members': {frozenset: team},
+     'order': {team: position in the list}}
+    Only teams with at least two distinct members appear in member_sets and the
+    lookups built from it, since only those are ever detected in a match.
+    """
+    index = {'members': {}, 'member_sets': {}, 'teams_by_member': {}, 'team_by_members': {}, 'order': {}}
+    for position, team_data in enumerate(all_tagteams_data):
+        team_name = team_data.get('Name')
+        if not team_name:
+            continue
+        members = tuple(_get_members_list_from_team_data(team_data))
+        index['members'][team_name] = members
+        index['order'].setdefault(team_name, position)
+        if len(set(members)) > 1:
+            index['member_sets'][team_name] = frozenset(members)
+    for team_name, member_set in index['member_sets'].items():
+        index['team_by_members'].setdefault(member_set, team_name)
+        for member in member_set:
+            index['teams_by_member'].setdefault(member, []).append(team_name)
+    return index
+
+def get_team_index(all_tagteams_data=None):
+    """
+    Returns the membership index of the given tag teams, or of tagteams.json when
+    none are given. The file's index is cached on its data generation; a given
+    list is indexed on every call, so callers that look up many matches against
+    one list build its index once with build_team_index and pass that down.
+    """
+    if all_tagteams_data is None:
+        return get_cached('tagteam-index', [_get_tagteams_file_path()], lambda: build_team_index(load_tagteams()))
+    return build_team_index(all_tagteams_data)
 
 def get_tagteam_by_name(name):
     """Retrieves a single tag-team by its name."""
@@ -76,18 +114,30 @@ def get_tagteam_by_name(name):
 
 def add_tagteam(tagteam_data):
     """Adds a new tag-team to the list."""
+    from src.slugs import find_slug_collision # Import here to avoid circular dependency
     tagteams = load_tagteams()
+    if any(tt.get('Name') == tagteam_data.get('Name') for tt in tagteams):
+        return False
+    if find_slug_collision('tagteams', tagteam_data.get('Name', '')):
+        return False # Another tag-team's page already uses this name's slug
     tagteams.append(tagteam_data)
     save_tagteams(tagteams)
+    return True
 
 def update_tagteam(original_name, updated_data):
     """Updates an existing tag-team's data."""
+    from src.slugs import find_slug_collision # Import here to avoid circular dependency
     tagteams = load_tagteams()
+    if original_name != updated_data.get('Name') and any(tt.get('Name') == updated_data.get('Name') for tt in tagteams):
+        return False
+    if find_slug_collision('tagteams', updated_data.get('Name', ''), original_name):
+        return False # New name would share another tag-team's slug
     for i, tt in enumerate(tagteams):
         if tt['Name'] == original_name:
             tagteams[i] = updated_data
-            break
-    save_tagteams(tagteams)
+            save_tagteams(tagteams)
+            return True
+    return False # Tag-team not found
 
 def delete_tagteam(name):
     """Deletes a tag-team by its name."""
@@ -1,5 +1,6 @@
 import json
 import os
+from src.generations import bump_generation
 
 WRESTLERS_FILE_RELATIVE_TO_ROOT = 'data/wrestlers.json'
 
@@ -60,6 +61,7 @@ def save_wrestlers(wrestlers_list):
 
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(wrestlers_to_save, f, indent=4)
+    bump_generation(file_path)
 
 def get_wrestler_by_name(name):
     """Retrieves a wrestler by their unique name."""
@@ -67,20 +69,26 @@ def get_wrestler_by_name(name):
 
 def add_wrestler(wrestler_data):
     """Adds a new wrestler to the data."""
+    from src.slugs import find_slug_collision # Import here to avoid circular dependency
     wrestlers = load_wrestlers()
     if any(w.get('Name') == wrestler_data.get('Name') for w in wrestlers):
         return False
+    if find_slug_collision('wrestlers', wrestler_data.get('Name', '')):
+        return False # Another wrestler's page already uses this name's slug
     wrestlers.append(wrestler_data)
     save_wrestlers(wrestlers)
     return True
 
 def update_wrestler(original_name, updated_data):
     """Updates an existing wrestler's data."""
+    from src.slugs import find_slug_collision # Import here to avoid circular dependency
     wrestlers = load_wrestlers()
     index_to_update = next((i for i, w in enumerate(wrestlers) if w.get('Name') == original_name), -1)
     if index_to_update != -1:
         if original_name != updated_data.get('Name') and any(w.get('Name') == updated_data.get('Name') for w in wrestlers):
             return False
+        if find_slug_collision('wrestlers', updated_data.get('Name', ''), original_name):
+            return False # New name would share another wrestler's slug
         wrestlers[index_to_update] = updated_data
         save_wrestlers(wrestlers)
         return True
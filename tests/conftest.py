@@ -0,0 +1,37 @@
+import json
+import os
+import shutil
+import sys
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+PROJECT_DIRS = ('src', 'routes', 'templates', 'static')
+
+def _forget_project_modules():
+    for name in list(sys.modules):
+        if name.split('.')[0] in ('src', 'routes'):
+            del sys.modules[name]
+
+def write_json(root, relative_path, data):
+    """Writes a data file of the scratch project."""
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """
+    A scratch copy of the app with an empty data directory, like the benchmark
+    uses, so tests never touch the league data. src and routes are imported
+    from the copy; the fixture returns its root.
+    """
+    for directory in PROJECT_DIRS:
+        shutil.copytree(os.path.join(PROJECT_ROOT, directory), tmp_path / directory,
+                        ignore=shutil.ignore_patterns('__pycache__'))
+    os.makedirs(tmp_path / 'data' / 'events')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    _forget_project_modules()
+    yield str(tmp_path)
+    _forget_project_modules()
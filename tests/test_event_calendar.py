@@ -0,0 +1,25 @@
+import re
+from tests.conftest import write_json
+
+def _write_finalized_year(root, year, count):
+    write_json(root, 'data/events.json', [
+        {'Event_Name': f'Show {i}', 'Subtitle': '', 'Status': 'Past', 'Date': f'{year}-{1 + i % 12:02d}-{1 + i % 28:02d}',
+         'Venue': '', 'Location': '', 'Broadcasters': '', 'Finalized': True}
+        for i in range(count)])
+
+def test_events_page_without_size_returns_the_whole_year(project):
+    _write_finalized_year(project, 2024, 60)
+    from src.event_calendar import get_events_page
+
+    page = get_events_page(3, None, finalized=True, year=2024)
+    assert (page.number, page.pages, page.total, len(page.items)) == (1, 1, 60, 60)
+    assert [e['Date'] for e in page.items] == sorted((e['Date'] for e in page.items), reverse=True)
+
+def test_static_export_renders_the_whole_events_archive(project):
+    _write_finalized_year(project, 2024, 60)
+    from src.app import app
+
+    response = app.test_client().get('/fan/events/2024', headers={'X-Static-Export': 'true'})
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    assert len(re.findall(r'>\s*2024-\d\d-\d\d - Show \d+', body)) == 60
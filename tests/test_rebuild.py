@@ -0,0 +1,60 @@
+from tests.conftest import write_json
+
+def _title_match(match_id, winner, loser):
+    return {'match_id': match_id, 'sides': [[winner], [loser]], 'match_class': 'singles',
+            'individual_results': {winner: 'Win', loser: 'Loss'}, 'team_results': {},
+            'winning_side_index': 0, 'match_championship': 'World Title', 'warnings': []}
+
+def _write_finalized_event(root, name, date, match):
+    slug = name.lower().replace(' ', '-')
+    write_json(root, f'data/events/{slug}_segments.json',
+               [{'position': 1, 'type': 'Match', 'header': 'Main Event', 'match_id': match['match_id'], 'summary_file': ''}])
+    write_json(root, f'data/events/{slug}_matches.json', [match])
+    return {'Event_Name': name, 'Subtitle': '', 'Status': 'Past', 'Date': date, 'Venue': '', 'Location': '',
+            'Broadcasters': '', 'Finalized': True}
+
+def _write_league(root):
+    wrestlers = [{'Name': name, 'Status': 'Active', 'Division': 'men', 'Belt': 'World Title' if name == 'Ace' else '',
+                  'Singles_Wins': '0', 'Singles_Losses': '0', 'Singles_Draws': '0',
+                  'Tag_Wins': '0', 'Tag_Losses': '0', 'Tag_Draws': '0'} for name in ('Ace', 'Brick')]
+    write_json(root, 'data/wrestlers.json', wrestlers)
+    write_json(root, 'data/tagteams.json', [])
+    write_json(root, 'data/belts.json', [{'ID': 'world', 'Name': 'World Title', 'Status': 'Active', 'Holder_Type': 'Singles',
+                                          'Current_Holder': 'Ace', 'Champion_Title': 'World Champion', 'Display_Position': 1}])
+    # Ace's reign was entered by hand before the first finalized title match,
+    # and its Defenses already count both defenses replayed below
+    write_json(root, 'data/belt_history.json', [{'Reign_ID': 'ace-1', 'Belt_ID': 'world', 'Champion_Name': 'Ace',
+                                                 'Date_Won': '2020-01-01', 'Date_Lost': None, 'Defenses': 2, 'Notes': ''}])
+    write_json(root, 'data/events.json', [
+        _write_finalized_event(root, 'Show 1', '2020-02-01', _title_match('m1', 'Ace', 'Brick')),
+        _write_finalized_event(root, 'Show 2', '2020-03-01', _title_match('m2', 'Ace', 'Brick')),
+    ])
+
+def test_lineage_rebuild_keeps_defenses_of_hand_entered_reigns(project):
+    _write_league(project)
+    from src.rebuild import rebuild_lineage
+    from src.belts import load_belt_history
+
+    assert rebuild_lineage()['diffs'] == []
+    assert load_belt_history()[0]['Defenses'] == 2
+
+def test_lineage_rebuild_then_verify_reports_no_diffs(project):
+    _write_league(project)
+    from src.rebuild import rebuild_lineage
+    from src.belts import load_belt_history
+
+    # A title change after the hand-entered reign gives the rebuild something to apply
+    from src.events import load_events, save_events
+    events = load_events()
+    events.append(_write_finalized_event(project, 'Show 3', '2020-04-01', _title_match('m3', 'Brick', 'Ace')))
+    save_events(events)
+
+    first = rebuild_lineage(apply=True)
+    assert first['applied'] and first['diffs']
+    assert rebuild_lineage()['diffs'] == []
+    assert rebuild_lineage(apply=True)['diffs'] == []
+
+    reigns = {reign['Champion_Name']: reign for reign in load_belt_history()}
+    assert reigns['Ace']['Defenses'] == 2
+    assert reigns['Ace']['Date_Lost'] == '2020-04-01'
+    assert reigns['Brick']['Defenses'] == 0